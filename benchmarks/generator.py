@@ -0,0 +1,132 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from typing import List, NamedTuple
+import argparse
+import random
+
+class GeneratorConfig(NamedTuple):
+    functions: int = 100        # Amount of generated functions
+    ifDepth: int = 3            # Branches of the if/elif ladder in every function
+    loopDepth: int = 1          # Nesting of the for/while loops in every function
+    listSize: int = 10          # Elements of the list literal in every function
+    chainLength: int = 5        # Operands of every arithmetic chain
+    callDensity: float = 0.5    # Chance of a statement to call a previously generated function
+    seed: int = 0
+
+class ProgramGenerator():
+    def __init__(self, config: GeneratorConfig = GeneratorConfig()) -> None:
+        """Generates valid programs of the subset supported by the transpiler
+
+        Arguments:
+            config {GeneratorConfig} -- Size knobs (default: GeneratorConfig())
+        """
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.lines: List[str] = []
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def chain(self, operands: List[str]) -> str:
+        """Arithmetic chain of `chainLength` operands picked from `operands` and constants
+        """
+        parts = [self.random.choice(operands)]
+        for _ in range(self.config.chainLength - 1):
+            operand = self.random.choice(operands) if self.random.random() < 0.6 else str(self.random.randint(1, 9))
+            parts.append(self.random.choice(('+', '-', '*')))
+            parts.append(operand)
+        return " ".join(parts)
+
+    def call(self, index: int, operands: List[str]) -> str:
+        """Call of a previously generated function or a chain if the call density says so
+        """
+        if index > 0 and self.random.random() < self.config.callDensity:
+            return f"f{self.random.randrange(index)}({self.random.choice(operands)}, {self.random.choice(operands)})"
+        return self.chain(operands)
+
+    def function(self, index: int) -> None:
+        config = self.config
+        operands = ['a', 'b']
+        self.emit(0, f"def f{index}(a: int, b: int) -> int:")
+        self.emit(1, f"r: int = {self.chain(operands)}")
+        operands.append('r')
+
+        elements = ", ".join(str(self.random.randint(0, 99)) for _ in range(config.listSize))
+        self.emit(1, f"l: List[int] = [{elements}]")
+        self.emit(1, f"r = r + l[{self.random.randrange(max(config.listSize, 1))}] + len(l)" if config.listSize else "l.append(r)")
+
+        #* Loop nest, alternating for and while loops
+        indent = 1
+        bound = 'b'
+        for depth in range(config.loopDepth):
+            counter = f"k{depth}"
+            if depth % 2 == 0:
+                self.emit(indent, f"for {counter} in range({bound}):")
+            else:
+                self.emit(indent, f"{counter}: int = 0")
+                self.emit(indent, f"while {counter} < {bound}:")
+                self.emit(indent + 1, f"{counter} = {counter} + 1")
+            indent += 1
+            bound = counter
+            operands.append(counter)
+        if config.loopDepth:
+            self.emit(indent, f"r = r + {self.call(index, operands)}")
+            del operands[3:]
+
+        #* If/elif ladder
+        for branch in range(config.ifDepth):
+            keyword = "if" if branch == 0 else "elif"
+            self.emit(1, f"{keyword} r < {branch * 10}:")
+            self.emit(2, f"r = {self.call(index, operands)}")
+        if config.ifDepth:
+            self.emit(1, "else:")
+            self.emit(2, f"r = r - {self.random.randint(1, 9)}")
+
+        self.emit(1, "return r")
+
+    def generate(self) -> str:
+        """Generate a program
+
+        Returns:
+            str -- Python source code
+        """
+        self.lines = ["from typing import List"]
+        for index in range(self.config.functions):
+            self.function(index)
+            if self.random.random() < self.config.callDensity:
+                self.emit(0, f"print(f{index}({self.random.randint(0, 5)}, {self.random.randint(0, 5)}))")
+
+        return "\n".join(self.lines) + "\n"
+
+def generate(**knobs: int) -> str:
+    """Generate a program, see `GeneratorConfig` for the knobs
+
+    Returns:
+        str -- Python source code
+    """
+    return ProgramGenerator(GeneratorConfig(**knobs)).generate()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.generator', description='Generate a synthetic program.')
+    for name, default in GeneratorConfig._field_defaults.items():
+        flag = "".join(f"-{c.lower()}" if c.isupper() else c for c in name)
+        parser.add_argument(f'-{flag}', dest=name, action='store', type=type(default), default=default,
+                            help=f'(default: {default})')
+
+    print(ProgramGenerator(GeneratorConfig(**vars(parser.parse_args()))).generate(), end="")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,372 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from typing import Callable, Dict, Any, List, NamedTuple, Optional, Tuple
+from contextlib import redirect_stdout
+import argparse
+import ast
+import fnmatch
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+from pyschemetranspiler import __version__
+from pyschemetranspiler.converter import Converter
+from pyschemetranspiler.exceptions import ConversionAbort
+from pyschemetranspiler.memreport import MemoryReporter
+from pyschemetranspiler.parser import Parser
+from pyschemetranspiler.session import TranspilerSession
+from pyschemetranspiler.coloring import Colors, colorT
+
+from .generator import generate
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+#? Allowed relative slowdown (or memory growth) before a result counts as a regression
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 5
+#? Phases retaining less memory are not compared, their few allocations vary with the warm caches
+MIN_PHASE_BYTES = 256 * 1024
+
+class Scenario(NamedTuple):
+    name: str
+    sizes: Tuple[int, ...]          # Sizes measured, the smallest one is used by -quick
+    build: Callable[[int], str]     # Builds the source of a size
+    linear: bool = False            # Time and peak memory per line must not grow with the size, see `linearity`
+
+class Measurement(NamedTuple):
+    scenario: str
+    size: int
+    lines: int
+    seconds: float
+    peakBytes: int
+    reference: float                # Seconds of the reference workload measured alongside
+    phaseBytes: Dict[str, int]      # Memory retained per phase, see `MemoryReporter.phaseBytes`
+
+    @property
+    def key(self) -> str:
+        return f"{self.scenario}@{self.size}"
+
+    @property
+    def linesPerSecond(self) -> float:
+        return self.lines / self.seconds
+
+    def expected(self, saved: Dict[str, Any]) -> float:
+        """Throughput of a saved result adjusted to the current machine speed
+
+        Arguments:
+            saved {Dict[str, Any]} -- Saved result of the same scenario and size
+
+        Returns:
+            float -- Expected lines per second
+        """
+        return saved['lines_per_sec'] * saved['reference'] / self.reference
+
+def _deepNesting(operands: int) -> str:
+    #? One chain of `operands` operands and an elif ladder with a branch per 10 of them
+    lines = ["a: int = 1", "b: int = " + " + ".join(["a"] * operands), "if b == 0:", "    b = 1"]
+    for branch in range(1, operands // 10):
+        lines.append(f"elif b == {branch}:")
+        lines.append(f"    b = {branch + 1}")
+    lines.extend(["else:", "    b = 0", "print(b)"])
+    return "\n".join(lines) + "\n"
+
+def _deepScopes(statements: int) -> str:
+    #? 50 nested functions with 60 variables each and 45 nested ifs in the innermost one
+    depth, variables = 50, 60
+    lines = []
+    for level in range(depth):
+        indent = "    " * level
+        lines.append(f"{indent}def f{level}(a{level}: int) -> int:")
+        lines.extend(f"{indent}    v{level}_{v}: int = a{level} + {v}" for v in range(variables))
+    indent = "    " * depth
+    for level in range(depth - 5):
+        lines.append(f"{indent}if a{level} > 0:")
+        indent += "    "
+    for i in range(statements):
+        v = i % variables
+        lines.append(f"{indent}v0_{v} = v0_{v} + v1_{v} + v2_{v} + v3_{v} + a0 + a1 + a2")
+    lines.append(f"{'    ' * depth}return 0")
+    for level in reversed(range(depth - 1)):
+        lines.append(f"{'    ' * (level + 1)}return f{level + 1}(a{level})")
+    return "\n".join(lines) + "\n"
+
+_DISPATCH_HEAD = "from typing import List\ndef add(a: int, b: int) -> int:\n    return a + b\nl: List[int] = [1, 2, 3]\n"
+
+SCENARIOS: List[Scenario] = [
+    #* Generated programs, see `GeneratorConfig` for the knobs
+    Scenario("generated",      (100, 200, 400), lambda size: generate(functions=size)),
+    Scenario("elif-ladder",    (25, 50, 100),   lambda size: generate(functions=size, ifDepth=40, loopDepth=0)),
+    Scenario("loop-nest",      (50, 100, 200),  lambda size: generate(functions=size, loopDepth=6)),
+    Scenario("list-literals",  (25, 50, 100),   lambda size: generate(functions=size, listSize=300)),
+    Scenario("arith-chains",   (25, 50, 100),   lambda size: generate(functions=size, chainLength=100)),
+    Scenario("call-dense",     (100, 200, 400), lambda size: generate(functions=size, ifDepth=10, callDensity=1.0)),
+    #* Hand written shapes of earlier optimizations
+    Scenario("flat-functions", (2000, 4000, 8000), lambda size: "".join(
+        f"def f{i}(a: int, b: int) -> int:\n    c: int = a + b * {i}\n    if c > 3:\n        c = c - 1\n    return c\n" for i in range(size)
+        )),
+    Scenario("linear-output",  (2000, 4000, 8000), lambda size: "".join(
+        f"def f{i}(a: int, b: int) -> int:\n    c: int = a + b * {i}\n    if c > 3:\n        c = c - 1\n    return c\n" for i in range(size)
+        ) + "".join(f"print(f{i}(1, 2))\n" for i in range(size)), linear=True),
+    Scenario("deep-scopes",    (2500, 5000, 10000), _deepScopes),
+    Scenario("deep-nesting",   (25000, 50000, 100000), _deepNesting),
+    Scenario("call-heavy",     (1000, 2000, 3000), lambda size: _DISPATCH_HEAD + "".join(
+        f"x{i} = add(len(l), int({i}.5)) + add(1, 2)\nprint(x{i})\n" for i in range(size)
+        )),
+    Scenario("subscript-heavy", (1000, 2000, 3000), lambda size: _DISPATCH_HEAD + "".join(
+        f"y{i} = l[0] + l[1] + l[-1]\nl[2] = y{i}\nif l:\n    l.append(y{i})\n" for i in range(size)
+        )),
+    Scenario("loop-assigns",   (250, 500, 1000), lambda size: _DISPATCH_HEAD + "".join(
+        f"for i{i} in l:\n    a{i}: List[int] = [{', '.join(f'add(i{i}, {v})' for v in range(20))}]\n"
+        f"    b{i} = add(len(a{i}), int({i}.5)) + add(i{i}, 2)\n    c{i}: int = b{i} * i{i} + {i}\n" for i in range(size)
+        )),
+    Scenario("warnings",       (1000, 2000, 3000), lambda size: "def p(x: float) -> float:\n    return x\nv = None\n" + "".join(
+        f"print(p(v))\nq{i}: int = {i}\n" for i in range(size)
+        )),
+]
+
+#? Fixed pure python workload (parsing and walking an AST) to gauge the current machine speed
+_REFERENCE_SOURCE = "".join(
+    f"def g{i}(a, b):\n    c = a + b * {i}\n    if c > 3:\n        c = c - 1\n    return [c, a, b]\n" for i in range(300)
+    )
+
+def referenceOnce() -> float:
+    """Run the reference workload once
+
+    Returns:
+        float -- Seconds the workload took
+    """
+    gc.collect()
+    start = time.perf_counter()
+    counts: Dict[str, int] = {}
+    tree = ast.parse(_REFERENCE_SOURCE)
+    for node in ast.walk(tree):
+        counts[type(node).__name__] = counts.get(type(node).__name__, 0) + 1
+    compile(tree, "<reference>", "exec")
+    return time.perf_counter() - start
+
+def transpileOnce(source: str) -> float:
+    """Transpile a source once like a fresh run would
+
+    Arguments:
+        source {str} -- Python source code
+
+    Raises:
+        RuntimeError -- The source does not transpile
+
+    Returns:
+        float -- Seconds `Converter.emit` took including writing the output
+    """
+    #? Parsing is part of the measurement, don't reuse the module of the previous repetition
+    Parser.cache().clear()
+    file = io.StringIO(source)
+    file.name = "benchmark.py"
+    session = TranspilerSession(file.name)
+
+    #? Like `timeit`, collection pauses of garbage left by earlier runs would dominate the noise
+    gc.collect()
+    gc.disable()
+    try:
+        #? Written to a file like `run` does, so the output is never held as one string
+        with redirect_stdout(io.StringIO()), open(os.devnull, 'w') as sink:
+            start = time.perf_counter()
+            emitter = Converter.emit(file, session=session)
+            emitter.writeTo(sink)
+            emitter.close()
+            seconds = time.perf_counter() - start
+    except ConversionAbort:
+        #? Stopped at the first error (see `MAX_ERRORS`), reported below
+        pass
+    finally:
+        gc.enable()
+
+    #? Failing statements are skipped, their (fast) failure must not pass as throughput
+    if session.errors:
+        raise RuntimeError(f"benchmark source does not transpile: {session.errors[0]}")
+    return seconds
+
+def measure(scenario: Scenario, size: int, repeat: int = DEFAULT_REPEAT) -> Measurement:
+    """Measure the throughput (best of `repeat` runs), the peak memory and the memory retained per phase of a scenario
+
+    Arguments:
+        scenario {Scenario} -- Scenario to measure
+        size     {int}      -- Size of the scenario
+        repeat   {int}      -- Amount of timed runs (default: DEFAULT_REPEAT)
+
+    Returns:
+        Measurement -- Results
+    """
+    source = scenario.build(size)
+    #? Warm up the interning and compatibility caches of the type system
+    transpileOnce(source)
+    #? Interleaved with the reference workload, so both see the same machine load
+    seconds = reference = float('inf')
+    for _ in range(repeat):
+        seconds = min(seconds, transpileOnce(source))
+        reference = min(reference, referenceOnce())
+
+    #? Tracing slows down allocations, memory is measured in a separate untimed run
+    memory = MemoryReporter(top=0)
+    with memory.install():
+        transpileOnce(source)
+
+    return Measurement(
+        scenario.name, size, source.count("\n"), seconds, memory.peak.totalPeakBytes, reference, memory.phaseBytes()
+        )
+
+def compare(measurement: Measurement, baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Compare a measurement to its baseline
+
+    Arguments:
+        measurement {Measurement}    -- Current result
+        baseline    {Dict[str, Any]} -- Saved results by key
+        threshold   {float}          -- Allowed relative regression
+
+    Returns:
+        List[str] -- Regressions, empty if none or if there is no baseline
+    """
+    if (saved := baseline.get(measurement.key)) is None:
+        return []
+
+    regressions = []
+    if measurement.linesPerSecond < (expected := measurement.expected(saved)) * (1 - threshold):
+        regressions.append(f"{measurement.key}: {measurement.linesPerSecond:,.0f} lines/s (baseline {expected:,.0f} at the current machine speed)")
+    if measurement.peakBytes > saved['peak_bytes'] * (1 + threshold):
+        regressions.append(f"{measurement.key}: {measurement.peakBytes / 2**20:.1f}MiB peak (baseline {saved['peak_bytes'] / 2**20:.1f}MiB)")
+    for phase, retained in measurement.phaseBytes.items():
+        savedBytes = saved.get('phase_bytes', {}).get(phase)
+        if savedBytes is not None and savedBytes >= MIN_PHASE_BYTES and retained > savedBytes * (1 + threshold):
+            regressions.append(f"{measurement.key}: {phase} retains {retained / 2**20:.1f}MiB (baseline {savedBytes / 2**20:.1f}MiB)")
+    return regressions
+
+def linearity(measurements: List[Measurement], threshold: float) -> List[str]:
+    """Compare the smallest and the largest size of a `linear` scenario, the time and the peak memory
+    per line of the largest one must not exceed the ones of the smallest one by more than `threshold`
+
+    Arguments:
+        measurements {List[Measurement]} -- Results of one scenario in increasing size
+        threshold    {float}             -- Allowed relative growth per line
+
+    Returns:
+        List[str] -- Violations, empty if none or if less than two sizes were measured
+    """
+    if len(measurements) < 2:
+        return []
+
+    smallest, largest = measurements[0], measurements[-1]
+    violations = []
+    #? Seconds are scaled by the reference workload, the machine speed may drift between the sizes
+    smallTime, largeTime = (m.seconds / m.reference / m.lines for m in (smallest, largest))
+    if largeTime > smallTime * (1 + threshold):
+        violations.append(f"{smallest.scenario}: time per line grows {largeTime / smallTime - 1:+.0%} from {smallest.size} to {largest.size}")
+    smallPeak, largePeak = (m.peakBytes / m.lines for m in (smallest, largest))
+    if largePeak > smallPeak * (1 + threshold):
+        violations.append(f"{smallest.scenario}: peak memory per line grows {largePeak / smallPeak - 1:+.0%} from {smallest.size} to {largest.size}")
+    return violations
+
+def loadBaseline(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, 'r') as file:
+            return json.load(file)['results']
+    except FileNotFoundError:
+        return {}
+
+def saveBaseline(path: str, measurements: List[Measurement], previous: Dict[str, Any]) -> None:
+    #? Scenarios that were not measured (e.g. filtered out) keep their saved results
+    results = dict(previous)
+    for measurement in measurements:
+        results[measurement.key] = {
+            'lines'        : measurement.lines,
+            'lines_per_sec': round(measurement.linesPerSecond),
+            'peak_bytes'   : measurement.peakBytes,
+            'phase_bytes'  : measurement.phaseBytes,
+            'reference'    : round(measurement.reference, 6)
+            }
+
+    with open(path, 'w') as file:
+        json.dump({
+            'version': __version__,
+            'python' : platform.python_version(),
+            'machine': platform.machine(),
+            'results': dict(sorted(results.items()))
+            }, file, indent=2)
+        file.write("\n")
+
+def report(measurement: Measurement, baseline: Dict[str, Any]) -> None:
+    saved = baseline.get(measurement.key)
+    change = f" ({measurement.linesPerSecond / measurement.expected(saved) - 1:+.0%})" if saved else ""
+    print(f"{measurement.key:<24} {measurement.lines:>7} lines {measurement.seconds:>8.3f}s "
+          f"{measurement.linesPerSecond:>10,.0f} lines/s{change:<8} {measurement.peakBytes / 2**20:>7.1f}MiB peak")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Measure the transpiler throughput and peak memory.')
+    parser.add_argument('-filter', action='store', default='*',
+                        help='only run scenarios whose name matches this glob pattern')
+    parser.add_argument('-quick', action='store_true',
+                        help='only measure the smallest size of every scenario')
+    parser.add_argument('-repeat', action='store', type=int, default=DEFAULT_REPEAT,
+                        help=f'amount of timed runs per size, the fastest one counts (default: {DEFAULT_REPEAT})')
+    parser.add_argument('-baseline', action='store', default=BASELINE_PATH,
+                        help='path of the saved baseline (default: benchmarks/baseline.json)')
+    parser.add_argument('-threshold', action='store', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'allowed relative regression against the baseline (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('-save', action='store_true',
+                        help='save the results as the new baseline instead of comparing against it')
+    args = parser.parse_args(argv)
+
+    baseline = loadBaseline(args.baseline)
+    measurements: List[Measurement] = []
+    suspects: List[Tuple[Scenario, Measurement]] = []
+    regressions: List[str] = []
+    for scenario in SCENARIOS:
+        if not fnmatch.fnmatch(scenario.name, args.filter):
+            continue
+
+        sized: List[Measurement] = []
+        for size in scenario.sizes[:1] if args.quick else scenario.sizes:
+            measurement = measure(scenario, size, max(args.repeat, 1))
+            sized.append(measurement)
+            report(measurement, baseline)
+            if not args.save and compare(measurement, baseline, args.threshold):
+                suspects.append((scenario, measurement))
+        measurements.extend(sized)
+        if scenario.linear:
+            regressions.extend(linearity(sized, args.threshold))
+
+    #? Timings of shared machines drift for seconds at a time, suspected regressions are
+    #? measured again after all others and only count if they are confirmed
+    for scenario, measurement in suspects:
+        retry = measure(scenario, measurement.size, max(args.repeat, 1))
+        if retry.seconds / retry.reference < measurement.seconds / measurement.reference:
+            measurement = retry
+        print(colorT("Retry", Colors.ORANGE), end=" ")
+        report(measurement, baseline)
+        regressions.extend(compare(measurement, baseline, args.threshold))
+
+    if args.save:
+        saveBaseline(args.baseline, measurements, baseline)
+        print(colorT(f"Saved {len(measurements)} results to '{args.baseline}'", Colors.BLUE))
+        return
+
+    if not baseline:
+        print(colorT(f"No baseline at '{args.baseline}', run with -save to create one", Colors.ORANGE))
+    if regressions:
+        print(colorT(f"{len(regressions)} regressions beyond {args.threshold:.0%}:", Colors.RED))
+        for regression in regressions:
+            print(colorT(f"  {regression}", Colors.RED))
+        sys.exit(1)
@@ -12,4 +12,14 @@
 # GNU General Public License for more details.
 
 # You should have received a copy of the GNU General Public License
-# along with this program.  If not, see <https://www.gnu.org/licenses/>.
\ No newline at end of file
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+__version__ = "1.3"
+
+#? Imported on first use, importing the package must not load the transpiler (see 'client.py')
+_API = ('transpile_source', 'transpile_many', 'TranspileResult')
+
+def __getattr__(name: str):
+    if name in _API:
+        from . import api
+        return getattr(api, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,117 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from ast import Module
+
+from .converter import Converter
+from .session import TranspilerSession
+from .source import SourceIndex
+from .exceptions import ConversionAbort, Diagnostic
+
+#? A source string, its parsed module or a (filename, source) pair
+Source = Union[str, Module, Tuple[str, Union[str, Module]]]
+
+class TranspileResult(NamedTuple):
+    code: Optional[str]            # None if an error occurred
+    buildFlags: FrozenSet[str]     # Resolved build flags the code requires
+    diagnostics: List[Diagnostic]  # Errors and warnings in the order they were reported
+    filename: Optional[str]
+
+    @property
+    def success(self) -> bool:
+        return self.code is not None
+
+    @property
+    def errors(self) -> List[Diagnostic]:
+        return [diagnostic for diagnostic in self.diagnostics if diagnostic.severity == 'error']
+
+    @property
+    def warnings(self) -> List[Diagnostic]:
+        return [diagnostic for diagnostic in self.diagnostics if diagnostic.severity == 'warning']
+
+def transpile_source(
+    src: Union[str, Module],
+    *,
+    filename: Optional[str] = None,
+    use_main: bool = True,
+    strict: bool = True,
+    max_errors: int = 0
+    ) -> TranspileResult:
+    """Transpile python source code (or its parsed module) to racket source code.
+    Nothing is printed and no exception is raised for invalid sources, all problems are
+    returned as diagnostics.
+
+    Arguments:
+        src        {Union[str, Module]} -- Python source code or its parsed module
+        filename   {Optional[str]}      -- Name reported with the result (default: None)
+        use_main   {bool}               -- Wrap all usercode in a main function (default: True)
+        strict     {bool}               -- Reject all type mismatches, see 'TYPES_STRICT' (default: True)
+        max_errors {int}                -- Amount of errors collected before stopping, 0 collects all (default: 0)
+
+    Returns:
+        TranspileResult -- Code, build flags and diagnostics
+    """
+    session = TranspilerSession(filename or "<string>", {'TYPES_STRICT': strict, 'MAX_ERRORS': max_errors}, quiet=True)
+    if isinstance(src, str):
+        session.source = SourceIndex(src)
+
+    code = None
+    with session.activate():
+        try:
+            code = Converter._transpile(src, use_main).getvalue()
+        except ConversionAbort:
+            pass
+        except SyntaxError as e:
+            session.diagnostics.append(Diagnostic('error', 'SyntaxError', e.msg, e.lineno, e.offset - 1 if e.offset else None))
+        except (RecursionError, MemoryError):
+            #? Raised by the python parser for sources nested too deeply, e.g. thousands of nested brackets
+            session.diagnostics.append(Diagnostic('error', 'SyntaxError', "source is nested too deeply to parse", None, None))
+        except ValueError as e:
+            #? e.g. null bytes in the source
+            session.diagnostics.append(Diagnostic('error', 'SyntaxError', str(e), None, None))
+
+    return TranspileResult(
+        code,
+        frozenset(Converter.compileBuildFlags(session.buildFlags)),
+        session.diagnostics,
+        filename
+        )
+
+def transpile_many(
+    sources: Iterable[Source],
+    *,
+    use_main: bool = True,
+    strict: bool = True,
+    max_errors: int = 0
+    ) -> Iterator[TranspileResult]:
+    """Transpile multiple sources lazily, see `transpile_source`
+
+    Arguments:
+        sources    {Iterable[Source]} -- Source strings, parsed modules or (filename, source) pairs
+        use_main   {bool}             -- Wrap all usercode in a main function (default: True)
+        strict     {bool}             -- Reject all type mismatches, see 'TYPES_STRICT' (default: True)
+        max_errors {int}              -- Amount of errors collected per source before stopping, 0 collects all (default: 0)
+
+    Returns:
+        Iterator[TranspileResult] -- Result of every source in order
+    """
+    for source in sources:
+        filename = None
+        if isinstance(source, tuple):
+            filename, source = source
+
+        yield transpile_source(source, filename=filename, use_main=use_main, strict=strict, max_errors=max_errors)
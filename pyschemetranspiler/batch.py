@@ -0,0 +1,366 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import Dict, List, Any, NamedTuple, Optional, Set
+from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import redirect_stdout
+import io
+import os
+import time
+
+from .converter import Converter
+from .session import TranspilerSession
+from .cache import TranspileCache, DEFAULT_MAX_BYTES
+from .incremental import IncrementalState
+from .interface import ModuleInterface, InterfaceFile
+from .runtime import SharedRuntime
+from .modules import ModuleGraph, SOURCE_SUFFIX, TARGET_SUFFIX
+from .coloring import Colors, colorT
+
+class BatchJob(NamedTuple):
+    source: str
+    target: str
+    size: int
+
+class BatchResult(NamedTuple):
+    source: str
+    success: bool
+    lines: int
+    seconds: float
+    output: str
+    cacheHit: Optional[bool]
+    interface: Optional[ModuleInterface] = None  # Set for modules imported by other files, with the path of the target
+    reused: bool = False                         # Module was unchanged and not built again, see `InterfaceFile`
+
+class BatchSummary(NamedTuple):
+    results: List[BatchResult]
+    seconds: float
+
+    @property
+    def failures(self) -> List[BatchResult]:
+        return [result for result in self.results if not result.success]
+
+#? Cache of the current pool worker, see `_initWorker`
+_workerCache: Optional[TranspileCache] = None
+
+def _initWorker(cacheDir: Optional[str], cacheBytes: int) -> None:
+    """Prepare a pool worker, the transpiler modules are imported once when the worker starts
+
+    Arguments:
+        cacheDir   {Optional[str]} -- Directory of the transpile cache or None to disable it
+        cacheBytes {int}           -- Size cap of the transpile cache
+    """
+    global _workerCache
+    from . import builder # noqa: F401
+    
+    if cacheDir is not None:
+        _workerCache = TranspileCache(cacheDir, cacheBytes)
+
+def _transpileJob(
+    job: BatchJob,
+    useMain: bool,
+    config: Optional[Dict[str, Any]] = None,
+    modules: Optional[Dict[str, ModuleInterface]] = None,
+    moduleName: Optional[str] = None
+    ) -> BatchResult:
+    """Transpile a single file inside of a pool worker
+
+    Arguments:
+        job        {BatchJob}                                -- File to transpile
+        useMain    {bool}                                    -- Wrap all usercode in a main function
+        config     {Optional[Dict[str, Any]]}                -- Session config overrides (default: None)
+        modules    {Optional[Dict[str, ModuleInterface]]}    -- Modules the file may import (default: None)
+        moduleName {Optional[str]}                           -- Name of the file if other files import it, it is built as exportable
+                                                                code providing its top-level names (default: None)
+
+    Returns:
+        BatchResult -- Outcome of the transpilation including all diagnostics printed
+    """
+    captured = io.StringIO()
+    success = False
+    lines = 0
+    interface = None
+    reused = False
+    hitsBefore = _workerCache.hits if _workerCache is not None else 0
+    start = time.perf_counter()
+
+    with redirect_stdout(captured):
+        try:
+            incremental = None
+            if _workerCache is not None:
+                statePath = IncrementalState.statePath(_workerCache.directory, job.source)
+                incremental = IncrementalState.load(statePath)
+            
+            session = TranspilerSession(job.source, SharedRuntime.bind(config, job.target))
+            session.modules = modules or {}
+            session.moduleName = moduleName
+
+            saved = None
+            if moduleName is not None:
+                #? Modules are reused through their interface file instead of the cache, it also knows their exports
+                interfacePath = InterfaceFile.path(job.target)
+                with open(job.source, 'r') as file:
+                    source = file.read()
+                key = InterfaceFile.key(source, session.config, moduleName, session.modules)
+                saved = InterfaceFile.load(interfacePath)
+                if saved is None or saved.buildKey != key or not os.path.isfile(job.target):
+                    saved = None
+
+            if saved is not None:
+                if not session.quiet:
+                    for warning in saved.warnings:
+                        print(warning)
+                lines = len(source.splitlines())
+                interface = ModuleInterface(moduleName, os.path.abspath(job.target), saved.exports)
+                reused = True
+                success = True
+            else:
+                with open(job.source, 'r') as file:
+                    cache = _workerCache if moduleName is None else None
+                    transpiled = Converter.emit(file, useMain and moduleName is None, session, cache, incremental)
+                    file.seek(0)
+                    lines = sum(1 for _ in file)
+                
+                if incremental is not None and incremental.signature is not None:
+                    incremental.save(statePath, _workerCache)
+
+                os.makedirs(os.path.dirname(job.target) or ".", exist_ok=True)
+                with open(job.target, 'w') as file:
+                    transpiled.writeTo(file)
+                    transpiled.close()
+                if moduleName is not None:
+                    interface = ModuleInterface(moduleName, os.path.abspath(job.target), session.exports)
+                    buildFlags = sorted(Converter.compileBuildFlags(session.buildFlags))
+                    InterfaceFile(key, session.exports, buildFlags, session.warnings).save(interfacePath)
+                success = True
+        except OSError as e:
+            print(colorT(f"Error accessing '{e.filename}'", Colors.RED))
+        except SystemExit:
+            #? Error was already reported by 'exceptions.throw'
+            pass
+
+    seconds = time.perf_counter() - start
+    cacheHit = _workerCache.hits > hitsBefore if _workerCache is not None and moduleName is None else None
+    return BatchResult(job.source, success, lines, seconds, captured.getvalue(), cacheHit, interface, reused)
+
+class BatchTranspiler():
+    @staticmethod
+    def collect(inputDir: str, outputDir: str) -> List[BatchJob]:
+        """Collect all python files in a directory tree and their mirrored output paths
+
+        Arguments:
+            inputDir  {str} -- Root of the source tree
+            outputDir {str} -- Root of the output tree
+
+        Returns:
+            List[BatchJob] -- Jobs ordered largest file first
+        """
+        jobs: List[BatchJob] = []
+        for root, dirs, files in os.walk(inputDir):
+            dirs.sort()
+            for name in sorted(files):
+                if not name.endswith(SOURCE_SUFFIX):
+                    continue
+
+                source = os.path.join(root, name)
+                relative = os.path.relpath(source, inputDir)
+                target = os.path.join(outputDir, relative[:-len(SOURCE_SUFFIX)] + TARGET_SUFFIX)
+                jobs.append(BatchJob(source, target, os.path.getsize(source)))
+
+        #? Schedule the largest files first so one big file does not finish last on its own
+        jobs.sort(key=lambda job: job.size, reverse=True)
+        return jobs
+
+    @staticmethod
+    def run(
+        inputDir: str,
+        outputDir: str,
+        jobs: Optional[int] = None,
+        useMain: bool = True,
+        cacheDir: Optional[str] = None,
+        cacheBytes: int = DEFAULT_MAX_BYTES,
+        config: Optional[Dict[str, Any]] = None
+        ) -> BatchSummary:
+        """Transpile a whole directory tree with a pool of worker processes, modules imported
+        by other files of the tree are built before them (see `BatchTranspiler.build`)
+
+        Arguments:
+            inputDir   {str}                      -- Root of the source tree
+            outputDir  {str}                      -- Root of the output tree
+            jobs       {Optional[int]}            -- Amount of worker processes, defaults to the cpu count (default: None)
+            useMain    {bool}                     -- Wrap all usercode in a main function (default: True)
+            cacheDir   {Optional[str]}            -- Directory of the transpile cache, disabled if None (default: None)
+            cacheBytes {int}                      -- Size cap of the transpile cache (default: DEFAULT_MAX_BYTES)
+            config     {Optional[Dict[str, Any]]} -- Session config overrides (default: None)
+
+        Returns:
+            BatchSummary -- Results of all files
+        """
+        work = BatchTranspiler.collect(inputDir, outputDir)
+        graph = ModuleGraph(inputDir)
+        for job in work:
+            graph.add(job.source)
+
+        return BatchTranspiler.build(work, graph, jobs, useMain, cacheDir, cacheBytes, config)
+
+    @staticmethod
+    def dependencies(
+        source: str,
+        target: str,
+        jobs: Optional[int] = None,
+        cacheDir: Optional[str] = None,
+        cacheBytes: int = DEFAULT_MAX_BYTES,
+        config: Optional[Dict[str, Any]] = None
+        ) -> Optional[Dict[str, ModuleInterface]]:
+        """Transpile the modules a single file imports (transitively) next to its target,
+        the project root is the directory of the file
+
+        Arguments:
+            source     {str}                      -- Path of file
+            target     {str}                      -- Path the file is transpiled to
+            jobs       {Optional[int]}            -- Amount of worker processes, defaults to the cpu count (default: None)
+            cacheDir   {Optional[str]}            -- Directory of the transpile cache, disabled if None (default: None)
+            cacheBytes {int}                      -- Size cap of the transpile cache (default: DEFAULT_MAX_BYTES)
+            config     {Optional[Dict[str, Any]]} -- Session config overrides (default: None)
+
+        Returns:
+            Optional[Dict[str, ModuleInterface]] -- Interfaces of the modules the file imports or None if one of them failed
+        """
+        graph = ModuleGraph(os.path.dirname(source) or ".")
+        graph.add(source)
+        entry = os.path.normpath(source)
+        work = [
+            BatchJob(path, graph.target(path, os.path.dirname(target)), os.path.getsize(path))
+            for path in graph.imports if path != entry
+            ]
+        if not work:
+            return {}
+
+        summary = BatchTranspiler.build(work, graph, jobs, True, cacheDir, cacheBytes, config)
+        if summary.failures:
+            return None
+
+        built = {os.path.normpath(result.source): result.interface for result in summary.results}
+        return graph.interfaces(source, target, built)
+
+    @staticmethod
+    def build(
+        work: List[BatchJob],
+        graph: ModuleGraph,
+        jobs: Optional[int] = None,
+        useMain: bool = True,
+        cacheDir: Optional[str] = None,
+        cacheBytes: int = DEFAULT_MAX_BYTES,
+        config: Optional[Dict[str, Any]] = None
+        ) -> BatchSummary:
+        """Transpile files with a pool of worker processes in the order of their imports.
+        A file is only started once all modules it imports are built, so independent files are built
+        concurrently. Modules imported by other files are built as exportable code (see `_transpileJob`).
+
+        Arguments:
+            work       {List[BatchJob]}           -- Files to transpile, started in this order once they are ready
+            graph      {ModuleGraph}              -- Import graph of the files
+            (see `BatchTranspiler.run` for the other arguments)
+
+        Returns:
+            BatchSummary -- Results of all files
+        """
+        imported = graph.imported
+        pending = {os.path.normpath(job.source): job for job in work}
+        known = set(pending)
+        built: Dict[str, ModuleInterface] = {}
+        failed: Set[str] = set()
+        results: List[BatchResult] = []
+
+        def report(result: BatchResult) -> None:
+            if result.output.strip():
+                print(colorT(f"[{result.source}]", Colors.PURPLE))
+                print(result.output, end="")
+            results.append(result)
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=jobs or os.cpu_count(), initializer=_initWorker, initargs=(cacheDir, cacheBytes)) as executor:
+            running: Dict[Future, str] = {}
+            while pending or running:
+                #? Failures propagate to importing files, which may unblock more of them
+                changed = True
+                while changed:
+                    changed = False
+                    for source, job in list(pending.items()):
+                        dependencies = [path for path in graph.dependencies(source) if path in known]
+                        if any(path in failed for path in dependencies):
+                            del pending[source]
+                            failed.add(source)
+                            changed = True
+                            report(BatchResult(job.source, False, 0, 0.0, colorT("Not transpiled, an imported module failed", Colors.RED) + "\n", None))
+                        elif all(path in built for path in dependencies):
+                            del pending[source]
+                            moduleName = graph.name(source) if source in imported else None
+                            modules = graph.interfaces(source, job.target, built)
+                            running[executor.submit(_transpileJob, job, useMain, config, modules, moduleName)] = source
+
+                if not running:
+                    #? Only files importing each other are left
+                    for source, job in pending.items():
+                        report(BatchResult(job.source, False, 0, 0.0, colorT("Not transpiled, circular import", Colors.RED) + "\n", None))
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source = running.pop(future)
+                    result = future.result()
+                    report(result)
+                    if result.interface is not None:
+                        built[source] = result.interface
+                    elif not result.success:
+                        failed.add(source)
+
+        return BatchSummary(results, time.perf_counter() - start)
+
+    @staticmethod
+    def report(summary: BatchSummary, slowest: int = 5) -> None:
+        """Print throughput, failures and the slowest files of a batch run
+
+        Arguments:
+            summary {BatchSummary} -- Summary to report
+            slowest {int}          -- Amount of slowest files to list (default: 5)
+        """
+        files = len(summary.results)
+        lines = sum(result.lines for result in summary.results)
+        seconds = summary.seconds or float("inf")
+
+        print(colorT(f"Transpiled {files} files ({lines} lines) in {summary.seconds:.2f}s", Colors.BLUE))
+        print(colorT(f"{files / seconds:.1f} files/sec, {lines / seconds:.1f} lines/sec", Colors.BLUE))
+
+        if summary.failures:
+            print(colorT(f"{len(summary.failures)} failures:", Colors.RED))
+            for result in summary.failures:
+                print(colorT(f"  {result.source}", Colors.RED))
+        else:
+            print(colorT("0 failures", Colors.GREEN))
+
+        cacheResults = [result.cacheHit for result in summary.results if result.cacheHit is not None]
+        if cacheResults:
+            hits = sum(cacheResults)
+            print(colorT(f"Cache: {hits} hits, {len(cacheResults) - hits} misses", Colors.BLUE))
+
+        reused = sum(result.reused for result in summary.results)
+        if reused:
+            print(colorT(f"{reused} unchanged modules reused", Colors.BLUE))
+
+        print(colorT("Slowest files:", Colors.ORANGE))
+        for result in sorted(summary.results, key=lambda result: result.seconds, reverse=True)[:slowest]:
+            print(colorT(f"  {result.seconds * 1000:8.1f}ms  {result.source}", Colors.ORANGE))
@@ -14,7 +14,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 from __future__ import annotations
-from typing import Dict, List as ListType, Tuple as TupleType, Union, Callable, Any, Optional
+from typing import Dict, List as ListType, Tuple as TupleType, Union, Callable, Any, Optional, Generator
+from functools import lru_cache
+from weakref import WeakValueDictionary
+from types import GeneratorType
+import sys
 
 from ast import (
     AST,
@@ -53,6 +57,7 @@ from ast import (
     Slice,
     Attribute,
     For,
+    Import,
     ImportFrom,
     arg,
     IfExp,
@@ -60,15 +65,21 @@ from ast import (
     Tuple,
     In,
     AugAssign,
-    While
+    While,
+    Load
     )
 
-from .exceptions import throw, warn
+from .exceptions import throw, warn, ConversionException
+from .session import TranspilerSession
+from .sexpr import SExpr, Value, serialize
 
 IGNORED_IMPORTS = ["typing"]
+#? Root names of the transpiler itself, a module never exports them (see `Builder.exports`)
+BUILTIN_NAMES = ["bool", "int", "float", "str", "list", "print", "PRINT", "input", "range", "len"]
 NUMBER_TYPES = [int, float]
 COLLECTION_TYPES = []
 SEPERATOR = '\n'
+TYPE_CACHE_SIZE = 4096
 
 def buildConstants() -> None:
     """Build all constants that need types defined below
@@ -114,6 +125,28 @@ class TempState():
         
         return False
 
+#? (node, finish) to build a nested node, finish converts the raw result (see `Builder.asSource`)
+Request = TupleType[AST, Callable[[Any], Any]]
+#? Builders yielding requests, the result is sent back once the nested node is built
+Trampolined = Generator[Request, Any, Any]
+
+class Nested():
+    """Requests of trampolined builders to build a nested node.
+    Builders that are generators yield these instead of calling `Builder.buildFromNode`,
+    so nesting them does not grow the python stack (see `Builder._trampoline`)
+    """
+    @staticmethod
+    def source(node: AST) -> Request:
+        return node, Builder.asSource
+    
+    @staticmethod
+    def typed(node: AST) -> Request:
+        return node, Builder.asType
+    
+    @staticmethod
+    def ir(node: AST) -> Request:
+        return node, Builder.asIR
+
 class _Builder():
        
     @staticmethod
@@ -126,21 +159,17 @@ class _Builder():
         #* Name
         name = node.name
         #* Arguments
-        args = ""
-        argTypesDef = []
-        argTypesKey = {}
+        args: ListType[str] = []
         
         setStateQueue: ListType[TupleType[str, type]] = []
         
         argsLen     = len(node.args.args)
         defaultsLen = len(node.args.defaults)
         for i in range(argsLen):
-            if args != "": args += " "
-            
             if (default := -(argsLen-defaultsLen-i)) >= 0:
                 #? Argument with default
                 argV, argT = Builder.buildFromNodeType(node.args.defaults[default])
-                args += f"#:{node.args.args[i].arg} [{node.args.args[i].arg} {argV}]"
+                args.append(f"#:{node.args.args[i].arg} [{node.args.args[i].arg} {argV}]")
                 
                 aType = Typer.deduceTypeFromNode(node.args.args[i])
                 if not Typer.isTypeCompatible(aType, argT):
@@ -148,25 +177,26 @@ class _Builder():
                         f"annotaion type {aType} and default type {argT} are incompatible for argument '{node.args.args[i].arg}' of {name}"
                         )
                 
-                argTypesKey[node.args.args[i].arg] = aType
                 setStateQueue.append((node.args.args[i].arg, aType))
             else:
                 #? Normal argument
-                args += node.args.args[i].arg
+                args.append(node.args.args[i].arg)
                 
                 aType = Typer.deduceTypeFromNode(node.args.args[i])
-                argTypesDef.append(aType)
                 setStateQueue.append((node.args.args[i].arg, aType))
         
         #? Check for vararg
-        varArgFlag = False
+        varArg = ""
         if node.args.vararg is not None:
-            varArgFlag = True
-            args += f" . {node.args.vararg.arg}"
+            varArg = f" . {node.args.vararg.arg}"
         
         #* Add self to state
-        retType = Typer.deduceTypeFromNode(node.returns)
-        Builder.setStateKeyPropagate(name, Typer.TFunction(argTypesDef, argTypesKey, varArgFlag, retType))
+        signature = Typer.deduceSignature(node)
+        retType = signature.ret
+        Builder.setStateKeyPropagate(name, signature)
+        #? Lists passed in are not created in this file (e.g. by an importing module)
+        if Typer.usesList(signature):
+            Builder.setBuildFlag('GROWABLE_VECTOR')
         
         for t in setStateQueue:
             Builder.setStateKey(*t)
@@ -174,11 +204,11 @@ class _Builder():
         #* Body
         with TempState('__returnType__', retType):
             with TempState('__didReturn__', False):
-                body = ""
+                body: ListType[str] = []
                 for i in node.body:
                     if Builder.getStateKeyLocal('__didReturn__'):
                         throw(ValueError("No expressions allowed after 'return': https://github.com/Coronon/PySchemeTranspiler#multiple-returns"), i)
-                    body += Builder.buildFromNode(i)
+                    body.append(Builder.buildFromNode(i))
                 
                 if not Builder.getStateKeyLocal('__didReturn__'):
                     #? Implicitly add 'return None'
@@ -188,10 +218,10 @@ class _Builder():
                     copyLocation(node, _constant)
                     _return = Return(_constant)
                     copyLocation(node, _return)
-                    body += Builder.buildFromNode(_return)
+                    body.append(Builder.buildFromNode(_return))
             
         Builder.popState()
-        return f'(define ({name} {args}) {body})'
+        return f'(define ({name} {" ".join(args)}{varArg}) {"".join(body)})'
 
     @staticmethod
     def Constant(node: Constant) -> TupleType[str]:
@@ -227,14 +257,15 @@ class _Builder():
     @staticmethod
     def Return(node: Return) -> str:
         #? Implicitly convert 'return' to 'return None'
-        if node.value is None:
-            node.value = Constant(None)
-            copyLocation(node, node.value)
+        returned = node.value
+        if returned is None:
+            returned = Constant(None)
+            copyLocation(node, returned)
         
         if Builder.getStateKeyLocal('__loop__'):
             raise ValueError("Returning inside of loops is not supported")
             
-        value, vType = Builder.buildFromNodeType(node.value)
+        value, vType = Builder.buildFromNodeType(returned)
         if not Typer.isTypeCompatible(vType, (sType := Builder.getStateKeyLocal('__returnType__'))):
             raise TypeError(f"Type {sType} and {vType} are incompatible for return value")
         
@@ -242,43 +273,17 @@ class _Builder():
         return value
     
     @staticmethod
-    def BinOp(node: BinOp) -> TupleType[str, Any]:
-        def flattenNumberBinOp(operation: str) -> str:
-            ops = ['+', '-', '*', '/']
-            for op in ops:
-                i = 0
-                while True:
-                    i = operation.find(op, i)
-                    if i != -1 and operation[i+3] == op:
-                        closer = operation.find(')', i)
-                        operation = operation[:i-1]+operation[i+2:closer]+operation[closer+1:]
-                        i = 0
-                    else:
-                        break
-            
-            return operation
-        def flattenSubString(operation: str, sub: str):
-            l = len(sub)
-            i = 0
-            while True:
-                i = operation.find(sub, i)
-                if i != -1 and operation[i+15:i+2*l+2] == sub:
-                    closer = operation.find(')', i)
-                    operation = operation[:i-1]+operation[i+l+1:closer]+operation[closer+1:]
-                    i = 0
-                else:
-                    break
-            return operation
-        
-        lValue, lType = Builder.buildFromNodeType(node.left)
-        rValue, rType = Builder.buildFromNodeType(node.right)
+    def BinOp(node: BinOp) -> Trampolined:
+        #? Operands are kept as expressions so chains are flattened while building
+        lValue, lType = yield Nested.ir(node.left)
+        rValue, rType = yield Nested.ir(node.right)
         
         if lType in NUMBER_TYPES and rType in NUMBER_TYPES:
-            return flattenNumberBinOp(f"({Builder.buildFromNode(node.op)} {lValue} {rValue})"), int if lType == int and rType == int else float
+            return SExpr.chain(Builder.buildFromNode(node.op), lValue, rValue), int if lType == int and rType == int else float
         elif lType == str and rType == str:
             if (operant := Builder.buildFromNode(node.op)) != '+':
                 raise TypeError(f"unsupported operand type(s) for {operant}: '{lType}' and '{rType}'")
-            return flattenSubString(f"(string-append {lValue} {rValue})", 'string-append'), str
+            return SExpr.chain('string-append', lValue, rValue), str
 
         raise TypeError(f"unsupported operand type(s) for {Builder.buildFromNode(node.op)}: '{lType}' and '{rType}'")
     
@@ -309,9 +314,10 @@ class _Builder():
         return ret
     
     @staticmethod
-    def Assign(node: Assign) -> Tuple[str, bool]:
-        #! The returned bool indicates if the returned string is a define (True) or set (False)
-        isDefine = False
+    def Assign(node: Assign) -> TupleType[str, Optional[str]]:
+        #! The second element is the definition to hoist, it is only set when hoisting (see `Builder.buildHoisted`)
+        hoist = Builder.getStateKeyLocal('__assignHoist__')
+        definition = None
         ret = ""
         #? FUN-FACT: This blocks things like 'a, b = 1, a' if 'a' is not defined before
         #? as 'a' is not yet defined (we define a first, then b...) when the value tuple is build :P
@@ -320,26 +326,38 @@ class _Builder():
         for target in node.targets:
             
             if isinstance(target, Tuple):
-                def handleSubscript(node: Subscript, newName: Optional[str] = None) -> str:
-                    """Return the underlying name of a possibly nested Subscript node and optionally change it
+                def handleSubscript(node: Subscript) -> str:
+                    """Return the underlying name of a possibly nested Subscript node
 
                     Arguments:
-                        node    {Subscript}     -- Node to get name from
-                        newName {Optional[str]} -- New value for name (default: None)
+                        node {Subscript} -- Node to get name from
 
                     Returns:
-                        str -- Underlying name before possible change
+                        str -- Underlying name
                     """
                     if isinstance(node.value, Name):
-                        name = node.value.id
-                        if newName is not None:
-                            node.value.id = newName
-                            
-                        return name
+                        return node.value.id
                     elif isinstance(node.value, Subscript):
-                        return handleSubscript(node.value, newName)
+                        return handleSubscript(node.value)
                     else:
                         raise ValueError(f"MultiAssign is not supported for subscripts with underlying {type(node.value)}")
+                def renamed(node: Union[Name, Subscript], newName: str) -> Union[Name, Subscript]:
+                    """Copy a Name or possibly nested Subscript node with its underlying name changed
+
+                    Arguments:
+                        node    {Union[Name, Subscript]} -- Node to copy (it is not changed)
+                        newName {str}                    -- New value for name
+
+                    Returns:
+                        Union[Name, Subscript] -- Renamed copy
+                    """
+                    if isinstance(node, Name):
+                        copied = Name(id=newName, ctx=node.ctx)
+                    else:
+                        copied = Subscript(value=renamed(node.value, newName), slice=node.slice, ctx=node.ctx)
+                    copyLocation(node, copied)
+                    
+                    return copied
                 def getName(node: Union[Name, Subscript]) -> str:
                     """Determine the name of the underlaying variable
 
@@ -351,103 +369,73 @@ class _Builder():
                     """
                     if isinstance(node, Name): return node.id
                     else: return handleSubscript(node)
-                pre = ""
-                preInner = ""
-                inner = ""
+                pre: ListType[str] = []
+                preInner: ListType[str] = []
+                inner: ListType[str] = []
+                hoisted: ListType[str] = []
                 captured = {} # Variables that we create aliases for to allow 'swapping'
+                copied = set() # Hoisted variables, they are only defined once this runs
                 #? Compute captured list
                 for recipient in target.elts:
                     if isinstance(recipient, Subscript):
                         recipient = Name(handleSubscript(recipient))
+                    elif hoist and not Builder.inStateLocal(recipient.id):
+                        #? Copied like any other local, but nothing reads the (still undefined) alias
+                        Builder.setBuildFlag('DEEPCOPY')
+                        
+                        dunderId = f"___{recipient.id}___"
+                        if dunderId not in copied:
+                            copied.add(dunderId)
+                            preInner.append(f"(define {dunderId} (deepcopy {recipient.id}))")
+                        continue
                     
                     if Builder.inStateLocal(recipient.id):
-                        Builder.buildFlags['DEEPCOPY'] = True
+                        Builder.setBuildFlag('DEEPCOPY')
                         
                         value, vType = Builder.buildFromNodeType(recipient)
                         dunderId = f"___{recipient.id}___"
                         if dunderId in captured:
                             continue
                         captured[dunderId] = vType
-                        preInner += f"(define {dunderId} (deepcopy {recipient.id}))"
+                        preInner.append(f"(define {dunderId} (deepcopy {recipient.id}))")
                         Builder.setStateKey(dunderId, vType)
                 
                 for recipient, valueNode in zip(target.elts, node.value.elts):
+                    #? Read swapped variables from their aliases
                     if isinstance(valueNode, Name) and (valDunderId := f"___{valueNode.id}___") in captured:
-                        valueNode.id = valDunderId
+                        valueNode = renamed(valueNode, valDunderId)
                     if isinstance(valueNode, Subscript) and (valDunderId := f"___{handleSubscript(valueNode)}___") in captured:
-                        handleSubscript(valueNode, valDunderId)
+                        valueNode = renamed(valueNode, valDunderId)
                         
                     assign = Assign([recipient], valueNode)
                     copyLocation(recipient, assign)
                     
                     if Builder.inStateLocal(getName(recipient)):
-                        inner += Builder.buildFromNode(assign)
+                        inner.append(Builder.buildFromNode(assign))
+                    elif hoist and isinstance(recipient, Name):
+                        assignment, recipientDefinition = Builder.buildFromNodeType(assign)
+                        hoisted.append(recipientDefinition)
+                        inner.append(assignment)
                     else:
-                        pre += Builder.buildFromNode(assign)
+                        pre.append(Builder.buildFromNode(assign))
                 
                 #? Remove temp types (captured)
                 for tmpName in captured:
                     Builder.removeStateKeyLocal(tmpName)
-                #? Revert renames
-                for valueNode in node.value.elts:
-                    if isinstance(valueNode, Name) and valueNode.id in captured:
-                        valueNode.id = valueNode.id[3:-3]
-                    if isinstance(valueNode, Subscript) and (valDunderId := handleSubscript(valueNode)) in captured:
-                        handleSubscript(valueNode, valDunderId[3:-3])
                 
-                if Builder.getStateKeyLocal('__assignSkipValue__'):
-                    #? Some component doesnt want us to include the value
-                    isDefine = True
-                    ret = pre
-                else:
-                    isDefine = False
-                    ret = f"{pre}{f'((lambda () {preInner}{inner}))' if inner != '' else ''}" 
+                if hoist:
+                    definition = (definition or "") + "".join(hoisted)
+                ret = "".join(pre)
+                if inner:
+                    ret += f"((lambda () {''.join(preInner)}{''.join(inner)}))"
                 
             elif isinstance(target, Subscript):
-                isDefine = False
                 name, nType = Builder.buildFromNodeType(target.value)
         
-                class AssignSubscriptResolver():
-                    @staticmethod
-                    def error(name: str, nType: type, slice: Any):
-                        raise TypeError(f"value of type {nType} can not be subscripted")
-                    
-                    @staticmethod
-                    def TList(name: str, nType: type, slice: Union[Index, Slice]) -> str:
-                        if isinstance(slice, Index):
-                            index = Builder.buildFromNode(slice)
-                            try:
-                                index, indexT = Builder.buildFromNodeType(slice)
-                                
-                                if indexT is int and isinstance(index, int):
-                                    if index < 0:
-                                        index = f"(- (gvector-count {name}) {-index})"
-                                elif indexT is int and isinstance(index, str):
-                                    index = f"(if (< {index} 0) (- (gvector-count {name}) (- {index})) {index})"
-                                else:
-                                    raise ValueError()
-                        
-                            except ValueError:
-                                raise TypeError(f"instance of type {type(index)} can not be used to index into a list")
-                            
-                            if not Typer.isTypeCompatible(vType, nType.contained):
-                                raise TypeError(f"element of type {vType} can not be appended to list containing type {nType.contained}")
-                            
-                            return f"(safe-gvector-set! {name} {index} {value})"
-                        elif isinstance(slice, Slice):
-                            raise NotImplementedError("Advanced slicing is not yet implemented for lists")
-                        else:
-                            raise TypeError(f"type {type(slice)} can not be used to slice a list")
-                
-                types: Dict[str, Callable[[Call], str]] = {
-                    Typer.TList: AssignSubscriptResolver.TList
-                }
-                
-                return types.get(type(nType), AssignSubscriptResolver.error)(name, nType, target.slice), isDefine
+                return ASSIGN_SUBSCRIPT_TYPES.get(type(nType), AssignSubscriptResolver.error)(target, name, nType, value, vType), definition
             else:
                 if Builder.inStateLocal(target.id):
-                    isDefine = False
-                    if Builder.config['TYPES_STRICT']:
+                    if Builder.getConfig('TYPES_STRICT'):
                         #? Strict mode
                         #? Allow automatic conversion between compatible types that dont cause data loss
                         sType = Builder.getStateKeyLocal(target.id)
@@ -456,7 +444,7 @@ class _Builder():
                         
                         if sType is None and vType is not None:
                             if Builder.getStateKeyLocal('__definitionsClaim__'):
-                                warn("TypeWarning", "Can not assure type correctness for retyped variable in a control structure", Builder.currentNode)
+                                warn("TypeWarning", "Can not assure type correctness for retyped variable in a control structure", Builder.getCurrentNode())
                             
                             #? We merge the types here to avoid int->float->int shenanigans
                             Builder.setStateKey(target.id, Typer.mergeTypes(sType, vType))
@@ -466,25 +454,25 @@ class _Builder():
                         
                     ret += f"(set! {target.id} {value})"
                 else:
-                    isDefine = True
                     if Typer.isRestrictedType(vType):
                         raise TypeError(f"restricted type {vType} may only be used in an annotated assign")
                     
                     Builder.setStateKey(target.id, vType)
-                    if Builder.getStateKeyLocal('__assignSkipValue__'):
-                        #? Some component doesnt want us to include the value
-                        ret += f"(define {target.id} void)"
+                    if hoist:
+                        #? Some component defines the variable before us, we only set it
+                        definition = (definition or "") + f"(define {target.id} void)"
+                        ret += f"(set! {target.id} {value})"
                     else:
                         ret += f"(define {target.id} {value})"
         
-        return ret, isDefine
+        return ret, definition
     
     @staticmethod
-    def UnaryOp(node: UnaryOp) -> TupleType[str, type]:
+    def UnaryOp(node: UnaryOp) -> Trampolined:
         ret = None
         
         with TempState('__resolveAsIf__', False):
-            value, vType = Builder.buildFromNodeType(node.operand)
+            value, vType = yield Nested.typed(node.operand)
         
         if vType in NUMBER_TYPES:
             if Builder.buildFromNode(node.op) == "+":
@@ -529,329 +517,15 @@ class _Builder():
     
     @staticmethod
     def Call(node: Call) -> TupleType[str, type]:
-        class CallResolver():
-            #* FUNCTIONS
-            @staticmethod
-            def normal(node: Call) -> TupleType[str, type]:
-                #* Type lookup
-                fName = Builder.buildFromNode(node.func)
-                fType: Typer.TFunction = Builder.getStateKey(fName)
-                
-                #? Check argument length matches
-                fArgsDef = len(fType.args)
-                fArgsKey = len(fType.kwArgs)
-                nArgsDef = len(node.args)
-                nArgsKey = len(node.keywords)
-                if (fType.vararg and nArgsDef < fArgsDef) or (not fType.vararg and fArgsDef != nArgsDef):
-                    raise TypeError(f"{fName} takes {fArgsDef} positional arguments but you provided {nArgsDef}")
-                
-                if not (nArgsKey <= fArgsKey):
-                    raise TypeError(f"{fName} takes {fArgsKey} keyword arguments but you provided {nArgsKey}")
-                
-                #* Parse arguments
-                #? Default args
-                argListDef: ListType[TupleType[str, type]] = []
-                for arg in node.args:
-                    argListDef.append(Builder.buildFromNodeType(arg))
-                
-                # Check default argument types match
-                args = ""
-                for i in range(len(fType.args)):
-                    if not Typer.isTypeCompatible(argListDef[i][1], fType.args[i]):
-                        raise TypeError(f"type {argListDef[i][1]} can not be applied to argument of type {fType.args[i]}")
-                
-                for arg in argListDef:
-                    if args != "": args += " "
-                    args += arg[0]
-                
-                #? Keyword args
-                def getKeywordName(argument: str) -> str:
-                    return argument.split(" ")[0][2:]
-                
-                #TupleType[kwName, kwCode, kwType]
-                argListKey: ListType[TupleType[str, str, type]] = []
-                for arg in node.keywords:
-                    value, vType = Builder.buildFromNodeType(arg)
-                    argListKey.append((getKeywordName(value), value, vType))
-                
-                # Check keyword argument types match
-                for i in argListKey:
-                    if i[0] not in fType.kwArgs:
-                        raise TypeError(f"'{i[0]}' is an invalid keyword argument for {fName}")
-                    if not Typer.isTypeCompatible(i[2], fType.kwArgs[i[0]]):
-                        raise TypeError(f"type {i[2]} can not be applied to argument of type {fType.kwArgs[i[0]]}")
-                    if args != "": args += " "
-                    args += i[1]
-                
-                if args == "":
-                    return f"({fName})", fType.ret
-                    
-                return f"({fName} {args})", fType.ret
-            
-            @staticmethod
-            def print(node: Call) -> TupleType[str, type]:
-                Builder.buildFlags['PRINT'] = True
-                node.func.id = "PRINT"
-                return CallResolver.normal(node)
-            
-            @staticmethod
-            def range(node: Call) -> TupleType[str, type]:
-                #? This func is set to accept varArgs for easier build in typing -> Check args
-                if not 0 < len(node.args) < 4:
-                    raise TypeError(f"builtin range takes 1 to 3 arguments, {len(node.args)} provided")
-                elif any([not Typer.isTypeCompatible(Typer.deduceTypeFromNode(x), int) for x in node.args]):
-                    raise TypeError(f"builtin range takes 1 to 3 integers")
-                return CallResolver.normal(node)
-
-            @staticmethod
-            def input(node: Call) -> TupleType[str, type]:
-                Builder.buildFlags['INPUT'] = True
-                
-                if not len(node.args) < 2:
-                    raise TypeError(f"builtin input takes 0 to 1 arguments, {len(node.args)} provided")
-                elif any([not Typer.isTypeCompatible(Typer.deduceTypeFromNode(x), str) for x in node.args]):
-                    raise TypeError(f"builtin input takes 0 to 1 strings")
-                
-                if not node.args:
-                    node.args.append(Constant(value="", kind=None))
-                
-                return CallResolver.normal(node)
-    
-            @staticmethod
-            def len(node: Call) -> TupleType[str, type]:
-                class lenResolver():
-                    @staticmethod
-                    def error(value: str, vType: type) -> str:
-                        raise TypeError(f"object of type '{vType}' has no len()")
-                    
-                    @staticmethod
-                    def str(value: str, vType: type) -> str:
-                        return f"(string-length {value})"
-                    
-                    @staticmethod
-                    def TList(value: str, vType: type) -> str:
-                        return f"(gvector-count {value})"
-
-                    @staticmethod
-                    def TTuple(value: str, vType: type) -> str:
-                        return f"(vector-length {value})"
-                
-                
-                if not (lArgs := len(node.args)) == 1:
-                    raise TypeError(f"builtin len takes 1 argument, {lArgs} provided")
-                
-                value, vType = Builder.buildFromNodeType(node.args[0])
-                
-                if isinstance(vType, Typer.T):
-                    vType = type(vType)
-                
-                switcher: Dict[type, Callable[[str, type], str]] = {
-                    str          : lenResolver.str,
-                    Typer.TList  : lenResolver.TList,
-                    Typer.TTuple : lenResolver.TTuple,
-                }
-                
-                return switcher.get(vType, lenResolver.error)(value, vType), int
-                
-            #* ATTRIBUTES
-
-            @staticmethod
-            def TList(node: Call, name: str, nType: Typer.TList, attr: str) -> TupleType[str, type]:
-                def error(node: Call, name: str, nType: Typer.TList):
-                    raise AttributeError(f"no such attribute function on type list")
-                
-                def append(node: Call, name: str, nType: Typer.TList) -> TupleType[str, type]:
-                    if not (args := len(node.args)) == 1:
-                        raise ValueError(f"append on list takes 1 type-compatible argument, {args} provided")
-                    
-                    value, vType = Builder.buildFromNodeType(node.args[0])
-                    if not Typer.isTypeCompatible(vType, nType.contained):
-                        raise TypeError(f"element of type {vType} can not be appended to list containing type {nType.contained}")
-                    
-                    return f"(gvector-add! {name} {value})", Typer.Null()
-                
-                def pop(node: Call, name: str, nType: Typer.TList) -> TupleType[str, type]:
-                    if not (args := len(node.args)) == 1:
-                        raise ValueError(f"pop on list takes 1 positional argument, {args} provided")
-                    
-                    try:
-                        index, indexT = Builder.buildFromNodeType(node.args[0])
-                        
-                        if indexT is int and isinstance(index, int):
-                            if index < 0:
-                                index = f"(- (gvector-count {name}) {-index})"
-                        elif indexT is int and isinstance(index, str):
-                            index = f"(if (< {index} 0) (- (gvector-count {name}) (- {index})) {index})"
-                        else:
-                            raise ValueError()
-                        
-                    except ValueError:
-                        raise TypeError(f"instance of type {type(index)} can not be used to index into a list")
-                    
-                    return f"(gvector-pop! {name} {index})", nType.contained
-                
-                def insert(node: Call, name: str, nType: Typer.TList) -> TupleType[str, type]:
-                    if not (args := len(node.args)) == 2:
-                        raise ValueError(f"insert on list takes 2 positional arguments, {args} provided")
-                    
-                    try:
-                        index, indexT = Builder.buildFromNodeType(node.args[0])
-                        
-                        if indexT is int and isinstance(index, int):
-                            if index < 0:
-                                index = f"(- (gvector-count {name}) {-index})"
-                        elif indexT is int and isinstance(index, str):
-                            index = f"(if (< {index} 0) (- (gvector-count {name}) (- {index})) {index})"
-                        else:
-                            raise ValueError()
-                        
-                    except ValueError:
-                        raise TypeError(f"instance of type {type(index)} can not be used to index into a list")
-                    
-                    
-                    value, vType = Builder.buildFromNodeType(node.args[1])
-                    if not Typer.isTypeCompatible(vType, nType.contained):
-                        raise TypeError(f"element of type {vType} can not be inserted into a list containing type {nType.contained}")
-                    
-                    return f"(gvector-insert! {name} {index} {value})", Typer.Null()
-                
-                # def count(node: Call, name: str, nType: Typer.TList) -> TupleType[str, type]:
-                #     if not (args := len(node.args)) == 0:
-                #         raise ValueError(f"count on list takes no positional argument, {args} provided")
-                    
-                #     return f"(gvector-count {name})", int
-                
-                attributes: Dict[str, Callable[[Call], TupleType[str, type]]] = {
-                    'append' : append,
-                    'pop'    : pop,
-                    'insert' : insert,
-                    # 'count'  : count
-                }
-                
-                return attributes.get(attr, error)(node, name, nType)
-
-            #* TYPE-CONVERTERS
-            
-            # 'int'   : Typer.TFunction([Typer.TUnion([int, float, str, bool])],       kwArgs=[], vararg=False, ret=int),
-            # 'float' : Typer.TFunction([Typer.TUnion([float, int, str, bool])],         kwArgs=[], vararg=False, ret=float),
-            # 'str'   : Typer.TFunction([Typer.TUnion([str, int, float, bool])], kwArgs=[], vararg=False, ret=str),
-            # 'bool'  : Typer.TFunction([Typer.TUnion([bool, int, float, str])],  kwArgs=[], vararg=False, ret=bool)
-            
-            @staticmethod
-            def int(node: Call) -> TupleType[str, type]:
-                Builder.buildFlags['TO_INT'] = True
-                accepted = [int, float, str, bool]
-                if not (lArgs := len(node.args)) == 1:
-                    raise TypeError(f"builtin typeConverter int takes 1 arguments, {lArgs} provided")
-                
-                argV, argT = Builder.buildFromNodeType(node.args[0])
-                if argT not in accepted:
-                    if isinstance(argT, Typer.TAny):
-                        #? Yes, this has to be a seperate if
-                        if not Builder.getStateKeyLocal('__assignSkipValue__'):
-                            warn("TypeWarning", "Can not assure type correctness for Any", node.args[0])
-                    else:
-                        raise TypeError(f"builtin typeConverter int takes {accepted}, {argT} provided")
-                
-                return f"(int {argV})", int
-
-            @staticmethod
-            def float(node: Call) -> TupleType[str, type]:
-                Builder.buildFlags['TO_FLOAT'] = True
-                accepted = [float, int, str, bool]
-                if not (lArgs := len(node.args)) == 1:
-                    raise TypeError(f"builtin typeConverter float takes 1 arguments, {lArgs} provided")
-                
-                argV, argT = Builder.buildFromNodeType(node.args[0])
-                if argT not in accepted:
-                    if isinstance(argT, Typer.TAny):
-                        #? Yes, this has to be a seperate if
-                        if not Builder.getStateKeyLocal('__assignSkipValue__'):
-                            warn("TypeWarning", "Can not assure type correctness for Any", node.args[0])
-                    else:
-                        raise TypeError(f"builtin typeConverter float takes {accepted}, {argT} provided")
-                
-                return f"(float {argV})", float
-            
-            @staticmethod
-            def str(node: Call) -> TupleType[str, type]:
-                Builder.buildFlags['TO_STR'] = True
-                accepted = [str, int, float, bool]
-                if not (lArgs := len(node.args)) == 1:
-                    raise TypeError(f"builtin typeConverter str takes 1 arguments, {lArgs} provided")
-                
-                argV, argT = Builder.buildFromNodeType(node.args[0])
-                if argT not in accepted:
-                    if isinstance(argT, Typer.TAny):
-                        #? Yes, this has to be a seperate if
-                        if not Builder.getStateKeyLocal('__assignSkipValue__'):
-                            warn("TypeWarning", "Can not assure type correctness for Any", node.args[0])
-                    else:
-                        raise TypeError(f"builtin typeConverter str takes {accepted}, {argT} provided")
-                
-                return f"(str {argV})", str
-            
-            @staticmethod
-            def bool(node: Call) -> TupleType[str, type]:
-                Builder.buildFlags['TO_BOOL'] = True
-                accepted = [bool, int, float, str]
-                if not (lArgs := len(node.args)) == 1:
-                    raise TypeError(f"builtin typeConverter bool takes 1 arguments, {lArgs} provided")
-                
-                argV, argT = Builder.buildFromNodeType(node.args[0])
-                if argT not in accepted:
-                    if isinstance(argT, Typer.TAny):
-                        #? Yes, this has to be a seperate if
-                        if not Builder.getStateKeyLocal('__assignSkipValue__'):
-                            warn("TypeWarning", "Can not assure type correctness for Any", node.args[0])
-                    else:
-                        raise TypeError(f"builtin typeConverter bool takes {accepted}, {argT} provided")
-                
-                return f"(bool {argV})", bool
-        
         ret = None
         with TempState('__resolveAsIf__', False):
             if not isinstance(node.func, Attribute):
                 #? Normal call
-                specials: Dict[str, Callable[[Call], TupleType[str, type]]] = {
-                    'print' : CallResolver.print,
-                    'range' : CallResolver.range,
-                    'input' : CallResolver.input,
-                    'len'   : CallResolver.len,
-                    'int'   : CallResolver.int,
-                    'float' : CallResolver.float,
-                    'str'   : CallResolver.str,
-                    'bool'  : CallResolver.bool,
-                }
-                
-                ret = specials.get(Builder.buildFromNode(node.func), CallResolver.normal)(node)
+                ret = CALL_SPECIALS.get(Builder.buildFromNode(node.func), CallResolver.normal)(node)
             else:
                 #? Attributes
-                def error(node: Call, name: str, nType: type, attr: str):
-                    raise TypeError(f"object of type {nType} does not have any attribute functions")
-                
-                def fetchInfoFromAttribute(node: Attribute) -> TupleType[str, type, str]:
-                    """Get basic info from Attribute
-
-                    Arguments:
-                        node {Attribute} -- Attribute to analyze
-
-                    Returns:
-                        TupleType[str, type, str] -- VariableName, VariableType, AttributeCallName
-                    """
-                    if not isinstance(node.value, Name):
-                        raise TypeError(f"node of type {type(node.value)} may not use attributes")
-                    
-                    name, nType = Builder.buildFromNodeType(node.value)
-                    return name, nType, node.attr
-
-                name, nType, attr = fetchInfoFromAttribute(node.func)
-                
-                types: Dict[str, Callable[[Call], TupleType[str, type]]] = {
-                    Typer.TList: CallResolver.TList,
-                }
-                
-                ret = types.get(type(nType), error)(node, name, nType, attr)
+                name, nType, attr = CallResolver.fetchInfoFromAttribute(node.func)
+                ret = CALL_ATTRIBUTES.get(type(nType), CallResolver.attributeError)(node, name, nType, attr)
         
         #? Check if we should resolve as a literal if
         if Builder.getStateKeyLocal('__resolveAsIf__'):
@@ -865,23 +539,12 @@ class _Builder():
         return f"#:{node.arg} {value}", vType
 
     @staticmethod
-    def If(node: If) -> TupleType[str, bool]:
+    def If(node: If) -> Trampolined:
         #! The 'bool' in the returned Tuple indicates the return behaviour of this if
+        #! Nested ifs (e.g. elif ladders) are yielded, see `Nested`
         with TempState('__pathDidReturn__', set()):
-            def handleAssign(node: Assign) -> str:
-                with TempState('__assignSkipValue__', True):
-                    possibleDefine, isDefine = Builder.buildFromNodeType(node)
-                if isDefine:
-                # if not (len(possibleDefine) >= 5 and possibleDefine[:5] == "(set!") and not (len(possibleDefine) >= 18 and possibleDefine[:18] == "(safe-gvector-set!"):
-                    Builder.setStateKey(
-                        '__definitions__',
-                        [*Builder.getStateKeyLocal('__definitions__'), possibleDefine]
-                        )
-                    return Builder.buildFromNode(node)
-
-                return possibleDefine
-            def buildBody(elements: ListType[AST], innerBody: bool = True) -> str:
-                ret = ""
+            def buildBody(elements: ListType[AST], innerBody: bool = True) -> Trampolined:
+                ret: ListType[str] = []
                 didReturn = False
 
                 with TempState('__innerBody__', innerBody):
@@ -891,27 +554,26 @@ class _Builder():
 
                         #? Move possible definitions before rootDef in current scope
                         if isinstance(elem, Assign) or isinstance(elem, AnnAssign):
-                            ret += handleAssign(elem)
+                            ret.append(Builder.buildHoisted(elem))
                             continue
                         #? Make sure all paths have same return behaviour
                         if isinstance(elem, Return):
                             didReturn = True
                         #? Ensure return behaviour through multiple levels of if statements
                         if isinstance(elem, If):
-                            _ret, ifReturns = Builder.buildFromNodeType(elem) #* Yes, using 'buildFromNodeType' is a bit hacky but sufficient
-                            ret += _ret
+                            _ret, ifReturns = yield Nested.typed(elem) #* Yes, using 'Nested.typed' is a bit hacky but sufficient
+                            ret.append(_ret)
                             didReturn = ifReturns
                         else:
-                            ret += Builder.buildFromNode(elem)
+                            ret.append((yield Nested.source(elem)))
 
                 Builder.setStateKey('__pathDidReturn__', Builder.getStateKeyLocal('__pathDidReturn__') | set([didReturn]))
                 if len(Builder.getStateKeyLocal('__pathDidReturn__')) == 2:
                     raise ValueError("Please ensure all paths have the same return behaviour: https://github.com/Coronon/PySchemeTranspiler#multiple-returns")
 
-                return ret
+                return "".join(ret)
 
             paths: ListType[str] = []
-            body = ""
 
             #* Check if hierarchy
             rootDef = False
@@ -920,19 +582,19 @@ class _Builder():
                 rootDef = True
                 Builder.setStateKey('__definitionsClaim__', True)
 
-            body += buildBody(node.body)
+            body = yield from buildBody(node.body)
 
             if len(body) == 0:
                 raise IndentationError("expected an indented block")
 
             with TempState('__resolveAsIf__', True):
-                paths.append(f"({Builder.buildFromNode(node.test)} {body})")
+                paths.append(f"({(yield Nested.source(node.test))} {body})")
 
             if node.orelse:
                 if isinstance(node.orelse[0], If) and len(node.orelse) == 1:
-                    paths.append(buildBody([node.orelse[0]], False))
+                    paths.append((yield from buildBody([node.orelse[0]], False)))
                 else:
-                    body = buildBody(node.orelse)
+                    body = yield from buildBody(node.orelse)
                     paths.append(f"(else {body})")
 
 
@@ -976,6 +638,8 @@ class _Builder():
             ret = f"({fOp} {fLeftV} {fRightV})"
             if len(node.ops) == 1:
                 return ret, bool
+            
+            parts = [ret]
 
             #? Statements like: a < b > c < d -> a < b && b > c && c < d
             # We compile them into a flattend and
@@ -984,9 +648,9 @@ class _Builder():
                 leftV, leftT   = Builder.buildFromNodeType(leftE)
                 rightV, rightT = Builder.buildFromNodeType(rightE)
                 op = determineOp(opE, leftT, rightT)
-                ret += f"({op} {leftV} {rightV})"
+                parts.append(f"({op} {leftV} {rightV})")
                 
-        ret = f"(and {ret})"
+        ret = f"(and {''.join(parts)})"
         return ret, bool
         
     @staticmethod
@@ -1003,12 +667,12 @@ class _Builder():
     
     @staticmethod
     def Eq(node: Eq) -> str:
-        Builder.buildFlags['EQUAL'] = True
+        Builder.setBuildFlag('EQUAL')
         return "=="
 
     @staticmethod
     def NotEq(node: NotEq) -> str:
-        Builder.buildFlags['NOT_EQUAL'] = True
+        Builder.setBuildFlag('NOT_EQUAL')
         return "!="
     
     @staticmethod
@@ -1029,7 +693,7 @@ class _Builder():
 
     @staticmethod
     def List(node: List) -> TupleType[str, type]:
-        Builder.buildFlags['GROWABLE_VECTOR'] = True
+        Builder.setBuildFlag('GROWABLE_VECTOR')
         
         ret = None
         
@@ -1054,7 +718,8 @@ class _Builder():
         return ret
     
     @staticmethod
-    def AnnAssign(node: AnnAssign) -> str:
+    def AnnAssign(node: AnnAssign) -> TupleType[str, Optional[str]]:
+        #! The second element is the definition to hoist, it is only set when hoisting (see `Builder.buildHoisted`)
         name = node.target.id
         
         if not node.value:
@@ -1068,98 +733,32 @@ class _Builder():
         if Builder.inStateLocal(name):
             if isinstance(Builder.getStateKeyLocal(name), Typer.TPending):
                 pass
-            elif Builder.config['TYPES_STRICT']:
+            elif Builder.getConfig('TYPES_STRICT'):
                 #? Strict mode
                 raise TypeError(f"Can not redefine variable type")
             else:
                 #? Unstrict mode
                 if Builder.getStateKeyLocal('__definitionsClaim__'):
-                    warn("TypeWarning", "Can not assure type correctness for retyped variable in a control structure", Builder.currentNode)
+                    warn("TypeWarning", "Can not assure type correctness for retyped variable in a control structure", Builder.getCurrentNode())
                 
             Builder.setStateKey(name, aType)
                 
-            return f"(set! {name} {value})"
+            return f"(set! {name} {value})", None
         else:
-            if Builder.getStateKeyLocal('__assignSkipValue__'):
-                #? Some component doesnt want us to include the value
-                # Set as TPending to allow AnnAssign in if
-                Builder.setStateKey(name, Typer.TPending())
-                return f"(define {name} void)"
+            Builder.setStateKey(name, aType)
+            if Builder.getStateKeyLocal('__assignHoist__'):
+                #? Some component defines the variable before us, we only set it
+                return f"(set! {name} {value})", f"(define {name} void)"
             else:
-                Builder.setStateKey(name, aType)
-                return f"(define {name} {value})"
+                return f"(define {name} {value})", None
     
     @staticmethod
     def Subscript(node: Subscript) -> TupleType[str, type]:
         with TempState('__resolveAsIf__', False):
             name, nType = Builder.buildFromNodeType(node.value)
         
-        class SubscriptResolver():
-            @staticmethod
-            def error(name: str, nType: type, slice: Any):
-                raise TypeError(f"value of type {nType} can not be subscripted")
-            
-            @staticmethod
-            def TList(name: str, nType: type, slice: Union[Index, Slice]) -> TupleType[str, type]:
-                if isinstance(slice, Index):
-                    try:
-                        index, indexT = Builder.buildFromNodeType(slice)
-                        
-                        if indexT is int and (isinstance(index, int) or index.isnumeric()):
-                            index = int(index)
-                            if index < 0:
-                                index = f"(- (gvector-count {name}) {-index})"
-                        elif indexT is int and isinstance(index, str):
-                            index = f"(if (< {index} 0) (- (gvector-count {name}) (- {index})) {index})"
-                        else:
-                            raise ValueError()
-                        
-                    except ValueError:
-                        raise TypeError(f"instance of type {type(index)} can not be used to index into a list")
-                    
-                    return f"(gvector-access {name} {index})", nType.contained
-                elif isinstance(slice, Slice):
-                    raise NotImplementedError("Advanced slicing is not yet implemented for lists")
-                else:
-                    raise TypeError(f"type {type(slice)} can not be used to slice a list")
-            
-            @staticmethod
-            def TTuple(name: str, nType: type, slice: Union[Index, Slice]) -> TupleType[str, type]:
-                retType = None
-                if isinstance(slice, Index):
-                    try:
-                        index, indexT = Builder.buildFromNodeType(slice)
-                        
-                        if indexT is int and (isinstance(index, int) or index.isnumeric()):
-                            index = int(index)
-                            if abs(index) >= (tupleLen := len(nType.contained)):
-                                throw(ValueError(f"Index '{index}' is out of range for tuple of length {tupleLen}"), node)
-                            
-                            if index < 0:
-                                index = f"(- (vector-length {name}) {-index})"
-                            retType = nType.contained[abs(index)]
-                        elif indexT is int:
-                            index = f"(if (< {index} 0) (- (vector-length {name}) (- {index})) {index})"
-                        else:
-                            raise ValueError()
-                        
-                    except ValueError:
-                        raise TypeError(f"instance of type {type(index)} can not be used to index into a tuple")
-                    
-                    return f"(vector-ref {name} {index})", retType
-                elif isinstance(slice, Slice):
-                    raise NotImplementedError("Advanced slicing is not yet implemented for tuples")
-                else:
-                    raise TypeError(f"type {type(slice)} can not be used to slice a tuple")
-                
-        
-        types: Dict[str, Callable[[Call], TupleType[str, type]]] = {
-            Typer.TList: SubscriptResolver.TList,
-            Typer.TTuple: SubscriptResolver.TTuple,
-        }
-        
         with TempState('__resolveAsIf__', False):
-            ret = types.get(type(nType), SubscriptResolver.error)(name, nType, node.slice)
+            ret = SUBSCRIPT_TYPES.get(type(nType), SubscriptResolver.error)(node, name, nType)
         
         #? Check if we should resolve as a literal if
         if Builder.getStateKeyLocal('__resolveAsIf__'):
@@ -1181,20 +780,6 @@ class _Builder():
     
     @staticmethod
     def For(node: For) -> str:
-        def handleAssign(node: Assign) -> str:
-            with TempState('__assignSkipValue__', True):
-                # possibleDefine = Builder.buildFromNode(node)
-                possibleDefine, isDefine = Builder.buildFromNodeType(node)
-            if isDefine:
-            # if not (len(possibleDefine) >= 5 and possibleDefine[:5] == "(set!") and not (len(possibleDefine) >= 18 and possibleDefine[:18] == "(safe-gvector-set!"):
-                Builder.setStateKey(
-                '__definitions__',
-                [*Builder.getStateKeyLocal('__definitions__'), possibleDefine]
-                )
-                return Builder.buildFromNode(node)
-            
-            return possibleDefine
-        
         #* Handle iter typing
         iterc, itercType = Builder.buildFromNodeType(node.iter)
         if not isinstance(itercType, Typer.Iterable):
@@ -1222,7 +807,7 @@ class _Builder():
                 TypeError: Target and type incompatible
             """
             if Builder.inState(target):
-                if Builder.config['TYPES_STRICT']:
+                if Builder.getConfig('TYPES_STRICT'):
                     #? Strict mode
                     if not Typer.isTypeCompatible((sType := Builder.getStateKeyLocal(target)), targetType):
                         raise TypeError(f"Type {sType} and {targetType} are incompatible")
@@ -1256,10 +841,10 @@ class _Builder():
             raise NotImplementedError("multiple targets are currently not supported in for loops")
         
         if isinstance(target, str):
-            body = f"(set! {target} __i__)"
+            body = [f"(set! {target} __i__)"]
         else:
-            Builder.buildFlags['TO_LIST'] = True
-            body = f"(set!-values ({' '.join(target)}) (apply values (toList __i__)))"
+            Builder.setBuildFlag('TO_LIST')
+            body = [f"(set!-values ({' '.join(target)}) (apply values (toList __i__)))"]
         
         #* Check for hierarchy
         rootDef = False
@@ -1273,19 +858,16 @@ class _Builder():
                 for elem in node.body:
                     #? Move possible definitions before rootDef in current scope
                     if isinstance(elem, Assign) or isinstance(elem, AnnAssign):
-                        body += handleAssign(elem)
+                        body.append(Builder.buildHoisted(elem))
                         continue
                     
-                    body += Builder.buildFromNode(elem)
-        
-        if len(body) == 0:
-            raise IndentationError("expected an indented block")
+                    body.append(Builder.buildFromNode(elem))
         
         if node.orelse:
             raise NotImplementedError("'else' syntax is not supported in conjunction with for loops")
         
         
-        ret = f"(for-each (lambda (__i__) {body}) {iterc})"
+        ret = f"(for-each (lambda (__i__) {''.join(body)}) {iterc})"
         if not rootDef:
             return ret
         else:
@@ -1297,18 +879,65 @@ class _Builder():
     
     @staticmethod
     def ImportFrom(node: ImportFrom) -> str:
-        if not node.module in IGNORED_IMPORTS:
-            return _Builder.error(node)
+        if node.level == 0 and node.module in IGNORED_IMPORTS:
+            return ""
+        if node.level != 0:
+            raise ImportError("relative imports are not supported, import the module by its name from the project root")
+        
+        module = Builder.importModule(node.module)
+        names: ListType[str] = []
+        for alias in node.names:
+            if alias.name == "*":
+                raise ImportError(f"wildcard imports are not supported, import the names used from '{node.module}' explicitly")
+            if alias.name not in module.exports:
+                raise ImportError(f"cannot import name '{alias.name}' from '{node.module}'")
+            
+            Builder.setStateKey(alias.asname or alias.name, module.exports[alias.name])
+            if Typer.usesList(module.exports[alias.name]):
+                Builder.setBuildFlag('GROWABLE_VECTOR')
+            names.append(alias.name if alias.asname is None else f"[{alias.name} {alias.asname}]")
+        
+        Builder.require(f'(only-in "{module.path}" {" ".join(names)})')
+        return ""
+    
+    @staticmethod
+    def Import(node: Import) -> str:
+        for alias in node.names:
+            if alias.name in IGNORED_IMPORTS:
+                continue
+            if alias.asname is None and "." in alias.name:
+                raise ImportError(f"import submodules with a name, e.g. 'import {alias.name} as {alias.name.split('.')[-1]}'")
+            
+            module = Builder.importModule(alias.name)
+            name = alias.asname or alias.name
+            #? Members are bound with the module name as prefix, racket sees them the same way (see `prefix-in`)
+            Builder.setStateKey(name, Typer.TModule(alias.name))
+            for key, value in module.exports.items():
+                Builder.setStateKey(f"{name}.{key}", value)
+                if Typer.usesList(value):
+                    Builder.setBuildFlag('GROWABLE_VECTOR')
+            
+            Builder.require(f'(prefix-in {name}. "{module.path}")')
         
         return ""
     
     @staticmethod
-    def IfExp(node: IfExp) -> TupleType[str, type]:
+    def Attribute(node: Attribute) -> TupleType[str, type]:
+        name, nType, attr = CallResolver.fetchInfoFromAttribute(node)
+        if not isinstance(nType, Typer.TModule):
+            raise TypeError(f"object of type {nType} does not have any attributes")
+        
+        member = Name(id=CallResolver.moduleMember(name, nType, attr), ctx=Load())
+        copyLocation(node, member)
+        return _Builder.Name(member)
+    
+    @staticmethod
+    def IfExp(node: IfExp) -> Trampolined:
         with TempState('__resolveAsIf__', True):
-            test = Builder.buildFromNode(node.test)
+            test = yield Nested.source(node.test)
         
-        body, bodyT = Builder.buildFromNodeType(node.body)
-        orelse, orelseT = Builder.buildFromNodeType(node.orelse)   
+        body, bodyT = yield Nested.typed(node.body)
+        orelse, orelseT = yield Nested.typed(node.orelse)
         
         retType = Typer.mergeTypes(bodyT, orelseT, True)
 
@@ -1349,7 +978,7 @@ class _Builder():
     
     @staticmethod
     def In(node: In) -> str:
-        Builder.buildFlags['IN'] = True
+        Builder.setBuildFlag('IN')
         return "in?"
     
     @staticmethod
@@ -1363,18 +992,6 @@ class _Builder():
 
     @staticmethod
     def While(node: While) -> str:
-        def handleAssign(node: Assign) -> str:
-            with TempState('__assignSkipValue__', True):
-                possibleDefine, isDefine = Builder.buildFromNodeType(node)
-            if isDefine:
-                Builder.setStateKey(
-                '__definitions__',
-                [*Builder.getStateKeyLocal('__definitions__'), possibleDefine]
-                )
-                return Builder.buildFromNode(node)
-            
-            return possibleDefine
-        
         #* Compile test
         test = Builder.buildFromNode(node.test)
         
@@ -1385,17 +1002,18 @@ class _Builder():
             rootDef = True
             Builder.setStateKey('__definitionsClaim__', True)
         
-        body = ""
+        body: ListType[str] = []
         with TempState('__loop__', True):
             with TempState('__innerBody__', True):
                 for elem in node.body:
                     #? Move possible definitions before rootDef in current scope
                     if isinstance(elem, Assign) or isinstance(elem, AnnAssign):
-                        body += handleAssign(elem)
+                        body.append(Builder.buildHoisted(elem))
                         continue
                     
-                    body += Builder.buildFromNode(elem)
+                    body.append(Builder.buildFromNode(elem))
         
+        body = "".join(body)
         if len(body) == 0:
             raise IndentationError("expected an indented block")
         
@@ -1448,7 +1066,9 @@ class Builder():
         Subscript   : _Builder.Subscript,
         Index       : _Builder.Index,
         For         : _Builder.For,
+        Import      : _Builder.Import,
         ImportFrom  : _Builder.ImportFrom,
+        Attribute   : _Builder.Attribute,
         keyword     : _Builder.keyword,
         IfExp       : _Builder.IfExp,
         Assert      : _Builder.Assert,
@@ -1458,34 +1078,93 @@ class Builder():
         While       : _Builder.While,
     }
     
-    buildFlags = {
-        'NAME_IS_MAIN'            : True,  # Include '__name__' declaration
-        'PRINT'                   : False, # Include PRINT function
-        'EQUAL'                   : False, # Include == function
-        'NOT_EQUAL'               : False, # Include != function
-        'IN'                      : False, # Include in? function
-        'INPUT'                   : False, # Include input function
-        'GROWABLE_VECTOR_REQUIRE' : False, # Include growableVectors require
-        'GROWABLE_VECTOR'         : False, # Include growableVectors (std)
-        'DEEPCOPY'                : False, # Include deepcopy function
-        'TO_INT'                  : False, # Include to int converter
-        'TO_FLOAT'                : False, # Include to float converter
-        'TO_STR'                  : False, # Include to str converter
-        'TO_BOOL'                 : False, # Include to bool converter
-        'TO_LIST'                 : False, # Include to list converter
-    }
+    @staticmethod
+    def session() -> TranspilerSession:
+        """Get the transpilation session active in the current thread
+
+        Returns:
+            TranspilerSession -- Active session
+        """
+        return TranspilerSession.current()
     
-    config = {
-        'TYPES_STRICT' : True,
-        'DEBUG'        : False
-    }
+    @staticmethod
+    def setBuildFlag(flag: str) -> None:
+        """Activate a build flag in the current session
+
+        Arguments:
+            flag {str} -- Flag to activate (see `DEFAULT_BUILD_FLAGS`)
+        """
+        TranspilerSession.current().buildFlags[flag] = True
+    
+    @staticmethod
+    def importModule(name: str) -> Any:
+        """Get the interface of a module the current file may import
+
+        Arguments:
+            name {str} -- Dotted name of the module
+
+        Raises:
+            ModuleNotFoundError -- The module is not part of the project
+            ImportError         -- The import is not at the top level
+
+        Returns:
+            ModuleInterface -- Interface of the module (see `interface.ModuleInterface`)
+        """
+        session = TranspilerSession.current()
+        if session.symbols.depth != 0 or Builder.getStateKeyLocal('__innerBody__') or Builder.getStateKeyLocal('__loop__'):
+            raise ImportError("modules can only be imported at the top level")
+        if (module := session.modules.get(name)) is None:
+            raise ModuleNotFoundError(f"No module named '{name}'")
+        
+        return module
+    
+    @staticmethod
+    def require(spec: str) -> None:
+        """Require a racket module at the top of the current file
+
+        Arguments:
+            spec {str} -- Require spec (e.g. `(only-in "mod.rkt" f)`)
+        """
+        TranspilerSession.current().requires.append(f"(require {spec})")
     
-    defaultWidenedState = {}
+    @staticmethod
+    def exports() -> Dict[str, Any]:
+        """Get the root bindings an importing file may use, the functions and variables defined at the top level
+
+        Returns:
+            Dict[str, Any] -- Types by name
+        """
+        exported = {}
+        for key, value in TranspilerSession.current().symbols.scope(0).items():
+            if key in BUILTIN_NAMES or (key.startswith("__") and key.endswith("__")):
+                continue
+            #? Modules and their prefixed members are only known to the importing file
+            if "." in key or isinstance(value, Typer.TModule):
+                continue
+            exported[key] = value
+        
+        return exported
     
-    #? For default state see `Builder.initState()`
-    stateHistory: ListType[Dict[str, Any]] = [{}]
+    @staticmethod
+    def getConfig(key: str) -> Any:
+        """Get a config value of the current session
+
+        Arguments:
+            key {str} -- Key of config value
+
+        Returns:
+            Any -- Config value
+        """
+        return TranspilerSession.current().config[key]
     
-    currentNode: AST = None
+    @staticmethod
+    def getCurrentNode() -> AST:
+        """Get the node that is currently being built
+
+        Returns:
+            AST -- Current node
+        """
+        return TranspilerSession.current().currentNode
     
     @staticmethod
     def buildFromNode(node: AST) -> str:
@@ -1498,11 +1177,7 @@ class Builder():
             str -- Compiled sourceCode
         """
         #* Switch of all Nodes supported
-        ret = Builder._buildFromNode(node)
-        if isinstance(ret, tuple):
-            return ret[0]
-        
-        return ret
+        return Builder.asSource(Builder._buildFromNode(node))
     
     @staticmethod
     def buildFromNodeType(node: AST) -> TupleType[str, Any]:
@@ -1515,8 +1190,65 @@ class Builder():
             str -- Compiled sourceCode
             Any -- Type of compiled object (for internal use)
         """
+        return Builder.asType(Builder._buildFromNode(node))
+    
+    @staticmethod
+    def buildHoisted(node: Union[Assign, AnnAssign]) -> str:
+        """Build an assignment in the body of an if/loop and move the definition of a new
+        variable before the root(if/loop), so it persists in the current scope
+
+        Arguments:
+            node {Union[Assign, AnnAssign]} -- Assignment to compile
+
+        Returns:
+            str -- Compiled sourceCode of the assignment
+        """
+        with TempState('__assignHoist__', True):
+            assignment, definition = Builder.buildFromNodeType(node)
+        if definition is not None:
+            Builder.setStateKey(
+                '__definitions__',
+                [*Builder.getStateKeyLocal('__definitions__'), definition]
+                )
+        
+        return assignment
+    
+    @staticmethod
+    def buildFromNodeIR(node: AST) -> TupleType[Value, Any]:
+        """Build an expression from a AST node with type information.
+        Unlike `Builder.buildFromNodeType` the result is not serialized, so it
+        can still be rewritten (see `SExpr.chain`)
+
+        Arguments:
+            node {AST} -- Node to compile
+
+        Returns:
+            Value -- Compiled expression
+            Any   -- Type of compiled object (for internal use)
+        """
         #* Switch of all Nodes supported
-        ret = Builder._buildFromNode(node)
+        return Builder.asIR(Builder._buildFromNode(node))
+    
+    @staticmethod
+    def asSource(ret: Any) -> str:
+        """Serialize the raw result of a builder, see `Builder.buildFromNode`
+        """
+        if isinstance(ret, tuple):
+            return serialize(ret[0])
+        
+        return serialize(ret)
+    
+    @staticmethod
+    def asType(ret: Any) -> TupleType[str, Any]:
+        """Serialize the raw result of a builder and keep its type, see `Builder.buildFromNodeType`
+        """
+        value, vType = Builder.asIR(ret)
+        return serialize(value), vType
+    
+    @staticmethod
+    def asIR(ret: Any) -> TupleType[Value, Any]:
+        """Raw result of a builder with type information, see `Builder.buildFromNodeIR`
+        """
         if isinstance(ret, tuple):
             return ret
         
@@ -1533,22 +1265,134 @@ class Builder():
             str -- Compiled sourceCode
             Any -- Type of compiled object (for internal use)
         """
-        Builder.currentNode = node
+        session = TranspilerSession.current()
+        session.currentNode = node
         
-        if Builder.config['DEBUG']:
-            return Builder.switcher.get(type(node), _Builder.error)(node)
+        if session.config['DEBUG']:
+            ret = Builder.switcher.get(type(node), _Builder.error)(node)
+        else:
+            try:
+                ret = Builder.switcher.get(type(node), _Builder.error)(node)
+            except (ConversionException, RecursionError):
+                #? Already reported by a nested node or reported by the statement (see `Builder.buildStatement`)
+                raise
+            except Exception as e:
+                throw(e, node)
+        
+        if isinstance(ret, GeneratorType):
+            return Builder._trampoline(node, ret, session)
+        return ret
+    
+    @staticmethod
+    def _trampoline(node: AST, generator: Trampolined, session: TranspilerSession) -> TupleType[str, Any]:
+        """Internally used to run trampolined builders (see `Nested`) on an explicit stack
+        instead of the python stack, so their nesting depth is only limited by memory.
+        Exceptions are raised into the frame that requested the failing node, like a recursive call would
+
+        Arguments:
+            node      {AST}                -- Node being built
+            generator {Trampolined}        -- Started builder of the node
+            session   {TranspilerSession}  -- Active session
+
+        Raises:
+            ConversionException -- Exception caught in transpilation
+
+        Returns:
+            str -- Compiled sourceCode
+            Any -- Type of compiled object (for internal use)
+        """
+        debug = session.config['DEBUG']
+        switcher = Builder.switcher
+        #? Frames of (node, generator, finish of the request of the parent frame)
+        stack: ListType[TupleType[AST, Trampolined, Any]] = [(node, generator, None)]
+        sent: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            frameNode, frame, finish = stack[-1]
+            try:
+                if error is None:
+                    child, childFinish = frame.send(sent)
+                else:
+                    child, childFinish = frame.throw(error)
+            except StopIteration as stop:
+                stack.pop()
+                if not stack:
+                    return stop.value
+                sent, error = finish(stop.value), None
+                continue
+            except BaseException as e:
+                stack.pop()
+                error = Builder._reported(e, frameNode, debug)
+                if not stack:
+                    raise error
+                continue
+            
+            session.currentNode = child
+            try:
+                ret = switcher.get(type(child), _Builder.error)(child)
+            except BaseException as e:
+                sent, error = None, Builder._reported(e, child, debug)
+                continue
+            
+            if isinstance(ret, GeneratorType):
+                stack.append((child, ret, childFinish))
+                sent = None
+            else:
+                sent = childFinish(ret)
+    
+    @staticmethod
+    def _reported(error: BaseException, node: AST, debug: bool) -> BaseException:
+        """Internally used to report an exception of a trampolined node like `Builder._buildFromNode` does
+
+        Returns:
+            BaseException -- Exception to raise into the parent frame
+        """
+        if debug or not isinstance(error, Exception) or isinstance(error, (ConversionException, RecursionError)):
+            return error
         
         try:
-            return Builder.switcher.get(type(node), _Builder.error)(node)
-        except Exception as e:
-            throw(e, node)
+            throw(error, node)
+        except BaseException as e:
+            return e
     
     @staticmethod
-    def initState() -> None:
-        """Init the root state to avoid foreward declaration issues
-        """
-        defaultRootExclusiveState = {
-            '__name__' : str,
+    def buildStatement(node: AST) -> str:
+        """Build sourceCode from a top-level statement.
+        If the session collects errors (see `MAX_ERRORS`) a failing statement is
+        skipped and the state is rolled back to the root scope.
+
+        Arguments:
+            node {AST} -- Top-level statement to compile
+
+        Returns:
+            str -- Compiled sourceCode (empty if the statement failed)
+        """
+        try:
+            try:
+                return Builder.buildFromNode(node)
+            except RecursionError:
+                if Builder.getConfig('DEBUG'):
+                    raise
+                #? Reported once the stack is unwound, deeper nodes have no room left to report it
+                throw(RecursionError(f"statement is nested too deeply to transpile (more than {sys.getrecursionlimit()} python frames)"), node)
+        except ConversionException:
+            session = TranspilerSession.current()
+            while session.symbols.depth > 0:
+                Builder.popState()
+            for key, value in session.defaultWidenedState.items():
+                Builder.setStateKey(key, value)
+            
+            return ""
+    
+    @staticmethod
+    def initState() -> None:
+        """Init the root state of the current session to avoid foreward declaration issues
+        """
+        session = TranspilerSession.current()
+        session.reset()
+        
+        defaultRootExclusiveState = {
+            '__name__' : str,
             'bool'     : bool,
             'int'      : int,
             'float'    : float,
@@ -1565,18 +1409,18 @@ class Builder():
             # 'str'   : Typer.TFunction([Typer.TUnion([int, float, bool, list])], kwArgs=[], vararg=False, ret=str),
             # 'bool'  : Typer.TFunction([Typer.TUnion([int, float, str, list])],  kwArgs=[], vararg=False, ret=bool)
         }
-        Builder.defaultWidenedState = {
+        session.defaultWidenedState = {
             '__loop__'            : False, #? Flag for transpiler if in an active loop
             '__pathDidReturn__'   : set(), #? Used to check that all paths in nested if/loop have same return behaviour
             '__innerBody__'       : False, #? Flag for transpiler if currently in an if body
             '__definitionsClaim__': False, #? Flag for transpiler to communicate root(if/loop) lock
             '__definitions__'     : [],    #? Used to store local definitions to make them persistent on lvl of root(if/loop)
-            '__assignSkipValue__' : False, #? Flag for transpiler to not include value in assignment
+            '__assignHoist__'     : False, #? Flag for transpiler to return the definition of an assignment seperately
             '__resolveAsIf__'     : False, #? Flag for transpiler to resolve constant and name as their basic testCase
             '__didReturn__'       : False, #? Flag for transpiler to indicate that a function has a return
         }
         
-        Builder.setState({**defaultRootExclusiveState, **Builder.defaultWidenedState})
+        Builder.setState({**defaultRootExclusiveState, **session.defaultWidenedState})
         
         #? This line is required as we can only declare the constants (located at the top)
         #? after everythin else is defined
@@ -1589,7 +1433,7 @@ class Builder():
         Returns:
             Dict[str, Any] -- State
         """
-        return Builder.stateHistory[-1]
+        return TranspilerSession.current().symbols.scope()
     
     @staticmethod
     def getStateKey(key: str) -> Any:
@@ -1604,10 +1448,7 @@ class Builder():
         Returns:
             Any -- Element found
         """
-        for state in reversed(Builder.stateHistory):
-            if key in state:
-                return state[key]
-        raise KeyError(f"key {key} not in state")
+        return TranspilerSession.current().symbols.get(key)
 
     @staticmethod
     def getStateKeyLocal(key: str) -> Any:
@@ -1622,7 +1463,7 @@ class Builder():
         Returns:
             Any -- Element found
         """
-        return Builder.stateHistory[-1][key]
+        return TranspilerSession.current().symbols.getLocal(key)
     
     @staticmethod
     def inState(key: str) -> bool:
@@ -1634,10 +1475,7 @@ class Builder():
         Returns:
             bool -- Key in State
         """
-        for state in reversed(Builder.stateHistory):
-            if key in state:
-                return True
-        return False
+        return TranspilerSession.current().symbols.contains(key)
     
     @staticmethod
     def inStateLocal(key: str) -> bool:
@@ -1649,13 +1487,14 @@ class Builder():
         Returns:
             bool -- Key in State
         """
-        return key in Builder.stateHistory[-1]
+        return TranspilerSession.current().symbols.containsLocal(key)
 
     @staticmethod
     def widenState() -> None:
         """Widen the compilation State on new scope
         """
-        Builder.stateHistory.append(Builder.defaultWidenedState)
+        session = TranspilerSession.current()
+        session.symbols.widen(session.defaultWidenedState)
     
     @staticmethod
     def popState() -> Dict[str, Any]:
@@ -1667,10 +1506,7 @@ class Builder():
         Returns:
             Dict[str, Any] -- Poped State
         """
-        if len(Builder.stateHistory) == 1:
-            raise ValueError("Can not pop root State")
-        
-        return Builder.stateHistory.pop()
+        return TranspilerSession.current().symbols.pop()
     
     @staticmethod
     def setStateKey(key: str, value: Any) -> None:
@@ -1680,7 +1516,7 @@ class Builder():
             key   {str} -- Key of element
             value {Any} -- Value of element
         """
-        Builder.stateHistory[-1][key] = value
+        TranspilerSession.current().symbols.set(key, value)
     
     @staticmethod
     def setStateKeyPropagate(key: str, value: Any) -> None:
@@ -1690,8 +1526,9 @@ class Builder():
             key   {str} -- Key of element
             value {Any} -- Value of element
         """
-        Builder.stateHistory[-1][key] = value
-        Builder.stateHistory[-2][key] = value
+        symbols = TranspilerSession.current().symbols
+        symbols.set(key, value)
+        symbols.set(key, value, symbols.depth - 1)
     
     @staticmethod
     def setState(state: Dict[str, Any]) -> None:
@@ -1700,7 +1537,11 @@ class Builder():
         Arguments:
             state {Dict[str, Any]} -- Compilation State
         """
-        Builder.stateHistory[-1] = state
+        symbols = TranspilerSession.current().symbols
+        for key in list(symbols.scopes[-1]):
+            symbols.remove(key)
+        for key, value in state.items():
+            symbols.set(key, value)
 
     @staticmethod
     def removeStateKeyLocal(key: str) -> None:
@@ -1709,8 +1550,99 @@ class Builder():
         Arguments:
             key {str} -- Key to remove
         """
-        del Builder.stateHistory[-1][key]
+        TranspilerSession.current().symbols.remove(key)
+
+
+class FrozenDict(dict):
+    """Hashable read-only dict used inside of type objects
+    """
+    def __hash__(self) -> int:
+        return hash(frozenset(self.items()))
+    
+    def _readOnly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("type objects are immutable")
+    
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readOnly
+    
+    def __reduce__(self) -> Any:
+        return FrozenDict, (dict(self),)
+
+def freezeType(value: Any) -> Any:
+    """Convert the mutable containers of a type (e.g. the argument list of a function) to immutable ones
+
+    Arguments:
+        value {Any} -- Type or container of types
+
+    Returns:
+        Any -- Hashable equivalent
+    """
+    kind = type(value)
+    if kind is list or kind is tuple:
+        return tuple([freezeType(x) for x in value])
+    if kind is dict:
+        return FrozenDict({key: freezeType(x) for key, x in value.items()})
+    
+    return value
+
+#? Marks interned type objects inside of identity keys
+_IDENTITY = object()
+
+def typeIdentity(value: Any) -> Any:
+    """Key of a type that only matches the same types
+    (`==` on type objects ignores their class, e.g. Null() == TAny())
+
+    Arguments:
+        value {Any} -- Type or container of types
+
+    Returns:
+        Any -- Hashable key
+    """
+    if isinstance(type(value), InternedType):
+        #? Nested type objects are interned already and kept alive by their parent
+        return _IDENTITY, id(value)
+    
+    kind = type(value)
+    if kind is list or kind is tuple:
+        return tuple([typeIdentity(x) for x in value])
+    if kind is dict or kind is FrozenDict:
+        return frozenset((key, typeIdentity(x)) for key, x in value.items())
+    
+    return value
+
+#? All type objects alive, equal type objects are only created once
+_internedTypes: WeakValueDictionary = WeakValueDictionary()
+#? Constructor arguments of all type objects alive, skips constructing known types
+_constructedTypes: WeakValueDictionary = WeakValueDictionary()
+
+class InternedType(type):
+    def __call__(cls, *args: Any, **kwargs: Any) -> Any:
+        """Construct a type object and return the existing equal one if there is one
+        """
+        key = (cls, typeIdentity(args), typeIdentity(kwargs) if kwargs else None)
+        if (obj := _constructedTypes.get(key)) is not None:
+            return obj
+        
+        obj = InternedType._intern(super().__call__(*args, **kwargs))
+        _constructedTypes[key] = obj
+        
+        return obj
+    
+    @staticmethod
+    def _intern(obj: Any) -> Any:
+        state = obj._state()
+        #? Types without fields (e.g. `TAny`, `TPending`, `Null`) all have the same state
+        object.__setattr__(obj, '_hash', hash((type(obj), state)))
+        
+        return _internedTypes.setdefault((type(obj), typeIdentity(state)), obj)
 
+def restoreType(cls: InternedType, state: TupleType[TupleType[str, Any], ...]) -> Any:
+    """Unpickle a type object (see `Typer.T.__reduce__`)
+    """
+    obj = cls.__new__(cls)
+    for name, value in state:
+        object.__setattr__(obj, name, value)
+    
+    return InternedType._intern(obj)
 
 class _Typer():
     literals: Dict[str, type] = {
@@ -1744,36 +1676,54 @@ class _Typer():
     
     @staticmethod
     def _literalSubscript(node: Subscript) -> type:
-        class LiteralSubscriptResolver():
-            @staticmethod
-            def error(node: Subscript) -> type:
-                raise TypeError(f"subscript-type {node.value.id} is not supported")
-            
-            @staticmethod
-            def normal(node: Subscript) -> type:
-                if Builder.inState(node.value.id):
-                    if isinstance((listT := Builder.getStateKey(node.value.id)), Typer.TList):
-                        return listT.contained
-                    
-                return LiteralSubscriptResolver.error(node)
-            
-            @staticmethod
-            def List(node: Subscript) -> type:
-                return Typer.TList(_Typer._literalAnnotation(node.slice.value))
-            
-            @staticmethod
-            def Tuple(node: Subscript) -> type:
-                return Typer.TTuple(_Typer._literalAnnotation(node.slice.value))
+        if (key := _Typer._annotationKey(node)) is not None:
+            return _Typer._annotationFromKey(key)
         
-        specials: Dict[str, Callable[[Call], type]] = {
-            'List': LiteralSubscriptResolver.List,
-            'Tuple': LiteralSubscriptResolver.Tuple,
-        }
-        
-        return specials.get(node.value.id, LiteralSubscriptResolver.normal)(node)
+        return LITERAL_SUBSCRIPT_SPECIALS.get(node.value.id, LiteralSubscriptResolver.normal)(node)
+
+    @staticmethod
+    def _annotationKey(node: AST) -> Optional[TupleType[Any, ...]]:
+        """Structural key of an annotation that does not depend on the state, None if it does
 
+        Arguments:
+            node {AST} -- Annotation
+
+        Returns:
+            Optional[TupleType[Any, ...]] -- Key for `_Typer._annotationFromKey`
+        """
+        if isinstance(node, Name):
+            return ('Name', node.id)
+        elif isinstance(node, Subscript):
+            if isinstance(node.value, Name) and node.value.id in LITERAL_SUBSCRIPT_SPECIALS and isinstance(node.slice, Index):
+                if (inner := _Typer._annotationKey(node.slice.value)) is not None:
+                    return ('Subscript', node.value.id, inner)
+        elif isinstance(node, Tuple):
+            elements = [_Typer._annotationKey(res) for res in node.elts]
+            if None not in elements:
+                return ('Tuple', *elements)
+        
+        return None
+    
+    @staticmethod
+    @lru_cache(maxsize=TYPE_CACHE_SIZE)
+    def _annotationFromKey(key: TupleType[Any, ...]) -> type:
+        kind = key[0]
+        if kind == 'Name':
+            return _Typer._literalName(key[1])
+        elif kind == 'Subscript':
+            #? The specials only construct the type from the contained one
+            contained = _Typer._annotationFromKey(key[2])
+            return Typer.TList(contained) if key[1] == 'List' else Typer.TTuple(contained)
+        
+        return tuple(_Typer._annotationFromKey(element) for element in key[1:])
+    
     @staticmethod
     def _literalAnnotation(node: AST) -> type:
+        if (key := _Typer._annotationKey(node)) is not None:
+            annotation = _Typer._annotationFromKey(key)
+            #? Cached tuple annotations are shared and therefore immutable
+            return list(annotation) if key[0] == 'Tuple' else annotation
+        
         if isinstance(node, Name):
             return _Typer._literalName(node.id)
         elif isinstance(node, Subscript):   
@@ -1799,26 +1749,55 @@ class _Typer():
 
         return _Typer.error(node)
 
+    @staticmethod
+    def Attribute(node: Attribute) -> type:
+        _, aType = Builder.buildFromNodeType(node)
+        return aType
+    
     @staticmethod
     def NoneType(node: None) -> type:
         return None
 
 class Typer():
     
-    class T():
+    class T(metaclass=InternedType):
+        #? Type objects are immutable and interned, equal types are mostly the same object
+        __slots__ = ('__weakref__', '_hash')
+        _fields: TupleType[str, ...] = ()
+        
+        def _set(self, **fields: Any) -> None:
+            #? Only used while constructing
+            for name, value in fields.items():
+                object.__setattr__(self, name, freezeType(value))
+        
+        def _state(self) -> TupleType[TupleType[str, Any], ...]:
+            return tuple((name, getattr(self, name)) for name in self._fields)
+        
+        def __setattr__(self, name: str, value: Any) -> None:
+            raise AttributeError(f"type {self.type} is immutable")
+        
         def __repr__(self):
-            return str(f"<{self.type}: {self.__dict__}>")
+            fields = {name: list(value) if isinstance(value, tuple) else value for name, value in self._state()}
+            return str(f"<{self.type}: {fields}>")
         
         def __eq__(self, value: Typer.T):
-                return isinstance(value, Typer.T) and self.__dict__ == value.__dict__
+            return self is value or (type(self) is type(value) and self._state() == value._state())
+        
+        def __hash__(self) -> int:
+            return self._hash
+        
+        def __reduce__(self) -> Any:
+            return restoreType, (type(self), self._state())
     
     class Null(T):
+        __slots__ = ()
         type = "Null"
         
         def __repr__(self):
             return "NULL"
     
     class Iterable():
+        __slots__ = ()
         type = "Iterable"
         
         def __init__(self, iterType: type) -> None:
@@ -1827,64 +1806,77 @@ class Typer():
             Arguments:
                 iterType {type} -- Type of objects returned on iteration
             """
-            self.iterType = iterType
+            self._set(iterType=iterType)
     
     class TFunction(T):
+        __slots__ = _fields = ('args', 'kwArgs', 'vararg', 'ret')
         type = "TFunction"
         
         def __init__(self, args: ListType[type], kwArgs: Dict[str, type], vararg: bool, ret: type):
-            self.args   = args
-            self.kwArgs = kwArgs
-            self.vararg = vararg
-            self.ret    = ret
+            self._set(args=args, kwArgs=kwArgs, vararg=vararg, ret=ret)
     
     class TList(Iterable, T):
+        __slots__ = _fields = ('iterType', 'contained', 'native')
         type = "TList"
 
         def __init__(self, contained: type, native: bool=False):
             Typer.Iterable.__init__(self, contained)
-            self.contained = contained
-            self.native    = native
+            self._set(contained=contained, native=native)
         
         def __repr__(self):
             return str(f"<{self.type}: {self.contained}>")
     
     class TUnion(T):
+        __slots__ = _fields = ('anyOf',)
         type = "TUnion"
 
         def __init__(self, anyOf: ListType[type]):
-            self.anyOf = anyOf
+            self._set(anyOf=anyOf)
         
         def __repr__(self):
-            return str(f"<{self.type}: {self.anyOf}>")
+            return str(f"<{self.type}: {list(self.anyOf)}>")
     
     class TOptional(T):
+        __slots__ = _fields = ('optOf',)
         type = "TOptional"
 
         def __init__(self, optOf: type):
-            self.optOf = optOf
+            self._set(optOf=optOf)
         
         def __repr__(self):
             return str(f"<{self.type}: {self.optOf}>")
     
+    class TModule(T):
+        __slots__ = _fields = ('name',)
+        type = "TModule"
+        
+        def __init__(self, name: str):
+            self._set(name=name)
+        
+        def __repr__(self):
+            return str(f"<{self.type}: {self.name}>")
+    
     class TPending(T):
+        __slots__ = ()
         type = "TPending"
         
         def __repr__(self):
             return str(f"<{self.type}...>")
     
     class TTuple(Iterable, T):
+        __slots__ = _fields = ('iterType', 'contained')
         type ="TTuple"
         
         def __init__(self, contained: TupleType[type]):
             #! TAny as we dont give guarantees for iteration over tuples
             Typer.Iterable.__init__(self, Typer.TAny())
-            self.contained = contained
+            self._set(contained=contained)
         
         def __repr__(self):
-            return str(f"<{self.type}: {self.contained}>")
+            return str(f"<{self.type}: {list(self.contained)}>")
     
     class TAny(Iterable, T):
+        __slots__ = ()
         type = "TAny"
         
         #lgtm [py/missing-call-to-init]
@@ -1908,6 +1900,7 @@ class Typer():
         AnnAssign  : _Typer.AnnAssign,
         Subscript  : _Typer.Subscript,
         Call       : _Typer.Call,
+        Attribute  : _Typer.Attribute,
         type(None) : _Typer.NoneType,
         arg        : _Typer.arg
     }
@@ -1918,6 +1911,53 @@ class Typer():
     def deduceTypeFromNode(node: AST) -> type:
         return Typer.switcher.get(type(node), _Typer.error)(node)
     
+    @staticmethod
+    def deduceSignature(node: FunctionDef) -> Typer.TFunction:
+        """Deduce the type of a function from its annotations, without building it
+
+        Arguments:
+            node {FunctionDef} -- Function to deduce type of
+
+        Returns:
+            Typer.TFunction -- Type of function
+        """
+        argTypesDef = []
+        argTypesKey = {}
+        
+        argsLen     = len(node.args.args)
+        defaultsLen = len(node.args.defaults)
+        for i in range(argsLen):
+            if argsLen-defaultsLen-i <= 0:
+                #? Argument with default
+                argTypesKey[node.args.args[i].arg] = Typer.deduceTypeFromNode(node.args.args[i])
+            else:
+                argTypesDef.append(Typer.deduceTypeFromNode(node.args.args[i]))
+        
+        return Typer.TFunction(argTypesDef, argTypesKey, node.args.vararg is not None, Typer.deduceTypeFromNode(node.returns))
+    
+    @staticmethod
+    def usesList(t: type) -> bool:
+        """Check if a type is or contains a list type, values of it need the growable vector helpers
+
+        Arguments:
+            t {type} -- Type to check
+
+        Returns:
+            bool -- A list type is part of the type
+        """
+        if isinstance(t, Typer.TList):
+            return True
+        if isinstance(t, Typer.TFunction):
+            return any(Typer.usesList(arg) for arg in (*t.args, *dict(t.kwArgs).values(), t.ret))
+        if isinstance(t, Typer.TTuple):
+            return any(Typer.usesList(contained) for contained in t.contained)
+        if isinstance(t, Typer.TUnion):
+            return any(Typer.usesList(anyOf) for anyOf in t.anyOf)
+        if isinstance(t, Typer.TOptional):
+            return Typer.usesList(t.optOf)
+        
+        return False
+    
     @staticmethod
     def isTypeCompatible(type1: type, type2: type) -> bool:
         """Check if two types are compatible
@@ -1929,74 +1969,82 @@ class Typer():
         Returns:
             bool -- Types are compatible
         """
+        #? The check itself is memoized, the warnings it causes are emitted on every call
+        compatible, noneWarnings = Typer._compatible(freezeType(type1), freezeType(type2))
+        for _ in range(noneWarnings):
+            warn("TypeWarning", "Can not assure type correctness for None", Builder.getCurrentNode())
+        
+        return compatible
+    
+    @staticmethod
+    @lru_cache(maxsize=TYPE_CACHE_SIZE)
+    def _compatible(type1: type, type2: type) -> TupleType[bool, int]:
+        """Check if two types are compatible `DO NOT USE EXTERNALLY`
+
+        Returns:
+            bool -- Types are compatible
+            int  -- Amount of 'None' warnings the check causes
+        """
         #? Types are equal
         if type1 == type2:
-            return True
+            return True, 0
         #? Types are equal - None can be used as literal type
         if type1 is None and type2 == type(None) or type1 == type(None) and type2 is None:
-            return True
+            return True, 0
         
         #? One or both types are Any
         if type1 == Any or type2 == Any:
-            return True
+            return True, 0
         
         #? One or both types are None
         if type1 is None:
-            warn("TypeWarning", "Can not assure type correctness for None", Builder.currentNode)
-            return True
+            return True, 1
         elif type2 is None:
-            return True
+            return True, 0
         
         #? TUnion
         if isinstance(type1, Typer.TUnion):
-            if all([Typer.isTypeCompatible(x, type2) for x in type1.anyOf]):
-                return True
-            
-            return False
+            results = [Typer._compatible(x, type2) for x in type1.anyOf]
+            return all(result[0] for result in results), sum(result[1] for result in results)
         elif isinstance(type2, Typer.TUnion):
-            if any([Typer.isTypeCompatible(type1, x) for x in type2.anyOf]):
-                return True
-            
-            return False
+            results = [Typer._compatible(type1, x) for x in type2.anyOf]
+            return any(result[0] for result in results), sum(result[1] for result in results)
         
         #? TOptional
         if isinstance(type1, Typer.TOptional):
-            if isinstance(type2, Typer.TOptional) and Typer.isTypeCompatible(type1.optOf, type2.optOf):
-                return True
+            if isinstance(type2, Typer.TOptional):
+                return Typer._compatible(type1.optOf, type2.optOf)
             
-            return False
+            return False, 0
         elif isinstance(type2, Typer.TOptional):
-            if Typer.isTypeCompatible(type1, type2.optOf):
-                return True
-            
-            return False
+            return Typer._compatible(type1, type2.optOf)
         
         #? TList
         if isinstance(type1, Typer.TList):
-            if isinstance(type2, Typer.TList) and Typer.isTypeCompatible(type1.contained, type2.contained):
-                return True
+            if isinstance(type2, Typer.TList):
+                return Typer._compatible(type1.contained, type2.contained)
             
-            return False
+            return False, 0
         elif isinstance(type2, Typer.TList):
-            return False
+            return False, 0
         
         #? TPending
         if isinstance(type1, Typer.TPending):
             if not isinstance(type2, Typer.TPending):
-                return True
+                return True, 0
             
-            return False
+            return False, 0
         elif isinstance(type2, Typer.TPending):
             if not isinstance(type1, Typer.TPending):
-                return True
+                return True, 0
             
-            return False
+            return False, 0
         
         #? Number types (reject data loss from float->int)
         if type1 == int and type2 == float:
-            return True
+            return True, 0
         
-        return False
+        return False, 0
 
     @staticmethod
     def isRestrictedType(test: type) -> bool:
@@ -2022,6 +2070,13 @@ class Typer():
         Returns:
             type -- Merged type
         """
+        return Typer._merge(freezeType(type1), freezeType(type2), equals)
+    
+    @staticmethod
+    @lru_cache(maxsize=TYPE_CACHE_SIZE)
+    def _merge(type1: type, type2: type, equals: bool) -> type:
+        """Merge two types `DO NOT USE EXTERNALLY`
+        """
         if type1 == type2:
             return type1
         
@@ -2038,7 +2093,7 @@ class Typer():
         
         #? TList
         if isinstance(type1, Typer.TList) and isinstance(type2, Typer.TList):
-            return Typer.TList(Typer.mergeTypes(type1.contained, type2.contained, equals))
+            return Typer.TList(Typer._merge(type1.contained, type2.contained, equals))
         
         if type1 is None:
             return type2
@@ -2048,6 +2103,453 @@ class Typer():
         raise TypeError(f"can not merge types {type1} and {type2}")
 
 
+class CallResolver():
+    #* FUNCTIONS
+    @staticmethod
+    def withCall(node: Call, **fields: Any) -> Call:
+        """Copy a call with some of its fields replaced, builders never change their input
+
+        Arguments:
+            node   {Call} -- Call to copy
+            fields {Any}  -- Replaced fields (e.g. 'func' or 'args')
+
+        Returns:
+            Call -- Copy of call
+        """
+        copied = Call(func=fields.get('func', node.func), args=fields.get('args', node.args), keywords=fields.get('keywords', node.keywords))
+        copyLocation(node, copied)
+        
+        return copied
+    
+    @staticmethod
+    def normal(node: Call) -> TupleType[str, type]:
+        #* Type lookup
+        fName = Builder.buildFromNode(node.func)
+        fType: Typer.TFunction = Builder.getStateKey(fName)
+        
+        #? Check argument length matches
+        fArgsDef = len(fType.args)
+        fArgsKey = len(fType.kwArgs)
+        nArgsDef = len(node.args)
+        nArgsKey = len(node.keywords)
+        if (fType.vararg and nArgsDef < fArgsDef) or (not fType.vararg and fArgsDef != nArgsDef):
+            raise TypeError(f"{fName} takes {fArgsDef} positional arguments but you provided {nArgsDef}")
+        
+        if not (nArgsKey <= fArgsKey):
+            raise TypeError(f"{fName} takes {fArgsKey} keyword arguments but you provided {nArgsKey}")
+        
+        #* Parse arguments
+        #? Default args
+        argListDef: ListType[TupleType[str, type]] = []
+        for arg in node.args:
+            argListDef.append(Builder.buildFromNodeType(arg))
+        
+        # Check default argument types match
+        args: ListType[str] = []
+        for i in range(len(fType.args)):
+            if not Typer.isTypeCompatible(argListDef[i][1], fType.args[i]):
+                raise TypeError(f"type {argListDef[i][1]} can not be applied to argument of type {fType.args[i]}")
+        
+        for arg in argListDef:
+            args.append(arg[0])
+        
+        #? Keyword args
+        def getKeywordName(argument: str) -> str:
+            return argument.split(" ")[0][2:]
+        
+        #TupleType[kwName, kwCode, kwType]
+        argListKey: ListType[TupleType[str, str, type]] = []
+        for arg in node.keywords:
+            value, vType = Builder.buildFromNodeType(arg)
+            argListKey.append((getKeywordName(value), value, vType))
+        
+        # Check keyword argument types match
+        for i in argListKey:
+            if i[0] not in fType.kwArgs:
+                raise TypeError(f"'{i[0]}' is an invalid keyword argument for {fName}")
+            if not Typer.isTypeCompatible(i[2], fType.kwArgs[i[0]]):
+                raise TypeError(f"type {i[2]} can not be applied to argument of type {fType.kwArgs[i[0]]}")
+            args.append(i[1])
+        
+        if not args:
+            return f"({fName})", fType.ret
+            
+        return f"({fName} {' '.join(args)})", fType.ret
+    
+    @staticmethod
+    def print(node: Call) -> TupleType[str, type]:
+        Builder.setBuildFlag('PRINT')
+        func = Name(id="PRINT", ctx=Load())
+        copyLocation(node.func, func)
+        return CallResolver.normal(CallResolver.withCall(node, func=func))
+    
+    @staticmethod
+    def range(node: Call) -> TupleType[str, type]:
+        #? This func is set to accept varArgs for easier build in typing -> Check args
+        if not 0 < len(node.args) < 4:
+            raise TypeError(f"builtin range takes 1 to 3 arguments, {len(node.args)} provided")
+        elif any([not Typer.isTypeCompatible(Typer.deduceTypeFromNode(x), int) for x in node.args]):
+            raise TypeError(f"builtin range takes 1 to 3 integers")
+        return CallResolver.normal(node)
+
+    @staticmethod
+    def input(node: Call) -> TupleType[str, type]:
+        Builder.setBuildFlag('INPUT')
+        
+        if not len(node.args) < 2:
+            raise TypeError(f"builtin input takes 0 to 1 arguments, {len(node.args)} provided")
+        elif any([not Typer.isTypeCompatible(Typer.deduceTypeFromNode(x), str) for x in node.args]):
+            raise TypeError(f"builtin input takes 0 to 1 strings")
+        
+        if not node.args:
+            default = Constant(value="", kind=None)
+            copyLocation(node, default)
+            node = CallResolver.withCall(node, args=[default])
+        
+        return CallResolver.normal(node)
+
+    @staticmethod
+    def len(node: Call) -> TupleType[str, type]:
+        if not (lArgs := len(node.args)) == 1:
+            raise TypeError(f"builtin len takes 1 argument, {lArgs} provided")
+        
+        value, vType = Builder.buildFromNodeType(node.args[0])
+        
+        if isinstance(vType, Typer.T):
+            vType = type(vType)
+        
+        return LEN_SWITCHER.get(vType, LenResolver.error)(value, vType), int
+        
+    #* ATTRIBUTES
+    
+    @staticmethod
+    def attributeError(node: Call, name: str, nType: type, attr: str):
+        raise TypeError(f"object of type {nType} does not have any attribute functions")
+    
+    @staticmethod
+    def fetchInfoFromAttribute(node: Attribute) -> TupleType[str, type, str]:
+        """Get basic info from Attribute
+
+        Arguments:
+            node {Attribute} -- Attribute to analyze
+
+        Returns:
+            TupleType[str, type, str] -- VariableName, VariableType, AttributeCallName
+        """
+        if not isinstance(node.value, Name):
+            raise TypeError(f"node of type {type(node.value)} may not use attributes")
+        
+        name, nType = Builder.buildFromNodeType(node.value)
+        return name, nType, node.attr
+
+    @staticmethod
+    def TList(node: Call, name: str, nType: Typer.TList, attr: str) -> TupleType[str, type]:
+        return LIST_ATTRIBUTES.get(attr, ListAttributeResolver.error)(node, name, nType)
+    
+    @staticmethod
+    def TModule(node: Call, name: str, nType: Typer.TModule, attr: str) -> TupleType[str, type]:
+        func = Name(id=CallResolver.moduleMember(name, nType, attr), ctx=Load())
+        copyLocation(node.func, func)
+        return CallResolver.normal(CallResolver.withCall(node, func=func))
+    
+    @staticmethod
+    def moduleMember(name: str, nType: Typer.TModule, attr: str) -> str:
+        """Get the root key of a member of an imported module (see `_Builder.Import`)
+
+        Arguments:
+            name  {str}           -- Name the module is bound to
+            nType {Typer.TModule} -- Type of module
+            attr  {str}           -- Name of member
+
+        Raises:
+            AttributeError -- The module does not export the member
+
+        Returns:
+            str -- Prefixed name of member
+        """
+        member = f"{name}.{attr}"
+        if not TranspilerSession.current().symbols.contains(member):
+            raise AttributeError(f"module '{nType.name}' has no attribute '{attr}'")
+        
+        return member
+    
+    #* TYPE-CONVERTERS
+    
+    # 'int'   : Typer.TFunction([Typer.TUnion([int, float, str, bool])],       kwArgs=[], vararg=False, ret=int),
+    # 'float' : Typer.TFunction([Typer.TUnion([float, int, str, bool])],         kwArgs=[], vararg=False, ret=float),
+    # 'str'   : Typer.TFunction([Typer.TUnion([str, int, float, bool])], kwArgs=[], vararg=False, ret=str),
+    # 'bool'  : Typer.TFunction([Typer.TUnion([bool, int, float, str])],  kwArgs=[], vararg=False, ret=bool)
+    
+    @staticmethod
+    def int(node: Call) -> TupleType[str, type]:
+        Builder.setBuildFlag('TO_INT')
+        accepted = [int, float, str, bool]
+        if not (lArgs := len(node.args)) == 1:
+            raise TypeError(f"builtin typeConverter int takes 1 arguments, {lArgs} provided")
+        
+        argV, argT = Builder.buildFromNodeType(node.args[0])
+        if argT not in accepted:
+            if isinstance(argT, Typer.TAny):
+                warn("TypeWarning", "Can not assure type correctness for Any", node.args[0])
+            else:
+                raise TypeError(f"builtin typeConverter int takes {accepted}, {argT} provided")
+        
+        return f"(int {argV})", int
+
+    @staticmethod
+    def float(node: Call) -> TupleType[str, type]:
+        Builder.setBuildFlag('TO_FLOAT')
+        accepted = [float, int, str, bool]
+        if not (lArgs := len(node.args)) == 1:
+            raise TypeError(f"builtin typeConverter float takes 1 arguments, {lArgs} provided")
+        
+        argV, argT = Builder.buildFromNodeType(node.args[0])
+        if argT not in accepted:
+            if isinstance(argT, Typer.TAny):
+                warn("TypeWarning", "Can not assure type correctness for Any", node.args[0])
+            else:
+                raise TypeError(f"builtin typeConverter float takes {accepted}, {argT} provided")
+        
+        return f"(float {argV})", float
+    
+    @staticmethod
+    def str(node: Call) -> TupleType[str, type]:
+        Builder.setBuildFlag('TO_STR')
+        accepted = [str, int, float, bool]
+        if not (lArgs := len(node.args)) == 1:
+            raise TypeError(f"builtin typeConverter str takes 1 arguments, {lArgs} provided")
+        
+        argV, argT = Builder.buildFromNodeType(node.args[0])
+        if argT not in accepted:
+            if isinstance(argT, Typer.TAny):
+                warn("TypeWarning", "Can not assure type correctness for Any", node.args[0])
+            else:
+                raise TypeError(f"builtin typeConverter str takes {accepted}, {argT} provided")
+        
+        return f"(str {argV})", str
+    
+    @staticmethod
+    def bool(node: Call) -> TupleType[str, type]:
+        Builder.setBuildFlag('TO_BOOL')
+        accepted = [bool, int, float, str]
+        if not (lArgs := len(node.args)) == 1:
+            raise TypeError(f"builtin typeConverter bool takes 1 arguments, {lArgs} provided")
+        
+        argV, argT = Builder.buildFromNodeType(node.args[0])
+        if argT not in accepted:
+            if isinstance(argT, Typer.TAny):
+                warn("TypeWarning", "Can not assure type correctness for Any", node.args[0])
+            else:
+                raise TypeError(f"builtin typeConverter bool takes {accepted}, {argT} provided")
+        
+        return f"(bool {argV})", bool
+
+
+class ListAttributeResolver():
+    @staticmethod
+    def error(node: Call, name: str, nType: Typer.TList):
+        raise AttributeError(f"no such attribute function on type list")
+    
+    @staticmethod
+    def append(node: Call, name: str, nType: Typer.TList) -> TupleType[str, type]:
+        if not (args := len(node.args)) == 1:
+            raise ValueError(f"append on list takes 1 type-compatible argument, {args} provided")
+        
+        value, vType = Builder.buildFromNodeType(node.args[0])
+        if not Typer.isTypeCompatible(vType, nType.contained):
+            raise TypeError(f"element of type {vType} can not be appended to list containing type {nType.contained}")
+        
+        return f"(gvector-add! {name} {value})", Typer.Null()
+    
+    @staticmethod
+    def pop(node: Call, name: str, nType: Typer.TList) -> TupleType[str, type]:
+        if not (args := len(node.args)) == 1:
+            raise ValueError(f"pop on list takes 1 positional argument, {args} provided")
+        
+        try:
+            index, indexT = Builder.buildFromNodeType(node.args[0])
+            
+            if indexT is int and isinstance(index, int):
+                if index < 0:
+                    index = f"(- (gvector-count {name}) {-index})"
+            elif indexT is int and isinstance(index, str):
+                index = f"(if (< {index} 0) (- (gvector-count {name}) (- {index})) {index})"
+            else:
+                raise ValueError()
+            
+        except ValueError:
+            raise TypeError(f"instance of type {type(index)} can not be used to index into a list")
+        
+        return f"(gvector-pop! {name} {index})", nType.contained
+    
+    @staticmethod
+    def insert(node: Call, name: str, nType: Typer.TList) -> TupleType[str, type]:
+        if not (args := len(node.args)) == 2:
+            raise ValueError(f"insert on list takes 2 positional arguments, {args} provided")
+        
+        try:
+            index, indexT = Builder.buildFromNodeType(node.args[0])
+            
+            if indexT is int and isinstance(index, int):
+                if index < 0:
+                    index = f"(- (gvector-count {name}) {-index})"
+            elif indexT is int and isinstance(index, str):
+                index = f"(if (< {index} 0) (- (gvector-count {name}) (- {index})) {index})"
+            else:
+                raise ValueError()
+            
+        except ValueError:
+            raise TypeError(f"instance of type {type(index)} can not be used to index into a list")
+        
+        
+        value, vType = Builder.buildFromNodeType(node.args[1])
+        if not Typer.isTypeCompatible(vType, nType.contained):
+            raise TypeError(f"element of type {vType} can not be inserted into a list containing type {nType.contained}")
+        
+        return f"(gvector-insert! {name} {index} {value})", Typer.Null()
+    
+    # def count(node: Call, name: str, nType: Typer.TList) -> TupleType[str, type]:
+    #     if not (args := len(node.args)) == 0:
+    #         raise ValueError(f"count on list takes no positional argument, {args} provided")
+        
+    #     return f"(gvector-count {name})", int
+
+
+class LenResolver():
+    @staticmethod
+    def error(value: str, vType: type) -> str:
+        raise TypeError(f"object of type '{vType}' has no len()")
+    
+    @staticmethod
+    def str(value: str, vType: type) -> str:
+        return f"(string-length {value})"
+    
+    @staticmethod
+    def TList(value: str, vType: type) -> str:
+        return f"(gvector-count {value})"
+
+    @staticmethod
+    def TTuple(value: str, vType: type) -> str:
+        return f"(vector-length {value})"
+
+
+class SubscriptResolver():
+    @staticmethod
+    def error(node: Subscript, name: str, nType: type):
+        raise TypeError(f"value of type {nType} can not be subscripted")
+    
+    @staticmethod
+    def TList(node: Subscript, name: str, nType: type) -> TupleType[str, type]:
+        slice = node.slice
+        if isinstance(slice, Index):
+            try:
+                index, indexT = Builder.buildFromNodeType(slice)
+                
+                if indexT is int and (isinstance(index, int) or index.isnumeric()):
+                    index = int(index)
+                    if index < 0:
+                        index = f"(- (gvector-count {name}) {-index})"
+                elif indexT is int and isinstance(index, str):
+                    index = f"(if (< {index} 0) (- (gvector-count {name}) (- {index})) {index})"
+                else:
+                    raise ValueError()
+                
+            except ValueError:
+                raise TypeError(f"instance of type {type(index)} can not be used to index into a list")
+            
+            return f"(gvector-access {name} {index})", nType.contained
+        elif isinstance(slice, Slice):
+            raise NotImplementedError("Advanced slicing is not yet implemented for lists")
+        else:
+            raise TypeError(f"type {type(slice)} can not be used to slice a list")
+    
+    @staticmethod
+    def TTuple(node: Subscript, name: str, nType: type) -> TupleType[str, type]:
+        slice = node.slice
+        retType = None
+        if isinstance(slice, Index):
+            try:
+                index, indexT = Builder.buildFromNodeType(slice)
+                
+                if indexT is int and (isinstance(index, int) or index.isnumeric()):
+                    index = int(index)
+                    if abs(index) >= (tupleLen := len(nType.contained)):
+                        throw(ValueError(f"Index '{index}' is out of range for tuple of length {tupleLen}"), node)
+                    
+                    if index < 0:
+                        index = f"(- (vector-length {name}) {-index})"
+                    retType = nType.contained[abs(index)]
+                elif indexT is int:
+                    index = f"(if (< {index} 0) (- (vector-length {name}) (- {index})) {index})"
+                else:
+                    raise ValueError()
+                
+            except ValueError:
+                raise TypeError(f"instance of type {type(index)} can not be used to index into a tuple")
+            
+            return f"(vector-ref {name} {index})", retType
+        elif isinstance(slice, Slice):
+            raise NotImplementedError("Advanced slicing is not yet implemented for tuples")
+        else:
+            raise TypeError(f"type {type(slice)} can not be used to slice a tuple")
+
+
+class AssignSubscriptResolver():
+    @staticmethod
+    def error(node: Subscript, name: str, nType: type, value: str, vType: type):
+        raise TypeError(f"value of type {nType} can not be subscripted")
+    
+    @staticmethod
+    def TList(node: Subscript, name: str, nType: type, value: str, vType: type) -> str:
+        slice = node.slice
+        if isinstance(slice, Index):
+            index = Builder.buildFromNode(slice)
+            try:
+                index, indexT = Builder.buildFromNodeType(slice)
+                
+                if indexT is int and isinstance(index, int):
+                    if index < 0:
+                        index = f"(- (gvector-count {name}) {-index})"
+                elif indexT is int and isinstance(index, str):
+                    index = f"(if (< {index} 0) (- (gvector-count {name}) (- {index})) {index})"
+                else:
+                    raise ValueError()
+        
+            except ValueError:
+                raise TypeError(f"instance of type {type(index)} can not be used to index into a list")
+            
+            if not Typer.isTypeCompatible(vType, nType.contained):
+                raise TypeError(f"element of type {vType} can not be appended to list containing type {nType.contained}")
+            
+            return f"(safe-gvector-set! {name} {index} {value})"
+        elif isinstance(slice, Slice):
+            raise NotImplementedError("Advanced slicing is not yet implemented for lists")
+        else:
+            raise TypeError(f"type {type(slice)} can not be used to slice a list")
+
+
+class LiteralSubscriptResolver():
+    @staticmethod
+    def error(node: Subscript) -> type:
+        raise TypeError(f"subscript-type {node.value.id} is not supported")
+    
+    @staticmethod
+    def normal(node: Subscript) -> type:
+        if Builder.inState(node.value.id):
+            if isinstance((listT := Builder.getStateKey(node.value.id)), Typer.TList):
+                return listT.contained
+            
+        return LiteralSubscriptResolver.error(node)
+    
+    @staticmethod
+    def List(node: Subscript) -> type:
+        return Typer.TList(_Typer._literalAnnotation(node.slice.value))
+    
+    @staticmethod
+    def Tuple(node: Subscript) -> type:
+        return Typer.TTuple(_Typer._literalAnnotation(node.slice.value))
+
+
 class IfLiteralResolver():
     @staticmethod
     def error(value: str):
@@ -2087,20 +2589,66 @@ class IfLiteralResolver():
     
     @staticmethod
     def resolve(value: str, vType: type) -> TupleType[str, type]:
-        switcher: Dict[type, Callable] = {
-            bool            : IfLiteralResolver.bool,
-            int             : IfLiteralResolver.int,
-            float           : IfLiteralResolver.float,
-            str             : IfLiteralResolver.str,
-            None            : IfLiteralResolver.NoneType,
-            Typer.TList     : IfLiteralResolver.TList,
-            Typer.TFunction : IfLiteralResolver.TFunction,
-            Typer.TTuple    : IfLiteralResolver.TTuple,
-        }
-        
-        Builder.buildFromNode(NotEq()) #? Let _Builder.NotEq handle buildFlags to not spread functionality even more
+        #? All tests are compiled to '!=', see `_Builder.NotEq`
+        Builder.setBuildFlag('NOT_EQUAL')
         
         if isinstance(vType, Typer.T):
-            return switcher.get(type(vType), IfLiteralResolver.error)(value)
-        
-        return switcher.get(vType, IfLiteralResolver.error)(value)
+            return IF_LITERAL_SWITCHER.get(type(vType), IfLiteralResolver.error)(value)
+        
+        return IF_LITERAL_SWITCHER.get(vType, IfLiteralResolver.error)(value)
+
+
+#* Dispatch tables of the resolvers, built once after all types are defined
+CALL_SPECIALS: Dict[str, Callable[[Call], TupleType[str, type]]] = {
+    'print' : CallResolver.print,
+    'range' : CallResolver.range,
+    'input' : CallResolver.input,
+    'len'   : CallResolver.len,
+    'int'   : CallResolver.int,
+    'float' : CallResolver.float,
+    'str'   : CallResolver.str,
+    'bool'  : CallResolver.bool,
+}
+
+CALL_ATTRIBUTES: Dict[type, Callable[[Call, str, type, str], TupleType[str, type]]] = {
+    Typer.TList   : CallResolver.TList,
+    Typer.TModule : CallResolver.TModule,
+}
+
+LIST_ATTRIBUTES: Dict[str, Callable[[Call, str, Typer.TList], TupleType[str, type]]] = {
+    'append' : ListAttributeResolver.append,
+    'pop'    : ListAttributeResolver.pop,
+    'insert' : ListAttributeResolver.insert,
+    # 'count'  : ListAttributeResolver.count
+}
+
+LEN_SWITCHER: Dict[type, Callable[[str, type], str]] = {
+    str          : LenResolver.str,
+    Typer.TList  : LenResolver.TList,
+    Typer.TTuple : LenResolver.TTuple,
+}
+
+SUBSCRIPT_TYPES: Dict[type, Callable[[Subscript, str, type], TupleType[str, type]]] = {
+    Typer.TList  : SubscriptResolver.TList,
+    Typer.TTuple : SubscriptResolver.TTuple,
+}
+
+ASSIGN_SUBSCRIPT_TYPES: Dict[type, Callable[[Subscript, str, type, str, type], str]] = {
+    Typer.TList : AssignSubscriptResolver.TList,
+}
+
+LITERAL_SUBSCRIPT_SPECIALS: Dict[str, Callable[[Subscript], type]] = {
+    'List'  : LiteralSubscriptResolver.List,
+    'Tuple' : LiteralSubscriptResolver.Tuple,
+}
+
+IF_LITERAL_SWITCHER: Dict[type, Callable[[str], TupleType[str, type]]] = {
+    bool            : IfLiteralResolver.bool,
+    int             : IfLiteralResolver.int,
+    float           : IfLiteralResolver.float,
+    str             : IfLiteralResolver.str,
+    None            : IfLiteralResolver.NoneType,
+    Typer.TList     : IfLiteralResolver.TList,
+    Typer.TFunction : IfLiteralResolver.TFunction,
+    Typer.TTuple    : IfLiteralResolver.TTuple,
+}
@@ -0,0 +1,174 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import Dict, List, Any, Optional, NamedTuple
+import hashlib
+import json
+import os
+import tempfile
+
+from . import __version__
+from .interface import ModuleInterface
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+ENTRY_SUFFIX = ".json"
+#? Incremental state of a file (see `IncrementalState.statePath`), counted towards the size cap like entries
+STATE_SUFFIX = ".pickle"
+
+class CacheEntry(NamedTuple):
+    code: str
+    warnings: List[str]
+    buildFlags: List[str]           # Build flags the code activated
+    diagnostics: List[List[Any]]    # Fields of every `Diagnostic` reported
+
+class TranspileCache():
+    def __init__(self, directory: str, maxBytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Content addressed on-disk cache of transpiled files.
+        Entries are keyed by `TranspileCache.key`, written atomically and evicted
+        least recently used first once the cache grows above `maxBytes`. The incremental
+        states kept in the same directory are part of the size cap and evicted the same way.
+
+        Arguments:
+            directory {str} -- Directory the cache entries are stored in
+            maxBytes  {int} -- Size cap of all entries and states together (default: DEFAULT_MAX_BYTES)
+        """
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        #? Lazily computed on the first write, see `TranspileCache._trackSize`
+        self._size: Optional[int] = None
+
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(source: str, config: Dict[str, Any], useMain: bool, modules: Optional[Dict[str, ModuleInterface]] = None) -> str:
+        """Compute the cache key of a transpilation
+
+        Arguments:
+            source  {str}                                 -- Python source code
+            config  {Dict[str, Any]}                      -- Session config the source is transpiled with
+            useMain {bool}                                -- Wrap all usercode in a main function
+            modules {Optional[Dict[str, ModuleInterface]]} -- Modules the source may import, only their exported surface
+                                                             is part of the key (default: None)
+
+        Returns:
+            str -- Hex digest identifying the transpilation result
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{__version__}\0{sorted(config.items())}\0{useMain}\0".encode())
+        if modules:
+            digest.update(f"{ModuleInterface.surface(modules)}\0".encode())
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Lookup an entry and mark it as recently used
+
+        Arguments:
+            key {str} -- Key of entry
+
+        Returns:
+            Optional[CacheEntry] -- Entry or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r') as file:
+                entry = CacheEntry(**json.load(file))
+            #? The modification time is used as the LRU clock
+            os.utime(path)
+        except (OSError, ValueError, TypeError):
+            #? Also entries of older versions missing fields, they are replaced once transpiled again
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, code: str, warnings: List[str], buildFlags: List[str], diagnostics: List[List[Any]]) -> None:
+        """Store an entry atomically and evict old entries if the size cap is exceeded
+
+        Arguments:
+            key         {str}             -- Key of entry
+            code        {str}             -- Transpiled racket source code
+            warnings    {List[str]}       -- Rendered warnings to replay on a hit
+            buildFlags  {List[str]}       -- Build flags to activate on a hit
+            diagnostics {List[List[Any]]} -- Diagnostics to replay on a hit
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        #? Write to a temporary file in the same directory and rename it, so readers
+        #? never observe partially written entries
+        fd, tmpPath = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as file:
+                json.dump(CacheEntry(code, warnings, buildFlags, diagnostics)._asdict(), file)
+            os.replace(tmpPath, path)
+        except BaseException:
+            os.unlink(tmpPath)
+            raise
+
+        self._trackSize(os.path.getsize(path))
+
+    def track(self, path: str, previousBytes: int = 0) -> None:
+        """Account for a file written to the cache directory besides the entries (e.g. an incremental state)
+        and evict old files if the size cap is exceeded
+
+        Arguments:
+            path          {str} -- Path of written file
+            previousBytes {int} -- Size of the file it replaced (default: 0)
+        """
+        self._trackSize(os.path.getsize(path) - previousBytes)
+
+    def _entries(self) -> List[os.DirEntry]:
+        entries = []
+        for bucket in os.scandir(self.directory):
+            if bucket.is_dir():
+                entries += [entry for entry in os.scandir(bucket.path) if entry.name.endswith((ENTRY_SUFFIX, STATE_SUFFIX))]
+
+        return entries
+
+    def _trackSize(self, added: int) -> None:
+        if self._size is None:
+            self._size = sum(entry.stat().st_size for entry in self._entries())
+        else:
+            self._size += added
+
+        if self._size > self.maxBytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries and states until the cache is below 90% of its size cap
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        size = sum(entry.stat().st_size for entry in entries)
+        target = self.maxBytes * 0.9
+
+        for entry in entries:
+            if size <= target:
+                break
+            try:
+                size -= entry.stat().st_size
+                os.unlink(entry.path)
+            except OSError:
+                #? Another process evicted it already
+                pass
+
+        self._size = size
@@ -0,0 +1,158 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from typing import Dict, Any, Optional
+import json
+import os
+import socket
+import stat
+import tempfile
+
+#! This module is imported by every client run and must not import the transpiler itself
+from . import __version__
+
+SOCKET_ENV = "PYSTRANSPILE_SOCKET"
+#? Time to wait for a server to accept a connection before transpiling in-process
+CONNECT_TIMEOUT = 1.0
+#? Sent with every request, servers answer requests of another protocol or package version with an error
+PROTOCOL_VERSION = 1
+
+def socketPath(path: Optional[str] = None) -> str:
+    """Resolve the path of the daemon socket
+
+    Arguments:
+        path {Optional[str]} -- Explicit path, takes precedence over the environment (default: None)
+
+    Returns:
+        str -- Path of the unix socket
+    """
+    if path:
+        return path
+    if (env := os.environ.get(SOCKET_ENV)):
+        return env
+
+    return os.path.join(socketDirectory(), "daemon.sock")
+
+def socketDirectory() -> str:
+    """Directory of the default daemon socket, only the current user can access it so
+    other users can not put a socket in its place (see `DaemonServer.serve`)
+
+    Returns:
+        str -- Path of the directory
+    """
+    return os.path.join(tempfile.gettempdir(), f"pystranspile-{os.getuid()}")
+
+def trusted(path: str, isSocket: bool = True) -> bool:
+    """Check that a socket (or the directory it is in) belongs to the current user and that no other
+    user can access it, requests contain file paths and responses are trusted to be transpiled code
+
+    Arguments:
+        path     {str}  -- Path of the socket or directory
+        isSocket {bool} -- Path is a socket, otherwise a directory (default: True)
+
+    Returns:
+        bool -- Path can be trusted
+    """
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+
+    kind = stat.S_ISSOCK if isSocket else stat.S_ISDIR
+    return kind(info.st_mode) and info.st_uid == os.getuid() and stat.S_IMODE(info.st_mode) & 0o077 == 0
+
+class DaemonClient():
+    @staticmethod
+    def available() -> bool:
+        return hasattr(socket, 'AF_UNIX')
+
+    @staticmethod
+    def request(message: Dict[str, Any], path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Send a request to a running daemon and wait for its response
+
+        Arguments:
+            message {Dict[str, Any]} -- Request (see `DaemonServer.dispatch`)
+            path    {Optional[str]}  -- Path of the unix socket (default: None)
+
+        Returns:
+            Optional[Dict[str, Any]] -- Response or None if no (trusted) daemon is running
+        """
+        if not DaemonClient.available():
+            return None
+
+        path = socketPath(path)
+        if not trusted(path):
+            #? Missing or created by (or accessible to) another user
+            return None
+
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.settimeout(CONNECT_TIMEOUT)
+            try:
+                connection.connect(path)
+            except (OSError, socket.timeout):
+                #? No (responsive) server, e.g. a stale socket file
+                return None
+
+            #? The server enforces the request timeout itself
+            connection.settimeout(None)
+            with connection.makefile('rwb') as stream:
+                request = {**message, 'protocol': PROTOCOL_VERSION, 'version': __version__}
+                stream.write(json.dumps(request).encode() + b"\n")
+                stream.flush()
+                response = stream.readline()
+        except OSError:
+            return None
+        finally:
+            connection.close()
+
+        if not response:
+            return None
+        return json.loads(response)
+
+    @staticmethod
+    def transpile(
+        inputPath: str,
+        outputPath: str,
+        useMain: bool,
+        config: Dict[str, Any],
+        cacheDir: Optional[str],
+        cacheBytes: int,
+        path: Optional[str] = None
+        ) -> Optional[Dict[str, Any]]:
+        """Transpile a single file in a running daemon
+
+        Arguments:
+            inputPath  {str}            -- Python source file
+            outputPath {str}            -- File to save the transpiled code in
+            useMain    {bool}           -- Wrap all usercode in a main function
+            config     {Dict[str, Any]} -- Session config overrides
+            cacheDir   {Optional[str]}  -- Directory of the transpile cache or None to disable it
+            cacheBytes {int}            -- Size cap of the transpile cache
+            path       {Optional[str]}  -- Path of the unix socket (default: None)
+
+        Returns:
+            Optional[Dict[str, Any]] -- Response or None if no daemon is running
+        """
+        #? The daemon does not share the working directory of the client
+        return DaemonClient.request({
+            'op'        : 'transpile',
+            'input'     : os.path.abspath(inputPath),
+            'output'    : os.path.abspath(outputPath),
+            'useMain'   : useMain,
+            'config'    : config,
+            'cacheDir'  : os.path.abspath(cacheDir) if cacheDir else None,
+            'cacheBytes': cacheBytes
+            }, path)
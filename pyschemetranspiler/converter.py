@@ -13,41 +13,302 @@
 
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
-from typing import TextIO, Dict, Set
+from typing import TextIO, Dict, Set, Optional, Union, Iterator
+from ast import Module
 
+from . import __version__
 from .parser import Parser
 from .builder import Builder
-from .shared import Shared
-from .extraCodes import extraC, FlagRequirements, Arts
+from .session import TranspilerSession
+from .cache import TranspileCache
+from .incremental import IncrementalState
+from .parallel import ParallelBuilder
+from .interface import ModuleInterface
+from .emitter import Emitter, SpooledEmitter
+from .exceptions import ConversionAbort, Diagnostic
+from .source import SourceIndex
+from .extraCodes import extraC, FlagRequirements, RuntimeExports, Arts
 from .coloring import Colors, colorT
 
 class Converter():
     @staticmethod
-    def transpile(file: TextIO, useMain: bool = True) -> str:
-        #* Basic setup
-        Shared.currentFile = file.name
+    def transpile(
+        file: TextIO,
+        useMain: bool = True,
+        session: Optional[TranspilerSession] = None,
+        cache: Optional[TranspileCache] = None,
+        incremental: Optional[IncrementalState] = None
+        ) -> str:
+        """Transpile a python source file to racket source code
+        (see `Converter.emit` for arguments)
+
+        Returns:
+            str -- Transpiled racket source code
+        """
+        emitter = Converter.emit(file, useMain, session, cache, incremental)
+        try:
+            return emitter.getvalue()
+        finally:
+            #? Releases the temporary file of large outputs (see `SpooledEmitter`)
+            emitter.close()
+    
+    @staticmethod
+    def emit(
+        file: TextIO,
+        useMain: bool = True,
+        session: Optional[TranspilerSession] = None,
+        cache: Optional[TranspileCache] = None,
+        incremental: Optional[IncrementalState] = None,
+        chunked: bool = False,
+        parallel: bool = False,
+        jobs: Optional[int] = None
+        ) -> Emitter:
+        """Transpile a python source file to racket source code fragments
+
+        Arguments:
+            file        {TextIO}                      -- Opened python source file
+            useMain     {bool}                        -- Wrap all usercode in a main function (default: True)
+            session     {Optional[TranspilerSession]} -- Session to transpile in, a fresh one is created if omitted (default: None)
+            cache       {Optional[TranspileCache]}    -- Cache to lookup and store the result in (default: None)
+            incremental {Optional[IncrementalState]}  -- Results of the previous run to reuse unchanged statements from (default: None)
+            chunked     {bool}                        -- Read, parse and build the file one top-level statement at a time and spool the
+                                                         code to a temporary file, for huge sources (default: False)
+            parallel    {bool}                        -- Build the top-level functions in a pool of worker processes, `incremental`
+                                                         is not used (see `ParallelBuilder.codes`) (default: False)
+            jobs        {Optional[int]}               -- Amount of worker processes for `parallel`, defaults to the cpu count (default: None)
+
+        Returns:
+            Emitter -- Transpiled racket source code
+        """
+        if session is None:
+            session = TranspilerSession(file.name)
+        else:
+            session.currentFile = file.name
+        
+        if chunked:
+            #? The source is never read at once, so it can neither be cached nor compared with the previous run
+            with session.activate():
+                return Converter._assemble(Converter._chunkedCodes(file), SpooledEmitter(), useMain)
+        
+        source = file.read()
+        session.source = SourceIndex(source)
+        
+        if cache is not None:
+            key = TranspileCache.key(source, session.config, useMain, session.modules)
+            if (entry := cache.get(key)) is not None:
+                #? Replay the reports and build flags of the original transpilation
+                session.warnings = entry.warnings
+                session.diagnostics = [Diagnostic(*diagnostic) for diagnostic in entry.diagnostics]
+                for flag in entry.buildFlags:
+                    session.buildFlags[flag] = True
+                if not session.quiet:
+                    for warning in entry.warnings:
+                        print(warning)
+                
+                emitter = Emitter()
+                emitter.emit(entry.code)
+                return emitter
+        
+        with session.activate():
+            #? Output is spooled like the chunked one, only the AST and the scopes stay in memory until the end
+            emitter = Converter._transpile(source, useMain, incremental, jobs if parallel else 0, SpooledEmitter())
+        
+        if cache is not None:
+            buildFlags = [flag for flag, active in session.buildFlags.items() if active]
+            cache.put(key, emitter.getvalue(), session.warnings, buildFlags, [list(diagnostic) for diagnostic in session.diagnostics])
+        
+        return emitter
+    
+    @staticmethod
+    def stream(
+        file: TextIO,
+        sink: TextIO,
+        useMain: bool = True,
+        session: Optional[TranspilerSession] = None,
+        cache: Optional[TranspileCache] = None,
+        incremental: Optional[IncrementalState] = None,
+        chunked: bool = False,
+        parallel: bool = False,
+        jobs: Optional[int] = None
+        ) -> None:
+        """Transpile a python source file and write every top-level form to `sink` as soon as it is built.
+        The required helper functions are only known at the end, so they are written after the main function
+        (racket resolves module level definitions before `(main)` is called). Exportable code runs its top-level
+        forms immediately and is therefore written at once like a cached result.
+
+        Arguments:
+            file        {TextIO}                      -- Opened python source file
+            sink        {TextIO}                      -- Stream the racket source code is written to
+            useMain     {bool}                        -- Wrap all usercode in a main function (default: True)
+            session     {Optional[TranspilerSession]} -- Session to transpile in, a fresh one is created if omitted (default: None)
+            cache       {Optional[TranspileCache]}    -- Cache to lookup and store the result in (default: None)
+            incremental {Optional[IncrementalState]}  -- Results of the previous run to reuse unchanged statements from (default: None)
+            chunked     {bool}                        -- Read, parse and build the file one top-level statement at a time (default: False)
+            parallel    {bool}                        -- Build the top-level functions in a pool of worker processes (default: False)
+            jobs        {Optional[int]}               -- Amount of worker processes for `parallel`, defaults to the cpu count (default: None)
+        """
+        if not useMain or cache is not None:
+            emitter = Converter.emit(file, useMain, session, cache, incremental, chunked, parallel, jobs)
+            try:
+                emitter.writeTo(sink)
+            finally:
+                emitter.close()
+            sink.flush()
+            return
         
-        #* Pase file to tokens
-        toks = Parser.parseFile(file).body
+        if session is None:
+            session = TranspilerSession(file.name)
+        else:
+            session.currentFile = file.name
         
+        if not chunked:
+            source = file.read()
+            session.source = SourceIndex(source)
+        
+        with session.activate():
+            codes = Converter._chunkedCodes(file) if chunked else Converter._codes(source, useMain, incremental, jobs if parallel else 0)
+            sink.write("#lang racket\n\n(define (main)\n\n")
+            for code in codes:
+                if code:
+                    sink.write(code)
+                    sink.write("\n")
+                    sink.flush()
+            
+            Converter._checkErrors()
+            prelude = Converter.requires() + Converter.prelude(Converter.compileBuildFlags(session.buildFlags), session.moduleName, session.config['RUNTIME'])
+            sink.write(f"\n(void))\n\n{prelude}(main)")
+            sink.flush()
+    
+    @staticmethod
+    def _codes(
+        source: Union[str, Module],
+        useMain: bool,
+        incremental: Optional[IncrementalState] = None,
+        jobs: Optional[int] = 0
+        ) -> Iterator[str]:
+        """Build all top-level statements in the active session one by one, `jobs` other than 0
+        builds the top-level functions in a pool of worker processes `DO NOT USE EXTERNALLY`
+        """
         Builder.initState()
         
-        compilerCode = "#lang racket\n"
-        userCode = ""
+        if jobs != 0 and isinstance(source, str):
+            return ParallelBuilder.codes(source, jobs)
         
         #* Transpile tokens to scheme sourcecode one by one
-        for i in toks:
-            code = Builder.buildFromNode(i)
-            if code:
-                userCode += code + "\n"
+        if incremental is None:
+            #* Pase file to tokens
+            toks = (source if isinstance(source, Module) else Parser.parseShared(source)).body
+            return (Builder.buildStatement(i) for i in toks)
+        
+        #? Only changed statements are parsed and built
+        session = Builder.session()
+        signature = (tuple(sorted(session.config.items())), useMain, ModuleInterface.surface(session.modules))
+        return incremental.build(source, signature)
+    
+    @staticmethod
+    def _chunkedCodes(file: TextIO) -> Iterator[str]:
+        """Build all top-level statements of a file in the active session, reading and parsing
+        it one chunk at a time (see `Parser.chunks`) `DO NOT USE EXTERNALLY`
+        """
+        Builder.initState()
+        session = Builder.session()
+        
+        for lineno, text, nodes in Parser.chunks(file):
+            #? Diagnostics only ever point into the chunk being built
+            session.source = SourceIndex(text, lineno)
+            for node in nodes:
+                yield Builder.buildStatement(node)
+    
+    @staticmethod
+    def _checkErrors() -> None:
+        if (errors := len(Builder.session().errors)) > 0:
+            if not Builder.session().quiet:
+                print(colorT(f"Transpilation failed with {errors} error{'s' if errors > 1 else ''}", Colors.RED))
+            raise ConversionAbort()
+    
+    @staticmethod
+    def _transpile(
+        source: Union[str, Module],
+        useMain: bool,
+        incremental: Optional[IncrementalState] = None,
+        jobs: Optional[int] = 0,
+        emitter: Optional[Emitter] = None
+        ) -> Emitter:
+        """Transpile python source code (or its parsed module) in the active session, into `emitter`
+        or a fresh in-memory `Emitter` `DO NOT USE EXTERNALLY`
+        """
+        return Converter._assemble(Converter._codes(source, useMain, incremental, jobs), emitter if emitter is not None else Emitter(), useMain)
+    
+    @staticmethod
+    def _assemble(codes: Iterator[str], emitter: Emitter, useMain: bool) -> Emitter:
+        """Emit built top-level statements and put the prelude required by them in front `DO NOT USE EXTERNALLY`
+        """
+        try:
+            for code in codes:
+                if code:
+                    emitter.emit(code)
+                    emitter.emit("\n")
+            
+            Converter._checkErrors()
+        except BaseException:
+            #? The emitter of a failed transpilation is never returned to be closed
+            emitter.close()
+            raise
+        session = Builder.session()
         
         #* Edit code according to build flags    
-        buildFlags = Converter.compileBuildFlags(Builder.buildFlags)
+        compilerCode = "#lang racket\n" + Converter.requires() + Converter.prelude(Converter.compileBuildFlags(session.buildFlags), session.moduleName, session.config['RUNTIME'])
+        
+        if useMain:
+            emitter.prepend(f"{compilerCode}\n(define (main)\n\n")
+            emitter.emit("\n(void))\n(main)")
+        else:
+            emitter.prepend(f"{compilerCode}\n")
+            emitter.rstrip()
+        
+        if session.moduleName is not None:
+            #? Top-level definitions are only visible to importing modules in exportable code
+            session.exports = Builder.exports()
+            if session.exports:
+                emitter.emit(f"\n(provide {' '.join(session.exports)})")
         
+        return emitter
+    
+    @staticmethod
+    def requires() -> str:
+        """Collect the racket modules required by the imports of the active session
+
+        Returns:
+            str -- Require forms, one per line
+        """
+        return "".join(f"{require}\n" for require in Builder.session().requires)
+    
+    @staticmethod
+    def prelude(buildFlags: Set[str], moduleName: Optional[str] = None, runtime: Optional[str] = None) -> str:
+        """Collect the helper definitions required by the build flags
+
+        Arguments:
+            buildFlags {Set[str]}      -- Resolved build flags (see `Converter.compileBuildFlags`)
+            moduleName {Optional[str]} -- Value of `__name__` if the file is built to be imported (default: None)
+            runtime    {Optional[str]} -- Path of the shared runtime module to require the helpers from
+                                          instead of defining them (default: None)
+
+        Returns:
+            str -- Racket definitions, one per line
+        """
+        compilerCode = ""
         if 'NAME_IS_MAIN' in buildFlags:
-            compilerCode += f"{extraC.NAME_IS_MAIN}\n"
+            compilerCode += f"{extraC.NAME_IS_MAIN if moduleName is None else extraC.NAME.format(moduleName)}\n"
         if 'GROWABLE_VECTOR_REQUIRE' in buildFlags:
             compilerCode += f"{extraC.GROWABLE_VECTOR_REQUIRE}\n"
+        
+        if runtime is not None:
+            #? Only the names the file uses, so they can not collide with its own definitions
+            names = [name for flag, flagNames in RuntimeExports.names.items() if flag in buildFlags for name in flagNames]
+            if names:
+                compilerCode += f'(require (only-in "{runtime}" {" ".join(names)}))\n'
+            return compilerCode
+        
         if 'GROWABLE_VECTOR' in buildFlags:
             compilerCode += f"{extraC.GROWABLE_VECTOR}\n"
         if 'DEEPCOPY' in buildFlags:
@@ -73,11 +334,7 @@ class Converter():
         if 'TO_LIST' in buildFlags:
             compilerCode += f"{extraC.TO_LIST}\n"
         
-        if compilerCode == "":
-            return userCode.strip()
-        
-        
-        return f"{compilerCode}\n(define (main)\n\n{userCode}\n(void))\n(main)".strip() if useMain else f"{compilerCode}\n{userCode}".strip()
+        return compilerCode
     
     @staticmethod
     def compileBuildFlags(flags: Dict[str, bool]) -> Set[str]:
@@ -102,7 +359,7 @@ class Converter():
         """Welcome the user with a nice greeting
         """
         Converter.displayArt()
-        print(colorT("PySchemeTranspiler v1.3, Copyright (C) 2021 Rubin Raithel", Colors.GREEN))
+        print(colorT(f"PySchemeTranspiler v{__version__}, Copyright (C) 2021 Rubin Raithel", Colors.GREEN))
         print(colorT("This program comes with ABSOLUTELY NO WARRANTY. For details see the 'LICENSE' file.\n\n", Colors.GREEN))
     
     @staticmethod
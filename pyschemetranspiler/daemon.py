@@ -0,0 +1,341 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import Deque, Dict, List, Any, Callable, Optional, Tuple
+from collections import deque
+from multiprocessing.pool import Pool
+import itertools
+import asyncio
+import json
+import os
+import signal
+import time
+
+from . import __version__, batch
+from .batch import BatchJob, BatchResult, _initWorker, _transpileJob
+from .cache import TranspileCache, DEFAULT_MAX_BYTES
+from .client import DaemonClient, PROTOCOL_VERSION, socketPath, socketDirectory, trusted
+from .coloring import Colors, colorT
+
+DEFAULT_TIMEOUT = 30.0
+#? Amount of most recent requests the latency percentiles are computed over
+LATENCY_WINDOW = 1000
+
+#? Caches of the current pool worker, see `_serveJob`
+_workerCaches: Dict[Tuple[str, int], TranspileCache] = {}
+
+def _serveJob(job: BatchJob, useMain: bool, config: Optional[Dict[str, Any]], cacheDir: Optional[str], cacheBytes: int) -> BatchResult:
+    """Transpile a single file inside of a daemon worker, caches stay open between requests
+
+    Arguments:
+        job        {BatchJob}                 -- File to transpile
+        useMain    {bool}                     -- Wrap all usercode in a main function
+        config     {Optional[Dict[str, Any]]} -- Session config overrides
+        cacheDir   {Optional[str]}            -- Directory of the transpile cache or None to disable it
+        cacheBytes {int}                      -- Size cap of the transpile cache
+
+    Returns:
+        BatchResult -- Outcome of the transpilation including all diagnostics printed
+    """
+    if cacheDir is None:
+        batch._workerCache = None
+    else:
+        if (key := (cacheDir, cacheBytes)) not in _workerCaches:
+            _workerCaches[key] = TranspileCache(cacheDir, cacheBytes)
+        batch._workerCache = _workerCaches[key]
+
+    return _transpileJob(job, useMain, config)
+
+def _initDaemonWorker() -> None:
+    """Prepare a daemon worker, it is forked from the server and inherits its signal handlers
+    """
+    #? Stopped by the server on a timeout, shutting down is up to the server
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _initWorker(None, 0)
+
+class DaemonWorker():
+    def __init__(self) -> None:
+        """Single worker process of a daemon, it is killed and replaced if a request takes too long
+        """
+        self.pool = DaemonWorker._start()
+
+    @staticmethod
+    def _start() -> Pool:
+        return Pool(1, initializer=_initDaemonWorker)
+
+    def run(self, function: Callable[..., Any], *args: Any) -> asyncio.Future:
+        """Call a function in the worker process
+
+        Arguments:
+            function {Callable[..., Any]} -- Picklable function to call
+            *args    {Any}                -- Arguments of function
+
+        Returns:
+            asyncio.Future -- Result of the call
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def settle(result: Any, failed: bool) -> None:
+            #? The request may have timed out in between
+            if future.done():
+                return
+            if failed:
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+        self.pool.apply_async(
+            function,
+            args,
+            callback=lambda result: loop.call_soon_threadsafe(settle, result, False),
+            error_callback=lambda error: loop.call_soon_threadsafe(settle, error, True)
+            )
+        return future
+
+    def restart(self) -> None:
+        """Kill the worker process (and the job it is running) and start a new one
+        """
+        self.pool.terminate()
+        self.pool = DaemonWorker._start()
+
+    def close(self) -> None:
+        self.pool.close()
+        self.pool.join()
+
+class DaemonStats():
+    def __init__(self) -> None:
+        """Request counters and latencies of a running daemon
+        """
+        self.started = time.time()
+        self.requests = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.cacheHits = 0
+        self.cacheMisses = 0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, seconds: float, result: Optional[BatchResult], timedOut: bool = False) -> None:
+        """Record a finished request
+
+        Arguments:
+            seconds  {float}                 -- Latency of the request
+            result   {Optional[BatchResult]} -- Outcome or None if the request did not finish
+            timedOut {bool}                  -- The request did not finish in time (default: False)
+        """
+        self.requests += 1
+        self.latencies.append(seconds)
+        if result is None:
+            self.timeouts += timedOut
+            self.failures += 1
+            return
+
+        if not result.success:
+            self.failures += 1
+        if result.cacheHit is not None:
+            self.cacheHits += result.cacheHit
+            self.cacheMisses += not result.cacheHit
+
+    @staticmethod
+    def percentile(ordered: Any, fraction: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def report(self) -> Dict[str, Any]:
+        """Summarize the recorded requests
+
+        Returns:
+            Dict[str, Any] -- Counters, latency percentiles in milliseconds and cache statistics
+        """
+        ordered = sorted(self.latencies)
+        return {
+            'uptime'      : round(time.time() - self.started, 1),
+            'requests'    : self.requests,
+            'failures'    : self.failures,
+            'timeouts'    : self.timeouts,
+            'p50_ms'      : round(DaemonStats.percentile(ordered, 0.50) * 1000, 2),
+            'p90_ms'      : round(DaemonStats.percentile(ordered, 0.90) * 1000, 2),
+            'p99_ms'      : round(DaemonStats.percentile(ordered, 0.99) * 1000, 2),
+            'cache_hits'  : self.cacheHits,
+            'cache_misses': self.cacheMisses
+            }
+
+class DaemonServer():
+    def __init__(self, path: Optional[str] = None, jobs: Optional[int] = None, timeout: float = DEFAULT_TIMEOUT) -> None:
+        """Transpile server on a unix socket that keeps the transpiler loaded in a pool of worker processes.
+        Requests and responses are single lines of JSON, see `DaemonServer.dispatch`.
+
+        Arguments:
+            path    {Optional[str]} -- Path of the unix socket (default: None)
+            jobs    {Optional[int]} -- Amount of worker processes, defaults to the cpu count (default: None)
+            timeout {float}         -- Seconds a single request may take (default: DEFAULT_TIMEOUT)
+        """
+        self.path = socketPath(path)
+        self.jobs = jobs or os.cpu_count()
+        self.timeout = timeout
+        self.stats = DaemonStats()
+        self.workers: List[DaemonWorker] = []
+        #? Workers not running a request at the moment
+        self.idle: Optional[asyncio.Queue] = None
+        #? Numbers the temporary files requests are transpiled to
+        self.requestIds = itertools.count()
+
+    def serve(self) -> None:
+        """Serve requests until SIGINT or SIGTERM is received
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if directory == socketDirectory():
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            if not trusted(directory, isSocket=False):
+                print(colorT(f"'{directory}' must be a directory only accessible by the current user", Colors.RED))
+                raise SystemExit(1)
+
+        if os.path.exists(self.path):
+            if DaemonClient.request({'op': 'stats'}, self.path) is not None:
+                print(colorT(f"A server is already listening on '{self.path}'", Colors.RED))
+                raise SystemExit(1)
+            #? Left behind by a server that did not shut down cleanly
+            os.unlink(self.path)
+
+        try:
+            asyncio.run(self._serve())
+        finally:
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    async def _serve(self) -> None:
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+
+        #? Workers are started (and import the transpiler) before the first request
+        self.workers = [DaemonWorker() for _ in range(self.jobs)]
+        self.idle = asyncio.Queue()
+        for worker in self.workers:
+            self.idle.put_nowait(worker)
+
+        try:
+            #? Only the current user may connect
+            umask = os.umask(0o177)
+            try:
+                server = await asyncio.start_unix_server(self.handle, path=self.path)
+            finally:
+                os.umask(umask)
+
+            print(colorT(f"Listening on '{self.path}' with {self.jobs} workers", Colors.BLUE))
+            async with server:
+                await stop.wait()
+            print(colorT("Shutting down", Colors.BLUE))
+        finally:
+            for worker in self.workers:
+                worker.close()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer all requests of a connection in order, connections are handled concurrently
+        """
+        try:
+            while (line := await reader.readline()):
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {'error': "malformed request"}
+                else:
+                    response = await self.dispatch(request)
+
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer a single request
+
+        Arguments:
+            request {Dict[str, Any]} -- {'op': 'stats'} or {'op': 'transpile', ...} (see `DaemonClient.transpile`), together with
+                                        the 'protocol' and 'version' of the client, requests of other versions are rejected
+
+        Returns:
+            Dict[str, Any] -- Response
+        """
+        if request.get('protocol') != PROTOCOL_VERSION or request.get('version') != __version__:
+            #? The client transpiles in-process instead
+            return {'error': f"incompatible client, the server runs version {__version__} (protocol {PROTOCOL_VERSION})"}
+
+        operation = request.get('op')
+        if operation == 'stats':
+            return self.stats.report()
+        elif operation == 'transpile':
+            try:
+                return await self.transpile(request)
+            except KeyError as e:
+                return {'error': f"missing field {e}"}
+
+        return {'error': f"unknown operation '{operation}'"}
+
+    async def transpile(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        output = request['output']
+        #? Written to a temporary file first, so a request that timed out never leaves (a part of) its output behind
+        partial = os.path.join(os.path.dirname(output), f".{os.path.basename(output)}.{next(self.requestIds)}.tmp")
+        job = BatchJob(request['input'], partial, 0)
+        start = time.perf_counter()
+
+        worker = await self.idle.get()
+        try:
+            future = worker.run(
+                _serveJob,
+                job,
+                request.get('useMain', True),
+                request.get('config'),
+                request.get('cacheDir'),
+                request.get('cacheBytes', DEFAULT_MAX_BYTES)
+                )
+
+            try:
+                result = await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                #? The job is still running, it is stopped with its worker
+                worker.restart()
+                self.stats.record(time.perf_counter() - start, None, True)
+                return {
+                    'success' : False,
+                    'timedOut': True,
+                    'output'  : colorT(f"Transpilation timed out after {self.timeout}s", Colors.RED) + "\n",
+                    'cacheHit': None
+                    }
+            except Exception as e:
+                #? e.g. a crashed worker process
+                worker.restart()
+                self.stats.record(time.perf_counter() - start, None)
+                return {'success': False, 'output': colorT(f"Daemon error: {e!r}", Colors.RED) + "\n", 'cacheHit': None}
+
+            success, printed = result.success, result.output
+            if success:
+                try:
+                    os.replace(partial, output)
+                except OSError:
+                    success, printed = False, printed + colorT(f"Error accessing '{output}'", Colors.RED) + "\n"
+        finally:
+            self.idle.put_nowait(worker)
+            if os.path.exists(partial):
+                os.unlink(partial)
+
+        self.stats.record(time.perf_counter() - start, result._replace(success=success))
+        return {'success': success, 'output': printed, 'cacheHit': result.cacheHit}
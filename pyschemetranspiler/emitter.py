@@ -0,0 +1,146 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from typing import List, Optional, TextIO
+import io
+import shutil
+import tempfile
+
+#? Characters of fragments a `SpooledEmitter` keeps in memory before moving them to its file
+SPOOL_BUFFER = 1024 * 1024
+
+class Emitter():
+    def __init__(self) -> None:
+        """Collect transpiled code fragments in order.
+        Fragments are never concatenated, they are written to the output stream
+        one by one, so the output is not copied again for every fragment added.
+        """
+        self.fragments: List[str] = []
+    
+    def emit(self, fragment: str) -> None:
+        """Append a fragment to the output
+
+        Arguments:
+            fragment {str} -- Code to append
+        """
+        self.fragments.append(fragment)
+    
+    def prepend(self, fragment: str) -> None:
+        """Insert a fragment before the output
+
+        Arguments:
+            fragment {str} -- Code to insert
+        """
+        self.fragments.insert(0, fragment)
+    
+    def rstrip(self) -> None:
+        """Remove trailing whitespace from the output
+        """
+        Emitter._rstrip(self.fragments)
+    
+    @staticmethod
+    def _rstrip(fragments: List[str]) -> bool:
+        while fragments:
+            last = fragments.pop().rstrip()
+            if last:
+                fragments.append(last)
+                return True
+        
+        return False
+    
+    def writeTo(self, stream: TextIO) -> None:
+        """Write all fragments to a stream
+
+        Arguments:
+            stream {TextIO} -- Writable stream
+        """
+        for fragment in self.fragments:
+            stream.write(fragment)
+    
+    def getvalue(self) -> str:
+        """Get the whole output as one string
+
+        Returns:
+            str -- Output
+        """
+        return "".join(self.fragments)
+    
+    def close(self) -> None:
+        """Release the resources held by the output (see `SpooledEmitter`)
+        """
+        return
+
+class SpooledEmitter(Emitter):
+    def __init__(self, buffer: int = SPOOL_BUFFER) -> None:
+        """Emitter for outputs too large to be kept in memory.
+        Fragments are moved to a temporary file once they exceed `buffer` characters, only the last
+        non blank fragment and the blank ones after it stay in memory so `rstrip` still works.
+        Prepended fragments are always kept in memory.
+
+        Arguments:
+            buffer {int} -- Characters kept in memory (default: SPOOL_BUFFER)
+        """
+        super().__init__()
+        self.head: List[str] = []
+        self.spool: Optional[TextIO] = None
+        self.buffer = buffer
+        self.buffered = 0
+    
+    def emit(self, fragment: str) -> None:
+        self.fragments.append(fragment)
+        self.buffered += len(fragment)
+        if self.buffered > self.buffer:
+            self._spill()
+    
+    def _spill(self) -> None:
+        keep = len(self.fragments) - 1
+        while keep > 0 and not self.fragments[keep].strip():
+            keep -= 1
+        if keep <= 0:
+            return
+        
+        if self.spool is None:
+            self.spool = tempfile.TemporaryFile('w+', encoding='utf-8', newline='')
+        for fragment in self.fragments[:keep]:
+            self.spool.write(fragment)
+        self.fragments = self.fragments[keep:]
+        self.buffered = sum(len(fragment) for fragment in self.fragments)
+    
+    def prepend(self, fragment: str) -> None:
+        self.head.insert(0, fragment)
+    
+    def rstrip(self) -> None:
+        #? Spilled fragments always end with a non blank one
+        if not Emitter._rstrip(self.fragments) and self.spool is None:
+            Emitter._rstrip(self.head)
+    
+    def writeTo(self, stream: TextIO) -> None:
+        for fragment in self.head:
+            stream.write(fragment)
+        if self.spool is not None:
+            self.spool.seek(0)
+            shutil.copyfileobj(self.spool, stream)
+        for fragment in self.fragments:
+            stream.write(fragment)
+    
+    def getvalue(self) -> str:
+        output = io.StringIO()
+        self.writeTo(output)
+        return output.getvalue()
+    
+    def close(self) -> None:
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
@@ -13,41 +13,97 @@
 
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import List, NamedTuple, Optional
 from ast import AST
 
-from .shared import Shared
+from .session import TranspilerSession
+from .source import SourceIndex
 from .coloring import Colors, colorT
 
 class ConversionException(Exception):
     pass
 
-def throw(expt: Exception, node: AST) -> None:
-    print(colorT(f"[{expt.__class__.__name__}] {expt}", Colors.RED))
-    
-    #? Highlight offending line
+class ConversionAbort(SystemExit):
+    """Transpilation of the current file stopped after its errors were reported
+    """
+    pass
+
+class Diagnostic(NamedTuple):
+    severity: str          # 'error' or 'warning'
+    kind: str              # e.g. 'TypeError' or 'TypeWarning'
+    message: str
+    line: Optional[int]
+    column: Optional[int]
+
+    @staticmethod
+    def fromNode(severity: str, kind: str, message: str, node: Optional[AST]) -> Diagnostic:
+        return Diagnostic(severity, kind, message, getattr(node, 'lineno', None), getattr(node, 'col_offset', None))
+
+def highlight(node: AST, fallback: str) -> List[str]:
+    """Render the source line of a node with a marker below the offending column
+
+    Arguments:
+        node     {AST} -- Node to highlight
+        fallback {str} -- Message used if the source can not be read
+
+    Returns:
+        List[str] -- Rendered lines
+    """
+    lines = []
     try:
-        with open(Shared.currentFile, "r") as file:
-            for i, line in enumerate(file):
-                if i == node.lineno-1:
-                    infoStr = f"{node.lineno}>{node.col_offset}: "
-                    leadingSpaces = len(line) - len(line.lstrip(' '))
-                    print(colorT(infoStr, Colors.ORANGE), line.strip())
-                    print(' ' * (len(infoStr) + node.col_offset - leadingSpaces + 1) + colorT('^', Colors.GREEN))
+        session = TranspilerSession.current()
+        if session.source is None:
+            #? Sessions used without `Converter` have to read their file once
+            session.source = SourceIndex.fromFile(session.currentFile)
+        
+        line = session.source.line(node.lineno)
+        if line is not None:
+            infoStr = f"{node.lineno}>{node.col_offset}: "
+            leadingSpaces = len(line) - len(line.lstrip(' '))
+            lines.append(f"{colorT(infoStr, Colors.ORANGE)} {line.strip()}")
+            lines.append(' ' * (len(infoStr) + node.col_offset - leadingSpaces + 1) + colorT('^', Colors.GREEN))
     except Exception:
-        print(colorT(f"Could not print offending code at: {node.lineno}>{node.col_offset}", Colors.ORANGE))
-    raise SystemExit()
+        lines.append(colorT(f"{fallback} at: {node.lineno}>{node.col_offset}", Colors.ORANGE))
+    
+    return lines
+
+def throw(expt: Exception, node: AST) -> None:
+    session = TranspilerSession.current()
+    session.diagnostics.append(Diagnostic.fromNode('error', expt.__class__.__name__, str(expt), node))
+    
+    if session.quiet:
+        message = f"[{expt.__class__.__name__}] {expt}"
+    else:
+        lines = [colorT(f"[{expt.__class__.__name__}] {expt}", Colors.RED)]
+        
+        #? Highlight offending line
+        lines += highlight(node, "Could not print offending code")
+        
+        message = "\n".join(lines)
+        print(message)
+    session.errors.append(message)
+    
+    #? Stop once the error limit is reached, otherwise the current top-level statement is skipped
+    maxErrors = session.config['MAX_ERRORS']
+    if 0 < maxErrors <= len(session.errors):
+        raise ConversionAbort()
+    raise ConversionException(message)
 
 def warn(warnType: str, warn: Exception, node: AST) -> None:
-    print(colorT(f"[{warnType}] {warn}", Colors.ORANGE))
+    session = TranspilerSession.current()
+    session.diagnostics.append(Diagnostic.fromNode('warning', warnType, str(warn), node))
     
-    #? Highlight offending line
-    try:
-        with open(Shared.currentFile, "r") as file:
-            for i, line in enumerate(file):
-                if i == node.lineno-1:
-                    infoStr = f"{node.lineno}>{node.col_offset}: "
-                    leadingSpaces = len(line) - len(line.lstrip(' '))
-                    print(colorT(infoStr, Colors.ORANGE), line.strip())
-                    print(' ' * (len(infoStr) + node.col_offset - leadingSpaces + 1) + colorT('^', Colors.GREEN))
-    except Exception:
-        print(colorT(f"Could not print maybe offending code at: {node.lineno}>{node.col_offset}", Colors.ORANGE))
+    if session.quiet:
+        message = f"[{warnType}] {warn}"
+    else:
+        lines = [colorT(f"[{warnType}] {warn}", Colors.ORANGE)]
+        
+        #? Highlight offending line
+        lines += highlight(node, "Could not print maybe offending code")
+        
+        message = "\n".join(lines)
+        print(message)
+    
+    #? Keep rendered warnings so they can be replayed (e.g. from the cache)
+    session.warnings.append(message)
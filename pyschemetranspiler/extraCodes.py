@@ -16,6 +16,8 @@
 class extraC():
     NAME_IS_MAIN = '(define __name__ "__main__")'
     
+    NAME = '(define __name__ "{}")'
+    
     PRINT = '(define (PRINT . args) (for-each (lambda (x i) (unless (= i 0) (display " ")) (display x)) args (range (length args)))(newline))'
     
     EQUAL = '(define (== a b) (if (and (number? a) (number? b)) (= a b) (equal? a b)))'
@@ -64,6 +66,23 @@ class FlagRequirements():
         'TO_LIST'                 : set(['GROWABLE_VECTOR_REQUIRE']),
     }
 
+class RuntimeExports():
+    #? Names defined by the helpers of a build flag, the shared runtime provides them (see `SharedRuntime`)
+    names = {
+        'PRINT'           : ['PRINT'],
+        'EQUAL'           : ['=='],
+        'NOT_EQUAL'       : ['!='],
+        'IN'              : ['in?'],
+        'INPUT'           : ['input'],
+        'GROWABLE_VECTOR' : ['safe-gvector-set!', 'gvector-pop!', 'gvector-access'],
+        'DEEPCOPY'        : ['deepcopy'],
+        'TO_INT'          : ['int'],
+        'TO_FLOAT'        : ['float'],
+        'TO_STR'          : ['str'],
+        'TO_BOOL'         : ['bool'],
+        'TO_LIST'         : ['toList'],
+    }
+
 class Arts():
     dancing = r"""  ____   __   __ ____      ____   _   _  U _____ u  __  __   _____    ____        _      _   _    ____     ____              _     U _____ u   ____     
 U|  _"\ u\ \ / // __"| uU /"___| |'| |'| \| ___"|/U|' \/ '|u|_ " _|U |  _"\ u U  /"\  u | \ |"|  / __"| uU|  _"\ u  ___     |"|    \| ___"|/U |  _"\ u  
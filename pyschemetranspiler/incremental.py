@@ -0,0 +1,292 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import Dict, List, Any, Optional, Iterator, NamedTuple, Tuple as TupleType
+from ast import AST
+import hashlib
+import os
+import pickle
+import tempfile
+
+from .session import TranspilerSession
+from .symtable import SymbolTable, MISSING
+from .builder import Builder
+from .parser import Parser
+from .cache import TranspileCache, STATE_SUFFIX
+
+#? Saved states of another format are discarded (2: records hold every build flag of their statement)
+STATE_FORMAT = 2
+
+class RootTracker():
+    def __init__(self, symbols: SymbolTable) -> None:
+        """Records which root scope keys a statement reads and writes
+
+        Arguments:
+            symbols {SymbolTable} -- Symbol table to track, see `SymbolTable.tracker`
+        """
+        self.symbols = symbols
+        self.reads: Dict[str, Any] = {}
+        self.writes: Dict[str, Any] = {}
+
+    def begin(self) -> None:
+        """Start recording the accesses of a new statement
+        """
+        self.reads = {}
+        self.writes = {}
+
+    def read(self, key: str, value: Any) -> None:
+        #? Reads of keys the statement wrote itself do not depend on previous statements
+        if key not in self.writes and key not in self.reads:
+            self.reads[key] = value
+
+    def write(self, key: str, value: Any) -> None:
+        self.writes[key] = value
+
+    def matches(self, reads: Dict[str, Any]) -> bool:
+        """Check if the root scope currently holds the same values a statement read before
+
+        Arguments:
+            reads {Dict[str, Any]} -- Recorded reads of the statement
+
+        Returns:
+            bool -- All reads are unchanged
+        """
+        for key, value in reads.items():
+            current = self.symbols.rootValue(key)
+            if current is MISSING or value is MISSING:
+                if current is not value:
+                    return False
+            elif current != value:
+                return False
+
+        return True
+
+    def apply(self, writes: Dict[str, Any]) -> None:
+        """Replay the writes of a statement without recording them
+
+        Arguments:
+            writes {Dict[str, Any]} -- Recorded writes of the statement
+        """
+        for key, value in writes.items():
+            self.symbols.setRoot(key, value)
+
+class Chunk(NamedTuple):
+    lineno: int
+    text: str
+    fingerprint: str
+    nodes: Optional[List[AST]]
+
+class StatementRecord(NamedTuple):
+    fingerprint: str
+    lineno: int
+    reads: Dict[str, Any]
+    writes: Dict[str, Any]
+    buildFlags: List[str]
+    requires: List[str]             # Racket modules required by imports, see `Builder.require`
+    warnings: List[str]
+    codes: List[str]
+
+class IncrementalState():
+    def __init__(self) -> None:
+        """Results of the previous transpilation of a file at top-level statement granularity.
+        A statement is only parsed and rebuilt if its source changed or if one of the root
+        scope entries it read (function signatures, variable types, ...) changed since the
+        previous run, everything else is replayed from the stored record.
+        """
+        self.format = STATE_FORMAT
+        self.signature: Optional[TupleType[Any, ...]] = None
+        self.records: Dict[str, List[StatementRecord]] = {}
+        self.rebuilt = 0
+        self.reused = 0
+
+    @staticmethod
+    def fingerprint(text: str) -> str:
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def _chunks(self, source: str) -> List[Chunk]:
+        chunks = []
+        try:
+            for lineno, text in Parser.split(source.splitlines(True)):
+                fingerprint = IncrementalState.fingerprint(text)
+                #? Unknown chunks are parsed upfront to validate the split before anything is built
+                nodes = None if fingerprint in self.records else Parser.parseChunk(lineno, text)
+                chunks.append(Chunk(lineno, text, fingerprint, nodes))
+        except SyntaxError:
+            #? The heuristic split broke a statement apart, fall back to one chunk per statement
+            lines = source.splitlines(True)
+            groups: List[List[AST]] = []
+            for node in Parser.parseSource(source).body:
+                #? Statements sharing a line (e.g. 'a = 1; b = 2') have to stay in one chunk
+                if groups and node.lineno <= groups[-1][-1].end_lineno:
+                    groups[-1].append(node)
+                else:
+                    groups.append([node])
+            
+            chunks = []
+            for nodes in groups:
+                text = "".join(lines[nodes[0].lineno-1:nodes[-1].end_lineno])
+                chunks.append(Chunk(nodes[0].lineno, text, IncrementalState.fingerprint(text), nodes))
+
+        return chunks
+
+    def _lookup(self, chunk: Chunk, root: RootTracker) -> Optional[StatementRecord]:
+        for record in self.records.get(chunk.fingerprint, []):
+            #? Warnings contain line numbers, so they can only be replayed if the statement did not move
+            if record.warnings and record.lineno != chunk.lineno:
+                continue
+            if root.matches(record.reads):
+                return record
+
+        return None
+
+    def build(self, source: str, signature: TupleType[Any, ...]) -> Iterator[str]:
+        """Build all top-level statements in the active session, reusing unchanged ones
+
+        Arguments:
+            source    {str}             -- Source code to build
+            signature {Tuple[Any, ...]} -- Config the file is transpiled with, records of other configs are discarded
+
+        Returns:
+            Iterator[str] -- Compiled sourceCode of every statement
+        """
+        if signature != self.signature:
+            self.signature = signature
+            self.records = {}
+        self.rebuilt = 0
+        self.reused = 0
+
+        chunks = self._chunks(source)
+
+        session = TranspilerSession.current()
+        root = RootTracker(session.symbols)
+        session.symbols.tracker = root
+        records: Dict[str, List[StatementRecord]] = {}
+
+        for chunk in chunks:
+            record = self._lookup(chunk, root)
+
+            if record is None:
+                nodes = chunk.nodes
+                if nodes is None:
+                    #? Known source whose dependencies changed
+                    nodes = Parser.parseChunk(chunk.lineno, chunk.text)
+
+                #? Every flag the statement needs is recorded, also the ones an earlier statement already activated,
+                #? that statement may change and no longer activate them when this one is reused
+                flagsBefore = session.buildFlags
+                session.buildFlags = dict.fromkeys(flagsBefore, False)
+                requiresBefore = len(session.requires)
+                warningsBefore = len(session.warnings)
+                errorsBefore = len(session.errors)
+                root.begin()
+
+                try:
+                    codes = [Builder.buildStatement(node) for node in nodes]
+                finally:
+                    statementFlags = [flag for flag, active in session.buildFlags.items() if active]
+                    session.buildFlags = {flag: active or flagsBefore.get(flag, False) for flag, active in session.buildFlags.items()}
+                if len(session.errors) > errorsBefore:
+                    #? Failed statements are never reused, they have to report their errors again
+                    yield from codes
+                    continue
+
+                record = StatementRecord(
+                    chunk.fingerprint,
+                    chunk.lineno,
+                    root.reads,
+                    root.writes,
+                    statementFlags,
+                    session.requires[requiresBefore:],
+                    session.warnings[warningsBefore:],
+                    codes
+                    )
+                self.rebuilt += 1
+            else:
+                root.apply(record.writes)
+                for flag in record.buildFlags:
+                    Builder.setBuildFlag(flag)
+                session.requires.extend(record.requires)
+                for warning in record.warnings:
+                    session.warnings.append(warning)
+                    if not session.quiet:
+                        print(warning)
+                self.reused += 1
+
+            records.setdefault(chunk.fingerprint, []).append(record)
+            yield from record.codes
+
+        #? Only keep the records of a complete run
+        self.records = records
+        session.symbols.tracker = None
+
+    @staticmethod
+    def statePath(cacheDir: str, sourcePath: str) -> str:
+        """Location of the saved state of a source file inside of a cache directory
+
+        Arguments:
+            cacheDir   {str} -- Cache directory
+            sourcePath {str} -- Path of source file
+
+        Returns:
+            str -- Path of saved state
+        """
+        name = hashlib.sha1(os.path.abspath(sourcePath).encode()).hexdigest()
+        return os.path.join(cacheDir, "incremental", name + STATE_SUFFIX)
+
+    @staticmethod
+    def load(path: str) -> IncrementalState:
+        """Load a previously saved state, a fresh state is returned if it can not be read or has another format
+
+        Arguments:
+            path {str} -- Path of saved state
+
+        Returns:
+            IncrementalState -- Loaded state
+        """
+        try:
+            with open(path, 'rb') as file:
+                state = pickle.load(file)
+            if isinstance(state, IncrementalState) and getattr(state, 'format', None) == STATE_FORMAT:
+                return state
+        except Exception:
+            pass
+
+        return IncrementalState()
+
+    def save(self, path: str, cache: Optional[TranspileCache] = None) -> None:
+        """Atomically save the state
+
+        Arguments:
+            path  {str}                      -- Path to save state at
+            cache {Optional[TranspileCache]} -- Cache the state is saved in, it counts towards its size cap (default: None)
+        """
+        try:
+            previousBytes = os.path.getsize(path)
+        except OSError:
+            previousBytes = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd, tmpPath = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                pickle.dump(self, file)
+            os.replace(tmpPath, path)
+        except BaseException:
+            os.unlink(tmpPath)
+            raise
+
+        if cache is not None:
+            cache.track(path, previousBytes)
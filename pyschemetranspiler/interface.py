@@ -0,0 +1,140 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import Dict, List, Any, NamedTuple, Optional
+import tempfile
+import hashlib
+import pickle
+import os
+
+from . import __version__
+
+INTERFACE_SUFFIX = ".pysti"
+#? Bumped whenever the layout of `InterfaceFile` changes, files of other formats are ignored
+INTERFACE_FORMAT = 1
+INTERFACE_MAGIC = b"PYSTI"
+
+class ModuleInterface(NamedTuple):
+    name: str                # Dotted name the module is imported by
+    path: str                # Racket module path of the transpiled module, relative to the importing module
+    exports: Dict[str, Any]  # Types of the top-level functions and variables by name
+
+    @property
+    def digest(self) -> str:
+        """Hash of the exported surface, it only changes if a name is added, removed or changes its type
+
+        Returns:
+            str -- Hex digest
+        """
+        digest = hashlib.sha256()
+        for name, exported in sorted(self.exports.items()):
+            digest.update(f"{name}\0{exported!r}\0".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def surface(modules: Optional[Dict[str, ModuleInterface]]) -> str:
+        """Hash of everything a module can import, used to invalidate its cached results
+
+        Arguments:
+            modules {Optional[Dict[str, ModuleInterface]]} -- Importable modules by name
+
+        Returns:
+            str -- Hex digest, empty if there are no modules
+        """
+        if not modules:
+            return ""
+
+        digest = hashlib.sha256()
+        for name, module in sorted(modules.items()):
+            digest.update(f"{name}\0{module.path}\0{module.digest}\0".encode())
+        return digest.hexdigest()
+
+class InterfaceFile(NamedTuple):
+    buildKey: str            # Identifies everything the module was built from, see `InterfaceFile.key`
+    exports: Dict[str, Any]  # Types of the top-level functions and variables by name
+    buildFlags: List[str]    # Resolved build flags of the module, the helpers its transpiled code defines
+    warnings: List[str]      # Warnings of the build, replayed when the module is reused
+
+    @staticmethod
+    def path(target: str) -> str:
+        """Location of the interface file of a module, next to its transpiled file (`out/mod.rkt` -> `out/mod.pysti`)
+
+        Arguments:
+            target {str} -- Path of transpiled module
+
+        Returns:
+            str -- Path of interface file
+        """
+        return os.path.splitext(target)[0] + INTERFACE_SUFFIX
+
+    @staticmethod
+    def key(source: str, config: Dict[str, Any], moduleName: str, modules: Optional[Dict[str, ModuleInterface]]) -> str:
+        """Compute the key of a module build, the module only has to be built again if it changes.
+        Imported modules are only part of it by their exported surface, so editing the body of a function
+        does not invalidate the modules importing it.
+
+        Arguments:
+            source     {str}                                  -- Python source code of the module
+            config     {Dict[str, Any]}                       -- Session config the module is transpiled with
+            moduleName {str}                                  -- Dotted name the module is imported by
+            modules    {Optional[Dict[str, ModuleInterface]]} -- Modules the module may import
+
+        Returns:
+            str -- Hex digest
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{__version__}\0{sorted(config.items())}\0{moduleName}\0{ModuleInterface.surface(modules)}\0".encode())
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def load(path: str) -> Optional[InterfaceFile]:
+        """Load an interface file
+
+        Arguments:
+            path {str} -- Path of interface file
+
+        Returns:
+            Optional[InterfaceFile] -- Loaded interface or None if it is missing, unreadable or of another format
+        """
+        try:
+            with open(path, 'rb') as file:
+                if file.read(len(INTERFACE_MAGIC) + 1) != INTERFACE_MAGIC + bytes([INTERFACE_FORMAT]):
+                    return None
+                interface = pickle.load(file)
+            if isinstance(interface, InterfaceFile):
+                return interface
+        except Exception:
+            pass
+
+        return None
+
+    def save(self, path: str) -> None:
+        """Atomically save the interface
+
+        Arguments:
+            path {str} -- Path of interface file
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd, tmpPath = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(INTERFACE_MAGIC + bytes([INTERFACE_FORMAT]))
+                pickle.dump(self, file, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpPath, path)
+        except BaseException:
+            os.unlink(tmpPath)
+            raise
@@ -0,0 +1,195 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import Callable, Dict, List, Any, Iterator
+from contextlib import contextmanager
+from functools import wraps
+import json
+import linecache
+import tracemalloc
+
+from . import builder
+from .profiler import PHASE_TARGETS, patched
+
+#? Phase of everything before the first phase (reading the source, creating the session)
+SETUP_PHASE = 'setup'
+DEFAULT_TOP = 10
+
+class MemorySpan():
+    def __init__(self, phase: str, base: int) -> None:
+        """Consecutive calls of a phase and everything up to the next phase
+
+        Arguments:
+            phase {str} -- Name of the phase
+            base  {int} -- Bytes retained by all previous spans
+        """
+        self.phase = phase
+        self.calls = 0
+        self.base = base
+        self.retainedBytes = 0  # Allocated during the span and still alive at its end
+        self.peakBytes = 0      # Highest amount allocated during the span and alive at the same time
+        self.top: List[Dict[str, Any]] = []
+
+    @property
+    def totalPeakBytes(self) -> int:
+        return self.base + self.peakBytes
+
+    def toJSON(self) -> Dict[str, Any]:
+        return {
+            'phase'           : self.phase,
+            'calls'           : self.calls,
+            'retained_bytes'  : self.retainedBytes,
+            'peak_bytes'      : self.peakBytes,
+            'total_peak_bytes': self.totalPeakBytes,
+            'top'             : self.top
+            }
+
+class MemoryReporter():
+    def __init__(self, top: int = DEFAULT_TOP) -> None:
+        """Memory of the transpiler per phase (see `PHASE_TARGETS`) and the allocation sites
+        that retained the most of it.
+
+        Tracing restarts with every phase (python 3.8 can not reset the traced peak), so a span only
+        sees the memory allocated during it. Memory of earlier spans freed during a span is not
+        subtracted, `total_peak_bytes` is therefore an upper bound.
+
+        Arguments:
+            top {int} -- Amount of allocation sites reported per phase, 0 skips the (slow) snapshots (default: DEFAULT_TOP)
+        """
+        self.topSites = top
+        self.spans: List[MemorySpan] = []
+        self.depth = 0
+        self.sourceBytes = 0
+        self.internedTypes = 0
+        #? Allocations of the report itself
+        self.ignored = {tracemalloc.__file__, __file__}
+
+    def _open(self, phase: str) -> None:
+        base = self.spans[-1].base + self.spans[-1].retainedBytes if self.spans else 0
+        self.spans.append(MemorySpan(phase, base))
+        tracemalloc.start()
+
+    def _close(self) -> None:
+        span = self.spans[-1]
+        span.retainedBytes, span.peakBytes = tracemalloc.get_traced_memory()
+        #? Type objects are interned, every distinct type created is alive until the session ends
+        self.internedTypes = max(self.internedTypes, len(builder._internedTypes))
+        if self.topSites:
+            #? Filtered after grouping, `Snapshot.filter_traces` is a lot slower on millions of traces
+            snapshot = tracemalloc.take_snapshot()
+            statistics = [stat for stat in snapshot.statistics('lineno') if stat.traceback[0].filename not in self.ignored]
+            for stat in statistics[:self.topSites]:
+                frame = stat.traceback[0]
+                span.top.append({
+                    'site'       : f"{frame.filename}:{frame.lineno}",
+                    'code'       : linecache.getline(frame.filename, frame.lineno).strip(),
+                    'bytes'      : stat.size,
+                    'allocations': stat.count
+                    })
+            #? Dropped before tracing restarts, the next span must not see the snapshot being freed
+            del snapshot, statistics
+        tracemalloc.stop()
+
+    def enter(self, phase: str) -> None:
+        """Count a call of a phase, starts a new span unless the phase is the current one or nested in another phase
+        """
+        self.depth += 1
+        if self.depth > 1:
+            return
+
+        if self.spans[-1].phase != phase:
+            self._close()
+            self._open(phase)
+        self.spans[-1].calls += 1
+
+    def _wrap(self, phase: str, function: Callable) -> Callable:
+        reporter = self
+
+        @wraps(function)
+        def reported(*args: Any, **kwargs: Any) -> Any:
+            if phase == 'parse' and args and isinstance(args[0], str):
+                #? Chunked sources are parsed one statement at a time
+                reporter.sourceBytes += len(args[0].encode())
+            reporter.enter(phase)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                reporter.depth -= 1
+        return reported
+
+    @contextmanager
+    def install(self) -> Iterator[MemoryReporter]:
+        """Trace allocations and record the phases while the context is entered
+
+        Raises:
+            RuntimeError -- Allocations are already traced by someone else
+        """
+        if tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is already tracing, the memory report restarts it for every phase")
+
+        self.spans = []
+        self._open(SETUP_PHASE)
+        try:
+            with patched(PHASE_TARGETS, self._wrap):
+                yield self
+        finally:
+            self._close()
+
+    @property
+    def peak(self) -> MemorySpan:
+        return max(self.spans, key=lambda span: span.totalPeakBytes)
+
+    def report(self) -> Dict[str, Any]:
+        """Summarize the recorded spans
+
+        Returns:
+            Dict[str, Any] -- Overall peak, source size and the spans in order
+        """
+        peak = self.peak
+        return {
+            'peak_bytes'    : peak.totalPeakBytes,
+            'peak_phase'    : peak.phase,
+            'source_bytes'  : self.sourceBytes,
+            'interned_types': self.internedTypes,
+            'phases'        : [span.toJSON() for span in self.spans]
+            }
+
+    def phaseBytes(self) -> Dict[str, int]:
+        """Retained bytes per phase, spans of the same phase are summed up
+
+        Returns:
+            Dict[str, int] -- Bytes by phase
+        """
+        retained: Dict[str, int] = {}
+        for span in self.spans:
+            retained[span.phase] = retained.get(span.phase, 0) + span.retainedBytes
+        return retained
+
+    def save(self, path: str) -> None:
+        with open(path, 'w') as file:
+            json.dump(self.report(), file, indent=2)
+            file.write("\n")
+
+    def summary(self) -> str:
+        """Short human readable summary of the peak and the memory retained per phase
+
+        Returns:
+            str -- Summary
+        """
+        peak = self.peak
+        phases = ", ".join(f"{phase} {retained / 2**20:.1f}MiB" for phase, retained in self.phaseBytes().items())
+        ratio = f", {peak.totalPeakBytes / self.sourceBytes:.0f}x the source" if self.sourceBytes else ""
+        return f"Memory: {peak.totalPeakBytes / 2**20:.1f}MiB peak during {peak.phase}{ratio} (retained: {phases})"
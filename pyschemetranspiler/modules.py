@@ -0,0 +1,149 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import Dict, List, Optional, Set, TextIO
+from ast import Import, ImportFrom
+import os
+
+from .interface import ModuleInterface
+from .parser import Parser
+
+SOURCE_SUFFIX = ".py"
+TARGET_SUFFIX = ".rkt"
+
+class ModuleGraph():
+    def __init__(self, root: str) -> None:
+        """Import graph of the python files of a project.
+        Modules are resolved like python does for a script located in `root`, `import pkg.mod` is `root/pkg/mod.py`.
+        Imports that do not resolve to a file (e.g. `typing`) are left to the builder.
+
+        Arguments:
+            root {str} -- Project root
+        """
+        self.root = root
+        #? source -> {module name: source of module}, only modules of the project
+        self.imports: Dict[str, Dict[str, str]] = {}
+
+    @staticmethod
+    def scan(file: TextIO) -> List[str]:
+        """Collect the names of the modules imported at the top level of a file, without parsing all of it
+
+        Arguments:
+            file {TextIO} -- Opened python source file
+
+        Returns:
+            List[str] -- Dotted module names
+        """
+        names: List[str] = []
+        for _, text in Parser.split(file):
+            if not text.startswith(("import ", "from ")):
+                continue
+            try:
+                nodes = Parser.parseSource(text).body
+            except SyntaxError:
+                #? Reported once the file is built
+                continue
+
+            for node in nodes:
+                if isinstance(node, Import):
+                    names += [alias.name for alias in node.names]
+                elif isinstance(node, ImportFrom) and node.level == 0:
+                    names.append(node.module)
+
+        return names
+
+    def resolve(self, name: str) -> Optional[str]:
+        path = os.path.join(self.root, *name.split(".")) + SOURCE_SUFFIX
+        return os.path.normpath(path) if os.path.isfile(path) else None
+
+    def name(self, source: str) -> str:
+        """Get the dotted name a file is imported by
+
+        Arguments:
+            source {str} -- Path of file
+
+        Returns:
+            str -- Module name
+        """
+        return os.path.relpath(source, self.root)[:-len(SOURCE_SUFFIX)].replace(os.sep, ".")
+
+    def add(self, source: str) -> None:
+        """Add a file and all modules it imports (transitively)
+
+        Arguments:
+            source {str} -- Path of file
+        """
+        pending = [os.path.normpath(source)]
+        while pending:
+            source = pending.pop()
+            if source in self.imports:
+                continue
+
+            try:
+                with open(source, 'r') as file:
+                    names = ModuleGraph.scan(file)
+            except (OSError, UnicodeDecodeError):
+                #? Reported once the file is built
+                names = []
+
+            self.imports[source] = {name: path for name in names if (path := self.resolve(name)) is not None}
+            pending += self.imports[source].values()
+
+    def dependencies(self, source: str) -> List[str]:
+        """Get the files a file imports directly
+
+        Arguments:
+            source {str} -- Path of file
+
+        Returns:
+            List[str] -- Paths of imported files
+        """
+        return list(dict.fromkeys(self.imports.get(os.path.normpath(source), {}).values()))
+
+    @property
+    def imported(self) -> Set[str]:
+        return {path for imports in self.imports.values() for path in imports.values()}
+
+    def interfaces(self, source: str, target: str, built: Dict[str, ModuleInterface]) -> Dict[str, ModuleInterface]:
+        """Get the interfaces of the modules a file imports as it sees them
+
+        Arguments:
+            source {str}                        -- Path of file
+            target {str}                        -- Path the file is transpiled to
+            built  {Dict[str, ModuleInterface]} -- Interfaces of built modules by source, with the path of their target
+
+        Returns:
+            Dict[str, ModuleInterface] -- Interfaces by imported name, with the racket path relative to `target`
+        """
+        modules = {}
+        for name, path in self.imports.get(os.path.normpath(source), {}).items():
+            if (module := built.get(path)) is not None:
+                relative = os.path.relpath(module.path, os.path.dirname(target) or ".").replace(os.sep, "/")
+                modules[name] = module._replace(name=name, path=relative)
+
+        return modules
+
+    def target(self, source: str, outputRoot: str) -> str:
+        """Get the mirrored location of a file below an output directory (`root/pkg/mod.py` -> `out/pkg/mod.rkt`)
+
+        Arguments:
+            source     {str} -- Path of file
+            outputRoot {str} -- Root of the output tree
+
+        Returns:
+            str -- Path of transpiled file
+        """
+        return os.path.join(outputRoot, os.path.relpath(source, self.root)[:-len(SOURCE_SUFFIX)] + TARGET_SUFFIX)
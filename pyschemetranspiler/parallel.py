@@ -0,0 +1,239 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import Dict, List, Any, Iterator, NamedTuple, Optional, Union, Tuple as TupleType
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import redirect_stdout
+from ast import AST, FunctionDef
+import io
+import os
+
+from .builder import Builder, Typer
+from .exceptions import ConversionAbort, Diagnostic
+from .incremental import RootTracker
+from .symtable import MISSING
+from .parser import Parser
+from .session import TranspilerSession
+from .source import SourceIndex
+
+#? Source of the functions sent to a worker at once, every job also carries a copy of the root scope
+JOB_BYTES = 64 * 1024
+
+class StatementResult(NamedTuple):
+    code: str
+    output: str                     # Everything printed while building (rendered warnings and errors)
+    warnings: List[str]
+    errors: List[str]
+    diagnostics: List[Diagnostic]
+    buildFlags: List[str]           # Build flags activated by the statement
+
+class FunctionSource(NamedTuple):
+    writes: Dict[str, Any]          # Root scope writes since the previous function of the job, see `RootTracker`
+    lineno: int                     # First line of the function (or its first decorator)
+    text: str
+
+class FunctionJob(NamedTuple):
+    fileName: str
+    config: Dict[str, Any]
+    quiet: bool
+    root: Dict[str, Any]            # Root scope at the first function of the job
+    signatures: Dict[str, Any]      # Signatures of all top-level functions, the bodies may call them before their definition
+    functions: List[FunctionSource]
+
+def _captured(node: AST) -> StatementResult:
+    """Build a top-level statement in the active session and take everything it reported out of the session,
+    so it can be reported once all statements before it were
+
+    Arguments:
+        node {AST} -- Top-level statement to build
+
+    Returns:
+        StatementResult -- Code and reports of the statement
+    """
+    session = TranspilerSession.current()
+    flagsBefore = dict(session.buildFlags)
+    warnings, errors, diagnostics = len(session.warnings), len(session.errors), len(session.diagnostics)
+
+    with redirect_stdout(io.StringIO()) as output:
+        code = Builder.buildStatement(node)
+
+    result = StatementResult(
+        code,
+        output.getvalue(),
+        session.warnings[warnings:],
+        session.errors[errors:],
+        session.diagnostics[diagnostics:],
+        [flag for flag, active in session.buildFlags.items() if active and not flagsBefore[flag]]
+        )
+    del session.warnings[warnings:], session.errors[errors:], session.diagnostics[diagnostics:]
+    return result
+
+def _buildFunctions(job: FunctionJob) -> List[StatementResult]:
+    """Build top-level functions inside of a pool worker
+
+    Arguments:
+        job {FunctionJob} -- Functions to build
+
+    Returns:
+        List[StatementResult] -- Result of every function in order
+    """
+    session = TranspilerSession(job.fileName, job.config, job.quiet)
+    with session.activate():
+        Builder.initState()
+        Builder.setState(job.root)
+        #? Forward references are only visible to the bodies of functions, never to top-level statements
+        for name, signature in job.signatures.items():
+            if session.symbols.rootValue(name) is MISSING:
+                Builder.setStateKey(name, signature)
+        tracker = RootTracker(session.symbols)
+
+        results = []
+        for function in job.functions:
+            tracker.apply(function.writes)
+            #? Diagnostics only ever point into the function being built
+            session.source = SourceIndex(function.text, function.lineno)
+            results.append(_captured(Parser.parseChunk(function.lineno, function.text)[0]))
+
+        return results
+
+class ParallelBuilder():
+    @staticmethod
+    def codes(source: str, jobs: Optional[int] = None) -> Iterator[str]:
+        """Build all top-level statements of a source in the active session (see `Builder.initState`),
+        the bodies of top-level functions are built in a pool of worker processes.
+
+        A signature pass deduces the signature of every top-level function first, so calls in function
+        bodies may refer to functions defined further down. Everything else is built in order like usual
+        (top-level statements only see the functions defined above them) and every function is sent to a
+        worker with the root scope at its position, as the root scope at the first function of its job
+        and the writes to it since then. The results are put back together in source order, including
+        the warnings and errors they reported.
+
+        Arguments:
+            source {str}           -- Source code to build
+            jobs   {Optional[int]} -- Amount of worker processes, defaults to the cpu count (default: None)
+
+        Returns:
+            Iterator[str] -- Compiled sourceCode of every statement
+        """
+        session = Builder.session()
+        lines = source.splitlines(True)
+        module = Parser.parseShared(source)
+
+        #* Signature pass
+        signatures: Dict[int, Typer.TFunction] = {}
+        #? Signature of the first definition of every name
+        forward: Dict[str, Typer.TFunction] = {}
+        for node in module.body:
+            if isinstance(node, FunctionDef):
+                try:
+                    signatures[id(node)] = Typer.deduceSignature(node)
+                except Exception:
+                    #? Reported once the function itself is built
+                    continue
+                forward.setdefault(node.name, signatures[id(node)])
+
+        #? Errors are only counted once they are reported in order, see `ParallelBuilder._report`
+        maxErrors = session.config['MAX_ERRORS']
+        session.config['MAX_ERRORS'] = 0
+
+        executor = ProcessPoolExecutor(max_workers=jobs or os.cpu_count())
+        futures: List[Future] = []
+        #? Functions of the next job and the root scope at the first of them
+        batch: List[FunctionSource] = []
+        batchBytes = 0
+        root: Dict[str, Any] = {}
+
+        def submit() -> None:
+            nonlocal batch, batchBytes
+            if batch:
+                job = FunctionJob(session.currentFile, dict(session.config), session.quiet, root, forward, batch)
+                futures.append(executor.submit(_buildFunctions, job))
+                batch, batchBytes = [], 0
+
+        #? Records the root scope writes between the functions of a job
+        tracker = RootTracker(session.symbols)
+        previousTracker, session.symbols.tracker = session.symbols.tracker, tracker
+        try:
+            #? Results of statements built in place and (job, index) of functions
+            order: List[Union[StatementResult, TupleType[int, int]]] = []
+            for node in module.body:
+                if not isinstance(node, FunctionDef):
+                    order.append(_captured(node))
+                    continue
+
+                #? Declared at its position like a function built in place
+                signature = signatures.get(id(node))
+                if signature is not None:
+                    Builder.setStateKey(node.name, signature)
+                if not batch:
+                    root = session.symbols.scope(0)
+                    tracker.begin()
+
+                first = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+                text = "".join(lines[first-1:node.end_lineno])
+                order.append((len(futures), len(batch)))
+                batch.append(FunctionSource(tracker.writes, first, text))
+                batchBytes += len(text)
+                tracker.begin()
+                if batchBytes >= JOB_BYTES:
+                    submit()
+
+            submit()
+            session.config['MAX_ERRORS'] = maxErrors
+
+            #* Stitch results in source order
+            for item in order:
+                if isinstance(item, StatementResult):
+                    result = item
+                else:
+                    job, index = item
+                    result = futures[job].result()[index]
+
+                ParallelBuilder._report(result)
+                yield result.code
+        finally:
+            session.config['MAX_ERRORS'] = maxErrors
+            session.symbols.tracker = previousTracker
+            #? Stopped early (e.g. at the error limit), the remaining functions are not needed anymore
+            for future in futures:
+                future.cancel()
+            executor.shutdown()
+
+    @staticmethod
+    def _report(result: StatementResult) -> None:
+        """Report the warnings, errors and build flags of a statement in the active session
+        like they would have been if it was built in place
+
+        Arguments:
+            result {StatementResult} -- Result of statement
+
+        Raises:
+            ConversionAbort -- The error limit of the session was reached
+        """
+        session = Builder.session()
+        if result.output:
+            print(result.output, end="")
+
+        session.warnings.extend(result.warnings)
+        session.diagnostics.extend(result.diagnostics)
+        for flag in result.buildFlags:
+            Builder.setBuildFlag(flag)
+
+        for error in result.errors:
+            session.errors.append(error)
+            if 0 < session.config['MAX_ERRORS'] <= len(session.errors):
+                raise ConversionAbort()
@@ -13,13 +13,176 @@
 
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
-from typing import TextIO
+from typing import TextIO, Iterable, Iterator, List, Tuple
+from collections import OrderedDict
+from ast import parse, increment_lineno, Module, AST
+import hashlib
+import threading
 
-from ast import parse, Module
+#? Amount of parsed modules kept by `Parser.parseShared`
+AST_CACHE_SIZE = 64
+#? Lines starting with these continue the previous top-level statement
+CONTINUATION_CHARS = (' ', '\t', '\f', '#', '\r', '\n', ')', ']', '}')
+CONTINUATION_KEYWORDS = ('else', 'elif', 'except', 'finally')
+
+class ASTCache():
+    def __init__(self, maxEntries: int = AST_CACHE_SIZE) -> None:
+        """Least recently used cache of parsed modules keyed by the hash of their source.
+        The cached modules are shared, so they must never be changed (builders only read them).
+
+        Arguments:
+            maxEntries {int} -- Amount of modules kept (default: AST_CACHE_SIZE)
+        """
+        self.maxEntries = maxEntries
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, contents: str) -> Module:
+        """Parse source code or return the module parsed from the same source before
+
+        Arguments:
+            contents {str} -- Source code
+
+        Returns:
+            Module -- Shared parsed module
+        """
+        key = hashlib.sha1(contents.encode()).digest()
+        with self.lock:
+            if (tree := self.entries.get(key)) is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return tree
+        
+        #? Parsed outside of the lock, concurrent misses of the same source parse it twice
+        tree = parse(contents)
+        with self.lock:
+            self.misses += 1
+            self.entries[key] = tree
+            while len(self.entries) > self.maxEntries:
+                self.entries.popitem(last=False)
+        
+        return tree
+    
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+_astCache = ASTCache()
 
 class Parser():
     @staticmethod
     def parseFile(file: TextIO) -> Module:
         contents: str = file.read()
+        return Parser.parseSource(contents)
+    
+    @staticmethod
+    def parseSource(contents: str) -> Module:
         return parse(contents)
     
+    @staticmethod
+    def parseShared(contents: str) -> Module:
+        """Parse source code through the AST cache, the returned module must not be changed
+        (use `Parser.parseSource` to get a private one)
+
+        Arguments:
+            contents {str} -- Source code
+
+        Returns:
+            Module -- Shared parsed module
+        """
+        return _astCache.get(contents)
+    
+    @staticmethod
+    def cache() -> ASTCache:
+        return _astCache
+    
+    @staticmethod
+    def split(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+        """Split source lines at lines that start a new top-level statement.
+        This is only a heuristic (e.g. it splits inside of multiline strings), callers
+        have to validate the chunks by parsing them.
+
+        Arguments:
+            lines {Iterable[str]} -- Lines of the source code including their line breaks (e.g. an opened file)
+
+        Returns:
+            Iterator[Tuple[int, str]] -- First line number and source of every chunk
+        """
+        chunk: List[str] = []
+        start = 1
+        for lineno, line in enumerate(lines, 1):
+            if chunk and not line.startswith(CONTINUATION_CHARS) and not line.startswith(CONTINUATION_KEYWORDS):
+                yield start, "".join(chunk)
+                chunk = []
+                start = lineno
+            chunk.append(line)
+        
+        if chunk:
+            yield start, "".join(chunk)
+    
+    @staticmethod
+    def parseChunk(lineno: int, text: str) -> List[AST]:
+        """Parse a chunk and move its nodes to their location in the file
+
+        Arguments:
+            lineno {int} -- First line of chunk
+            text   {str} -- Source of chunk
+
+        Returns:
+            List[AST] -- Top-level statements of chunk
+        """
+        tree = Parser.parseSource(text)
+        if lineno > 1:
+            increment_lineno(tree, lineno - 1)
+        return tree.body
+    
+    @staticmethod
+    def chunks(file: TextIO) -> Iterator[Tuple[int, str, List[AST]]]:
+        """Parse a source file one top-level statement at a time without reading it at once.
+        A chunk of `Parser.split` that does not parse was split inside of a statement (a wrong cut always
+        leaves a string, bracket, decorator or block unfinished), it is merged with the following ones
+        until it parses. The merged size doubles between attempts, so every line is only parsed a few times.
+
+        Arguments:
+            file {TextIO} -- Opened python source file
+
+        Raises:
+            SyntaxError -- The source is invalid, line numbers are relative to the file
+
+        Returns:
+            Iterator[Tuple[int, str, List[AST]]] -- First line number, source and top-level statements of every chunk
+        """
+        start = 1
+        pending: List[str] = []
+        size = 0
+        retryAt = 0
+        for lineno, text in Parser.split(file):
+            if not pending:
+                start = lineno
+            pending.append(text)
+            size += len(text)
+            if size < retryAt:
+                continue
+            
+            chunk = "".join(pending)
+            try:
+                nodes = Parser.parseChunk(start, chunk)
+            except SyntaxError:
+                retryAt = 2 * size
+                continue
+            
+            pending = []
+            size = retryAt = 0
+            yield start, chunk, nodes
+        
+        if pending:
+            chunk = "".join(pending)
+            try:
+                nodes = Parser.parseChunk(start, chunk)
+            except SyntaxError as e:
+                if e.lineno is not None:
+                    e.lineno += start - 1
+                raise
+            yield start, chunk, nodes
@@ -0,0 +1,312 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import Callable, Dict, Iterable, List, Any, Iterator, Optional, Tuple, Generator
+from contextlib import contextmanager
+from functools import wraps
+import inspect
+import json
+import os
+import time
+
+from . import builder
+from .builder import Builder, CallResolver, ListAttributeResolver, Typer
+from .converter import Converter
+from .emitter import Emitter, SpooledEmitter
+from .parser import Parser
+
+#! Nothing is instrumented unless a profile is installed, see `Profiler.install`
+
+#? Categories of the report, every profiled frame belongs to exactly one
+PHASE = 'phases'
+NODE = 'nodes'
+CALL = 'calls'
+TYPER = 'typer'
+
+#? Entry points of the phases of a transpilation, (phase, owner, attribute)
+PHASE_TARGETS: List[Tuple[str, Any, str]] = [
+    ('parse',             Parser,         'parseShared'),
+    ('parse',             Parser,         'parseSource'),
+    ('build',             Builder,        'buildStatement'),
+    ('compileBuildFlags', Converter,      'compileBuildFlags'),
+    ('prelude',           Converter,      'prelude'),
+    ('write',             Emitter,        'writeTo'),
+    ('write',             SpooledEmitter, 'writeTo'),
+]
+
+@contextmanager
+def patched(targets: Iterable[Tuple[Any, Any, str]], wrap: Callable[[Any, Callable], Callable]) -> Iterator[None]:
+    """Replace functions by wrappers while the context is entered
+
+    Arguments:
+        targets {Iterable[Tuple[Any, Any, str]]}    -- (label, owner, attribute), owners are classes or dispatch tables
+        wrap    {Callable[[Any, Callable], Callable]} -- Builds the wrapper of a function from its label and the function
+    """
+    originals: List[Tuple[Any, Any, Any]] = []
+    try:
+        for label, owner, attribute in targets:
+            if isinstance(owner, dict):
+                originals.append((owner, attribute, owner[attribute]))
+                owner[attribute] = wrap(label, owner[attribute])
+                continue
+
+            original = owner.__dict__[attribute]
+            originals.append((owner, attribute, original))
+            if isinstance(original, staticmethod):
+                setattr(owner, attribute, staticmethod(wrap(label, original.__func__)))
+            else:
+                setattr(owner, attribute, wrap(label, original))
+
+        yield
+    finally:
+        #? Reversed, a function patched twice ends up as the original
+        for owner, attribute, original in reversed(originals):
+            if isinstance(owner, dict):
+                owner[attribute] = original
+            else:
+                setattr(owner, attribute, original)
+
+class ProfileEntry():
+    __slots__ = ('calls', 'inclusive', 'exclusive')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.inclusive = 0.0  # Seconds including nested frames, recursive frames are only counted once
+        self.exclusive = 0.0  # Seconds not spent in any nested profiled frame
+
+    def toJSON(self) -> Dict[str, Any]:
+        return {
+            'calls'       : self.calls,
+            'inclusive_ms': round(self.inclusive * 1000, 3),
+            'exclusive_ms': round(self.exclusive * 1000, 3)
+            }
+
+class Profiler():
+    def __init__(self, trace: bool = False) -> None:
+        """Call counts and inclusive/exclusive time of the transpiler per phase, AST node type,
+        `CallResolver` branch and `Typer` operation
+
+        Arguments:
+            trace {bool} -- Also record every frame for a Chrome trace-event file (default: False)
+        """
+        self.entries: Dict[str, Dict[str, ProfileEntry]] = {PHASE: {}, NODE: {}, CALL: {}, TYPER: {}}
+        self.trace = trace
+        self.events: List[Tuple[str, str, float, float]] = []
+        #? Time spent in nested frames of every open frame
+        self.children: List[float] = []
+        #? Open frames per (category, name), only the outermost one counts as inclusive time
+        self.active: Dict[Tuple[str, str], int] = {}
+        self.started = 0.0
+        self.seconds = 0.0
+
+    def record(self, category: str, name: str, function: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Call a function as a profiled frame
+
+        Arguments:
+            category {str}      -- Category of the frame (e.g. `NODE`)
+            name     {str}      -- Name of the frame in its category
+            function {Callable} -- Function to call
+
+        Returns:
+            Any -- Return value of the function
+        """
+        key = (category, name)
+        depth = self.active.get(key, 0)
+        self.active[key] = depth + 1
+        self.children.append(0.0)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            nested = self.children.pop()
+            if self.children:
+                self.children[-1] += duration
+            self._close(category, name, depth, start, duration - nested)
+
+    def _close(self, category: str, name: str, depth: int, start: float, exclusive: float) -> None:
+        self.active[(category, name)] = depth
+        duration = time.perf_counter() - start
+
+        if (entry := self.entries[category].get(name)) is None:
+            entry = self.entries[category][name] = ProfileEntry()
+        entry.calls += 1
+        entry.exclusive += exclusive
+        if depth == 0:
+            entry.inclusive += duration
+        if self.trace:
+            self.events.append((category, name, start, duration))
+
+    def recordTrampolined(self, category: str, name: str, function: Callable, *args: Any) -> Generator[Any, Any, Any]:
+        """Run a trampolined builder (see `builder.Nested`) as a profiled frame.
+        Only its own steps are exclusive time, nested nodes are built between them
+
+        Arguments:
+            category {str}      -- Category of the frame (e.g. `NODE`)
+            name     {str}      -- Name of the frame in its category
+            function {Callable} -- Generator function to run
+
+        Returns:
+            Generator[Any, Any, Any] -- Generator forwarding the requests and results
+        """
+        key = (category, name)
+        depth = self.active.get(key, 0)
+        self.active[key] = depth + 1
+        begin = time.perf_counter()
+        exclusive = 0.0
+        sent: Any = None
+        error: Optional[BaseException] = None
+        try:
+            generator = function(*args)
+            while True:
+                self.children.append(0.0)
+                start = time.perf_counter()
+                try:
+                    request = generator.send(sent) if error is None else generator.throw(error)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    duration = time.perf_counter() - start
+                    nested = self.children.pop()
+                    if self.children:
+                        self.children[-1] += duration
+                    exclusive += duration - nested
+
+                try:
+                    sent, error = (yield request), None
+                except GeneratorExit:
+                    generator.close()
+                    raise
+                except BaseException as e:
+                    #? Raised by a nested node, see `Builder._buildFromNode`
+                    sent, error = None, e
+        finally:
+            self._close(category, name, depth, begin, exclusive)
+
+    def _wrap(self, label: Tuple[str, str], function: Callable) -> Callable:
+        profiler = self
+        category, name = label
+
+        if inspect.isgeneratorfunction(function):
+            @wraps(function)
+            def profiledTrampolined(*args: Any) -> Generator[Any, Any, Any]:
+                return profiler.recordTrampolined(category, name, function, *args)
+            return profiledTrampolined
+
+        @wraps(function)
+        def profiled(*args: Any, **kwargs: Any) -> Any:
+            return profiler.record(category, name, function, *args, **kwargs)
+        return profiled
+
+    def _targets(self) -> Iterator[Tuple[Tuple[str, str], Any, Any]]:
+        #? ((category, name), owner, attribute)
+        for phase, owner, attribute in PHASE_TARGETS:
+            yield (PHASE, phase), owner, attribute
+        #? Nodes are profiled by their builders, trampolined nodes are not built through `Builder._buildFromNode`
+        for nodeType in Builder.switcher:
+            yield (NODE, nodeType.__name__), Builder.switcher, nodeType
+
+        for name in ('normal', 'attributeError'):
+            yield (CALL, name), CallResolver, name
+        yield (CALL, 'list.error'), ListAttributeResolver, 'error'
+        for table, prefix in ((builder.CALL_SPECIALS, ''), (builder.LIST_ATTRIBUTES, 'list.')):
+            for key in table:
+                yield (CALL, f"{prefix}{key}"), table, key
+        for key in builder.CALL_ATTRIBUTES:
+            yield (CALL, key.__name__), builder.CALL_ATTRIBUTES, key
+
+        for name in ('deduceTypeFromNode', 'isTypeCompatible', 'mergeTypes', 'isRestrictedType'):
+            yield (TYPER, name), Typer, name
+
+    @contextmanager
+    def install(self) -> Iterator[Profiler]:
+        """Instrument the transpiler while the context is entered.
+        Instrumentation is process wide, every transpilation running meanwhile is profiled.
+        """
+        self.started = time.perf_counter()
+        try:
+            with patched(self._targets(), self._wrap):
+                yield self
+        finally:
+            self.seconds += time.perf_counter() - self.started
+
+    def report(self) -> Dict[str, Any]:
+        """Summarize the recorded frames
+
+        Returns:
+            Dict[str, Any] -- Total time, the phases in order and the entries of all other categories, slowest (exclusive) first
+        """
+        report: Dict[str, Any] = {'total_ms': round(self.seconds * 1000, 3)}
+        for category, entries in self.entries.items():
+            ordered = list(entries.items())
+            if category != PHASE:
+                ordered.sort(key=lambda item: item[1].exclusive, reverse=True)
+            report[category] = {name: entry.toJSON() for name, entry in ordered}
+
+        return report
+
+    def traceEvents(self) -> Dict[str, Any]:
+        """Recorded frames in the Chrome trace-event format (chrome://tracing, Perfetto)
+
+        Returns:
+            Dict[str, Any] -- Trace object
+        """
+        pid = os.getpid()
+        return {
+            'displayTimeUnit': 'ms',
+            'traceEvents': [
+                {
+                    'name': name,
+                    'cat' : category,
+                    'ph'  : 'X',
+                    'ts'  : round((start - self.started) * 1e6, 3),
+                    'dur' : round(duration * 1e6, 3),
+                    'pid' : pid,
+                    'tid' : 0
+                    }
+                #? Parents end after their children, complete events are sorted by start for the viewers
+                for category, name, start, duration in sorted(self.events, key=lambda event: event[2])
+                ]
+            }
+
+    def save(self, reportPath: Optional[str], tracePath: Optional[str] = None) -> None:
+        """Write the JSON report and the trace-event file
+
+        Arguments:
+            reportPath {Optional[str]} -- Path of the report or None to skip it
+            tracePath  {Optional[str]} -- Path of the trace-event file or None to skip it (default: None)
+        """
+        if reportPath is not None:
+            with open(reportPath, 'w') as file:
+                json.dump(self.report(), file, indent=2)
+                file.write("\n")
+        if tracePath is not None:
+            with open(tracePath, 'w') as file:
+                json.dump(self.traceEvents(), file)
+
+    def summary(self, limit: int = 5) -> str:
+        """Short human readable summary of the phases and the slowest node types
+
+        Arguments:
+            limit {int} -- Amount of node types listed (default: 5)
+
+        Returns:
+            str -- Summary
+        """
+        phases = ", ".join(f"{name} {entry.inclusive * 1000:.1f}ms" for name, entry in self.entries[PHASE].items())
+        nodes = sorted(self.entries[NODE].items(), key=lambda item: item[1].exclusive, reverse=True)[:limit]
+        slowest = ", ".join(f"{name} {entry.exclusive * 1000:.1f}ms" for name, entry in nodes)
+        return f"Profile: {self.seconds * 1000:.1f}ms total ({phases}); slowest nodes: {slowest}"
@@ -14,8 +14,19 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import argparse
-from pyschemetranspiler.converter import Converter
+import os
+import sys
+from contextlib import nullcontext, redirect_stdout
+from typing import Any, Dict, Optional, TextIO
+from pyschemetranspiler.client import DaemonClient
+from pyschemetranspiler import __version__
 from pyschemetranspiler.coloring import Colors, colorT
+from pyschemetranspiler.runtime import SharedRuntime, RUNTIME_FILE
+
+#! The transpiler is imported lazily, clients forwarding to a daemon never load it
+
+#? Path standing for stdin/stdout
+STREAM = '-'
 
 def main() -> None:
     parser = argparse.ArgumentParser(
@@ -23,7 +34,7 @@ def main() -> None:
         description='Transpile simple Python to Scheme(Racket).',
         epilog='Copyright (C) 2021 Rubin Raithel'
         )
-    parser.version = 'PySchemeTranspiler v1.3'
+    parser.version = f'PySchemeTranspiler v{__version__}'
     
     parser.add_argument(
         '-version',
@@ -34,37 +45,326 @@ def main() -> None:
         '-input',
         action='store',
         type=str,
-        help='path to file that should be transpiled',
-        required=True
+        help='path to file (or directory tree) that should be transpiled, - reads stdin (required unless serving)'
         )
     parser.add_argument(
         '-output',
         action='store', 
         type=str,
-        help='path to file the transpiled code should be saved in',
-        required=True
+        help='path to file (or directory tree) the transpiled code should be saved in, - streams to stdout (required unless serving)'
         )
     parser.add_argument(
         '-exportable',
         action='store_true',
         help='don\'t wrap all usercode in a main function to allow easier exports (this might cause extra outputs)'
     )
+    parser.add_argument(
+        '-jobs',
+        action='store',
+        type=int,
+        default=None,
+        help='amount of worker processes used when transpiling a directory tree, serving or with -parallel (default: cpu count)'
+    )
+    parser.add_argument(
+        '-cache-dir',
+        action='store',
+        type=str,
+        default=None,
+        help='directory to cache transpiled files in, unchanged files are not transpiled again'
+    )
+    parser.add_argument(
+        '-cache-size',
+        action='store',
+        type=int,
+        default=256,
+        help='size cap of the cache directory in megabytes (default: 256)'
+    )
+    parser.add_argument(
+        '-max-errors',
+        action='store',
+        type=int,
+        default=1,
+        help='amount of errors reported per file before stopping, 0 reports all errors (default: 1)'
+    )
+    parser.add_argument(
+        '-watch',
+        action='store_true',
+        help='keep running and transpile changed files again whenever they are saved'
+    )
+    parser.add_argument(
+        '-serve', '--serve',
+        action='store_true',
+        help='keep the transpiler loaded and serve transpile requests of other runs on a unix socket'
+    )
+    parser.add_argument(
+        '-stats',
+        action='store_true',
+        help='display request latencies and cache statistics of the running server'
+    )
+    parser.add_argument(
+        '-socket',
+        action='store',
+        type=str,
+        default=None,
+        help='path of the server socket (default: $PYSTRANSPILE_SOCKET or pystranspile-<uid>/daemon.sock in the temp directory)'
+    )
+    parser.add_argument(
+        '-timeout',
+        action='store',
+        type=float,
+        default=30.0,
+        help='seconds a single request may take when serving (default: 30)'
+    )
+    parser.add_argument(
+        '-profile',
+        action='store',
+        type=str,
+        default=None,
+        help='save call counts and time per phase, node type, call kind and type operation as a JSON report in this file'
+    )
+    parser.add_argument(
+        '-profile-trace',
+        action='store',
+        type=str,
+        default=None,
+        help='save every profiled call as a Chrome trace-event file (chrome://tracing, Perfetto) in this file'
+    )
+    parser.add_argument(
+        '-memreport',
+        action='store',
+        type=str,
+        default=None,
+        help='save the peak memory and the top allocation sites of every phase as a JSON report in this file'
+    )
+    parser.add_argument(
+        '-chunked',
+        action='store_true',
+        help='read, parse and build the input one top-level statement at a time for huge (e.g. generated) sources, the code is kept in a temporary file until the end'
+    )
+    parser.add_argument(
+        '-parallel',
+        action='store_true',
+        help='build the top-level functions of the input in -jobs worker processes, functions may be called before they are defined'
+    )
+    parser.add_argument(
+        '-runtime',
+        action='store_true',
+        help=f'write the helper functions once to {RUNTIME_FILE} next to the output (the root of the output tree) and require them from there'
+    )
     
     args = parser.parse_args()
     
+    if args.serve:
+        serve(args)
+        return
+    if args.stats:
+        stats(args)
+        return
+    if args.input is None or args.output is None:
+        parser.error("the following arguments are required: -input, -output")
+    
+    config = {'MAX_ERRORS': args.max_errors}
+    profiling = args.profile is not None or args.profile_trace is not None or args.memreport is not None
+    if profiling and (args.watch or os.path.isdir(args.input)):
+        parser.error("-profile and -memreport can only be used to transpile a single file")
+    if args.chunked and (args.watch or os.path.isdir(args.input)):
+        parser.error("-chunked can only be used to transpile a single file")
+    if args.chunked and args.cache_dir:
+        parser.error("-chunked can not be combined with -cache-dir, the source is never read at once")
+    if args.parallel and (args.watch or os.path.isdir(args.input)):
+        parser.error("-parallel can only be used to transpile a single file, directory trees are already built in parallel")
+    if args.parallel and (args.chunked or args.cache_dir or profiling):
+        parser.error("-parallel can not be combined with -chunked, -cache-dir, -profile or -memreport")
+    if args.runtime:
+        if args.output == STREAM:
+            parser.error(f"-runtime can not be used with - as output, {RUNTIME_FILE} is written next to the output file")
+        
+        runtime = os.path.join(args.output if os.path.isdir(args.input) else os.path.dirname(args.output), RUNTIME_FILE)
+        config['RUNTIME'] = os.path.abspath(runtime)
+        try:
+            SharedRuntime.write(runtime)
+        except OSError:
+            print(colorT(f"Error accessing '{runtime}'", Colors.RED))
+            raise SystemExit(1)
+    if STREAM in (args.input, args.output):
+        if args.watch or os.path.isdir(args.input):
+            parser.error("- can only be used to transpile a single file")
+        
+        #? stdout only carries the transpiled code, everything else is printed to stderr
+        stdout = sys.stdout
+        with redirect_stdout(sys.stderr) if args.output == STREAM else nullcontext():
+            transpile(args, config, stdout)
+        return
+    
+    if args.watch:
+        watch(args, config)
+        return
+    #? Profiles and memory reports are only recorded in-process, servers read the whole source and build it in order
+    #? and only build single files, files importing other modules of the project are transpiled in-process
+    if not os.path.isdir(args.input) and not profiling and not args.chunked and not args.parallel and not importsModules(args.input) and forward(args, config):
+        return
+    
+    transpile(args, config)
+
+def serve(args: argparse.Namespace) -> None:
+    from pyschemetranspiler.converter import Converter
+    from pyschemetranspiler.daemon import DaemonServer
+    
     Converter.welcome()
-    try:
-        with open(args.input, 'r') as file:
-            transpiled = Converter.transpile(file, not args.exportable)
-    except OSError:
-        print(colorT("Error accessing the input file", Colors.RED))
+    DaemonServer(args.socket, args.jobs, args.timeout).serve()
+
+def watch(args: argparse.Namespace, config: Dict[str, Any]) -> None:
+    from pyschemetranspiler.converter import Converter
+    from pyschemetranspiler.watch import Watcher
+    
+    Converter.welcome()
+    Watcher(args.input, args.output, not args.exportable, config).run()
+
+def stats(args: argparse.Namespace) -> None:
+    if (response := DaemonClient.request({'op': 'stats'}, args.socket)) is None:
+        print(colorT("No server is running", Colors.RED))
+        raise SystemExit(1)
+    if 'error' in response:
+        print(colorT(response['error'], Colors.RED))
+        raise SystemExit(1)
+    
+    for key, value in response.items():
+        print(colorT(f"{key}: {value}", Colors.BLUE))
+
+def importsModules(path: str) -> bool:
+    from pyschemetranspiler.modules import ModuleGraph
+    
+    graph = ModuleGraph(os.path.dirname(path) or ".")
+    graph.add(path)
+    return len(graph.dependencies(path)) > 0
+
+def forward(args: argparse.Namespace, config: Dict[str, Any]) -> bool:
+    """Transpile a single file in a running daemon
+
+    Arguments:
+        args   {argparse.Namespace} -- Parsed arguments
+        config {Dict[str, Any]}     -- Session config overrides
+
+    Returns:
+        bool -- The file was handled by a daemon, False if none is running
+    """
+    response = DaemonClient.transpile(
+        args.input, args.output, not args.exportable, config, args.cache_dir, args.cache_size * 1024 * 1024, args.socket
+        )
+    if response is None:
+        return False
+    if 'error' in response:
+        #? Server of another protocol or package version (see `DaemonServer.dispatch`), transpile in-process instead
+        return False
+    
+    print(response['output'], end="")
+    if response.get('timedOut'):
+        raise SystemExit(1)
+    if not response['success']:
         raise SystemExit
     
+    if response['cacheHit'] is not None:
+        hits = int(response['cacheHit'])
+        print(colorT(f"Cache: {hits} hits, {1 - hits} misses", Colors.BLUE))
+    print(colorT("Transpilation successful <3", Colors.BLUE))
+    return True
+
+def transpile(args: argparse.Namespace, config: Dict[str, Any], stdout: Optional[TextIO] = None) -> None:
+    from pyschemetranspiler.converter import Converter
+    from pyschemetranspiler.batch import BatchTranspiler
+    
+    Converter.welcome()
+    if os.path.isdir(args.input):
+        summary = BatchTranspiler.run(
+            args.input, args.output, args.jobs, not args.exportable, args.cache_dir, args.cache_size * 1024 * 1024, config
+            )
+        BatchTranspiler.report(summary)
+        if summary.failures:
+            raise SystemExit(1)
+        return
+    
+    profiler = None
+    memory = None
+    if args.profile is not None or args.profile_trace is not None:
+        from pyschemetranspiler.profiler import Profiler
+        profiler = Profiler(trace=args.profile_trace is not None)
+    if args.memreport is not None:
+        from pyschemetranspiler.memreport import MemoryReporter
+        memory = MemoryReporter()
+    
+    if profiler is None and memory is None:
+        transpileFile(args, config, stdout)
+        return
+    
+    try:
+        with memory.install() if memory else nullcontext(), profiler.install() if profiler else nullcontext():
+            transpileFile(args, config, stdout)
+    finally:
+        #? Failed runs are reported too
+        try:
+            if profiler is not None:
+                print(colorT(profiler.summary(), Colors.BLUE))
+                profiler.save(args.profile, args.profile_trace)
+            if memory is not None:
+                print(colorT(memory.summary(), Colors.BLUE))
+                memory.save(args.memreport)
+        except OSError:
+            print(colorT("Error accessing the report file", Colors.RED))
+
+def transpileFile(args: argparse.Namespace, config: Dict[str, Any], stdout: Optional[TextIO] = None) -> None:
+    from pyschemetranspiler.converter import Converter
+    from pyschemetranspiler.session import TranspilerSession
+    from pyschemetranspiler.cache import TranspileCache
+    from pyschemetranspiler.incremental import IncrementalState
+    from pyschemetranspiler.batch import BatchTranspiler
+    
+    modules = {}
+    if args.input != STREAM and importsModules(args.input):
+        if args.output == STREAM:
+            print(colorT("Imported modules are transpiled next to the output file, - can not be used as output", Colors.RED))
+            raise SystemExit(1)
+        
+        modules = BatchTranspiler.dependencies(args.input, args.output, args.jobs, args.cache_dir, args.cache_size * 1024 * 1024, config)
+        if modules is None:
+            print(colorT("Transpilation failed, an imported module failed", Colors.RED))
+            raise SystemExit(1)
+    
+    cache = None
+    incremental = None
+    if args.cache_dir:
+        cache = TranspileCache(args.cache_dir, args.cache_size * 1024 * 1024)
+        if args.input != STREAM:
+            incremental = IncrementalState.load(IncrementalState.statePath(args.cache_dir, args.input))
+    
+    transpiled = None
     try:
-        with open(args.output, 'w') as file:
-            file.write(transpiled)
+        with nullcontext(sys.stdin) if args.input == STREAM else open(args.input, 'r') as file:
+            session = TranspilerSession(args.input, SharedRuntime.bind(config, args.output))
+            session.modules = modules
+            if args.output == STREAM:
+                #? Written one top-level form at a time
+                Converter.stream(file, stdout, not args.exportable, session, cache, incremental, args.chunked, args.parallel, args.jobs)
+            else:
+                transpiled = Converter.emit(file, not args.exportable, session, cache, incremental, args.chunked, args.parallel, args.jobs)
+        if incremental is not None and incremental.signature is not None:
+            incremental.save(IncrementalState.statePath(args.cache_dir, args.input), cache)
+    except BrokenPipeError:
+        print(colorT("The output stream was closed", Colors.RED))
+        raise SystemExit
     except OSError:
-        print(colorT("Error accessing the output file", Colors.RED))
+        print(colorT("Error accessing the input file", Colors.RED))
         raise SystemExit
     
+    if transpiled is not None:
+        try:
+            with open(args.output, 'w') as file:
+                transpiled.writeTo(file)
+        except OSError:
+            print(colorT("Error accessing the output file", Colors.RED))
+            raise SystemExit
+        finally:
+            transpiled.close()
+    
+    if cache is not None:
+        print(colorT(f"Cache: {cache.hits} hits, {cache.misses} misses", Colors.BLUE))
     print(colorT("Transpilation successful <3", Colors.BLUE))
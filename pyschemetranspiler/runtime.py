@@ -0,0 +1,72 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import Dict, Any, Optional
+import os
+
+from .extraCodes import extraC, RuntimeExports
+
+RUNTIME_FILE = "pyst-runtime.rkt"
+
+class SharedRuntime():
+    @staticmethod
+    def source() -> str:
+        """Get the shared runtime module, it defines and provides the helpers of all build flags once
+        for every file transpiled with the `RUNTIME` config
+
+        Returns:
+            str -- Racket module
+        """
+        names = [name for flagNames in RuntimeExports.names.values() for name in flagNames]
+        definitions = "".join(f"{getattr(extraC, flag)}\n" for flag in RuntimeExports.names)
+        return f"#lang racket\n{extraC.GROWABLE_VECTOR_REQUIRE}\n(provide {' '.join(names)})\n{definitions}"
+
+    @staticmethod
+    def write(path: str) -> None:
+        """Write the shared runtime module, it is left untouched if it is up to date so racket does not compile it again
+
+        Arguments:
+            path {str} -- Path of runtime module
+        """
+        source = SharedRuntime.source()
+        try:
+            with open(path, 'r') as file:
+                if file.read() == source:
+                    return
+        except OSError:
+            pass
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(source)
+
+    @staticmethod
+    def bind(config: Optional[Dict[str, Any]], target: str) -> Optional[Dict[str, Any]]:
+        """Resolve the shared runtime of a config for a single file, the `RUNTIME` config of a run is the
+        absolute path of the runtime module and every transpiled file requires it relative to its own location
+
+        Arguments:
+            config {Optional[Dict[str, Any]]} -- Session config overrides of the run
+            target {str}                      -- Path the file is transpiled to
+
+        Returns:
+            Optional[Dict[str, Any]] -- Session config overrides of the file
+        """
+        if not config or config.get('RUNTIME') is None:
+            return config
+
+        runtime = os.path.relpath(config['RUNTIME'], os.path.dirname(os.path.abspath(target)))
+        return {**config, 'RUNTIME': runtime.replace(os.sep, "/")}
@@ -0,0 +1,122 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import Dict, List, Any, Optional, Iterator, TYPE_CHECKING
+from contextlib import contextmanager
+from ast import AST
+import threading
+
+from .symtable import SymbolTable
+from .source import SourceIndex
+
+if TYPE_CHECKING:
+    from .exceptions import Diagnostic
+    from .interface import ModuleInterface
+
+DEFAULT_BUILD_FLAGS: Dict[str, bool] = {
+    'NAME_IS_MAIN'            : True,  # Include '__name__' declaration
+    'PRINT'                   : False, # Include PRINT function
+    'EQUAL'                   : False, # Include == function
+    'NOT_EQUAL'               : False, # Include != function
+    'IN'                      : False, # Include in? function
+    'INPUT'                   : False, # Include input function
+    'GROWABLE_VECTOR_REQUIRE' : False, # Include growableVectors require
+    'GROWABLE_VECTOR'         : False, # Include growableVectors (std)
+    'DEEPCOPY'                : False, # Include deepcopy function
+    'TO_INT'                  : False, # Include to int converter
+    'TO_FLOAT'                : False, # Include to float converter
+    'TO_STR'                  : False, # Include to str converter
+    'TO_BOOL'                 : False, # Include to bool converter
+    'TO_LIST'                 : False, # Include to list converter
+}
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    'TYPES_STRICT' : True,
+    'DEBUG'        : False,
+    'MAX_ERRORS'   : 1,     # Errors reported before stopping, 0 to report all
+    'RUNTIME'      : None   # Path of the shared runtime module, relative to the transpiled file (see `SharedRuntime.bind`)
+}
+
+#? Holds the session that is active in the current thread
+_active = threading.local()
+
+class TranspilerSession():
+    def __init__(self, fileName: str = "", config: Optional[Dict[str, Any]] = None, quiet: bool = False) -> None:
+        """Create an isolated transpilation session.
+        Every session owns its scope stack (including the control flags toggled
+        through `TempState`), build flags and config, so multiple sessions can be
+        used concurrently from different threads.
+
+        Arguments:
+            fileName {str}                      -- Path of the file that is transpiled, used for diagnostics (default: "")
+            config   {Optional[Dict[str, Any]]} -- Overrides for `DEFAULT_CONFIG` (default: None)
+            quiet    {bool}                     -- Only collect diagnostics instead of printing them (default: False)
+        """
+        self.currentFile = fileName
+        self.config: Dict[str, Any] = {**DEFAULT_CONFIG, **(config or {})}
+        self.buildFlags: Dict[str, bool] = dict(DEFAULT_BUILD_FLAGS)
+        self.symbols = SymbolTable()
+        self.defaultWidenedState: Dict[str, Any] = {}
+        self.currentNode: Optional[AST] = None
+        self.warnings: List[str] = []
+        self.errors: List[str] = []
+        self.diagnostics: List[Diagnostic] = []
+        self.source: Optional[SourceIndex] = None
+        self.quiet = quiet
+        #? Modules the file may import by name, see `modules.ModuleGraph`
+        self.modules: Dict[str, ModuleInterface] = {}
+        #? Dotted name of the file if it is built to be imported, its top-level names are provided
+        self.moduleName: Optional[str] = None
+        self.requires: List[str] = []
+        self.exports: Dict[str, Any] = {}
+
+    def reset(self) -> None:
+        """Reset all per-file state so the session can be reused for another file
+        """
+        self.buildFlags = dict(DEFAULT_BUILD_FLAGS)
+        self.symbols = SymbolTable()
+        self.defaultWidenedState = {}
+        self.currentNode = None
+        self.warnings = []
+        self.errors = []
+        self.diagnostics = []
+        self.requires = []
+        self.exports = {}
+
+    @contextmanager
+    def activate(self) -> Iterator[TranspilerSession]:
+        """Make this session the active one for the current thread while the context is entered
+        """
+        previous = getattr(_active, 'session', None)
+        _active.session = self
+        try:
+            yield self
+        finally:
+            _active.session = previous
+
+    @staticmethod
+    def current() -> TranspilerSession:
+        """Get the session active in the current thread.
+        If no session was activated a default one is created for the thread.
+
+        Returns:
+            TranspilerSession -- Active session
+        """
+        session = getattr(_active, 'session', None)
+        if session is None:
+            session = _active.session = TranspilerSession()
+
+        return session
@@ -0,0 +1,91 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import List, Any, Union
+
+#? Marks an exhausted list while serializing
+_END = object()
+
+class SExpr(list):
+    """A racket list expression, items are atoms (already rendered code) or nested expressions.
+    Builders return expressions instead of text where they are rewritten later on
+    (e.g. flattening), they are serialized once with `serialize` when text is needed.
+    """
+    @property
+    def head(self) -> Any:
+        return self[0] if self else None
+    
+    @staticmethod
+    def chain(head: str, left: Value, right: Value) -> SExpr:
+        """Build a variadic expression, a left operand with the same head is extended in place.
+        `(+ (+ a b) c)` becomes `(+ a b c)` without rebuilding anything, so a chain
+        of n operations is built in linear time.
+
+        Arguments:
+            head  {str}   -- Operator of expression
+            left  {Value} -- Left operand
+            right {Value} -- Right operand
+
+        Returns:
+            SExpr -- Built expression
+        """
+        #? Only extend real chains, '(- x)' is a negation and not a subtraction
+        if isinstance(left, SExpr) and len(left) > 2 and left.head == head:
+            left.append(right)
+            return left
+        
+        return SExpr([head, left, right])
+    
+    def __str__(self) -> str:
+        return serialize(self)
+
+Value = Union[str, SExpr]
+
+def serialize(value: Value) -> str:
+    """Serialize an expression to racket source code.
+    This is iterative, so deeply nested expressions do not hit the recursion limit.
+
+    Arguments:
+        value {Value} -- Expression or atom
+
+    Returns:
+        str -- Racket source code
+    """
+    if not isinstance(value, SExpr):
+        return value
+    
+    parts: List[str] = ["("]
+    stack = [iter(value)]
+    separate = False
+    while stack:
+        item = next(stack[-1], _END)
+        if item is _END:
+            stack.pop()
+            parts.append(")")
+            separate = True
+            continue
+        
+        if separate:
+            parts.append(" ")
+        if isinstance(item, SExpr):
+            parts.append("(")
+            stack.append(iter(item))
+            separate = False
+        else:
+            parts.append(str(item))
+            separate = True
+    
+    return "".join(parts)
@@ -0,0 +1,72 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import List, Optional
+
+class SourceIndex():
+    def __init__(self, source: str, firstLine: int = 1) -> None:
+        """Line index over the source code of a session, used to render diagnostics.
+        The line offsets are computed once on the first lookup, so files without
+        diagnostics do not pay for the index.
+
+        Arguments:
+            source    {str} -- Source code
+            firstLine {int} -- Line number of the first line, if the source is only a part of the file (default: 1)
+        """
+        self.source = source
+        self.firstLine = firstLine
+        self._offsets: Optional[List[int]] = None
+    
+    @staticmethod
+    def fromFile(path: str) -> SourceIndex:
+        """Index a file read from disk
+
+        Arguments:
+            path {str} -- Path of file
+
+        Returns:
+            SourceIndex -- Index of file content
+        """
+        with open(path, 'r') as file:
+            return SourceIndex(file.read())
+    
+    def _index(self) -> List[int]:
+        offsets = [0]
+        source = self.source
+        i = source.find('\n')
+        while i != -1:
+            offsets.append(i + 1)
+            i = source.find('\n', i + 1)
+        
+        self._offsets = offsets
+        return offsets
+    
+    def line(self, lineno: int) -> Optional[str]:
+        """Get a single line
+
+        Arguments:
+            lineno {int} -- Line number (starting at 1)
+
+        Returns:
+            Optional[str] -- Line including its line break or None if it does not exist
+        """
+        offsets = self._offsets if self._offsets is not None else self._index()
+        lineno -= self.firstLine - 1
+        if not 0 < lineno <= len(offsets) or offsets[lineno-1] == len(self.source):
+            return None
+        
+        end = offsets[lineno] if lineno < len(offsets) else len(self.source)
+        return self.source[offsets[lineno-1]:end]
@@ -0,0 +1,231 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import Dict, List, Any, Optional, Tuple as TupleType
+
+class _Missing():
+    """Marker for keys that are not bound
+    """
+    def __repr__(self) -> str:
+        return "MISSING"
+
+    def __reduce__(self) -> str:
+        #? Keep the marker a singleton across pickling
+        return "MISSING"
+
+MISSING = _Missing()
+
+class SymbolTable():
+    def __init__(self) -> None:
+        """Scoped symbol table with one binding stack per name.
+        Every scope keeps an undo log of the names it bound, so lookups, binding
+        and leaving a scope do not depend on the nesting depth.
+        """
+        #? name -> [(depth, value), ...] innermost binding last
+        self.bindings: Dict[str, List[TupleType[int, Any]]] = {}
+        #? Undo log of every scope, a dict is used as an ordered set
+        self.scopes: List[Dict[str, None]] = [{}]
+        #? Receives all accesses to the root scope, see `incremental.RootTracker`
+        self.tracker: Optional[Any] = None
+        self.depth = 0
+    
+    def widen(self, defaults: Dict[str, Any]) -> None:
+        """Enter a new scope
+
+        Arguments:
+            defaults {Dict[str, Any]} -- Initial bindings of the new scope
+        """
+        self.depth += 1
+        #? The new scope is empty, so the defaults can be pushed without looking at existing bindings
+        self.scopes.append(dict.fromkeys(defaults))
+        for key, value in defaults.items():
+            self.bindings.setdefault(key, []).append((self.depth, value))
+    
+    def pop(self) -> Dict[str, Any]:
+        """Leave the current scope and drop all of its bindings
+
+        Raises:
+            ValueError: Trying to pop root scope
+
+        Returns:
+            Dict[str, Any] -- Bindings of popped scope
+        """
+        if len(self.scopes) == 1:
+            raise ValueError("Can not pop root State")
+        
+        popped = {}
+        self.depth -= 1
+        for key in self.scopes.pop():
+            stack = self.bindings[key]
+            popped[key] = stack.pop()[1]
+            if not stack:
+                del self.bindings[key]
+        
+        return popped
+    
+    def _read(self, key: str, value: Any) -> None:
+        if self.tracker is not None:
+            self.tracker.read(key, value)
+    
+    def get(self, key: str) -> Any:
+        """Get the nearest binding of a key
+
+        Raises:
+            KeyError: Key not bound
+
+        Returns:
+            Any -- Bound value
+        """
+        stack = self.bindings.get(key)
+        if not stack:
+            self._read(key, MISSING)
+            raise KeyError(f"key {key} not in state")
+        
+        depth, value = stack[-1]
+        if depth == 0 and self.tracker is not None:
+            self.tracker.read(key, value)
+        return value
+    
+    def contains(self, key: str) -> bool:
+        stack = self.bindings.get(key)
+        if not stack:
+            self._read(key, MISSING)
+            return False
+        
+        if stack[-1][0] == 0 and self.tracker is not None:
+            self.tracker.read(key, stack[-1][1])
+        return True
+    
+    def getLocal(self, key: str) -> Any:
+        """Get the binding of a key in the current scope
+
+        Raises:
+            KeyError: Key not bound in current scope
+
+        Returns:
+            Any -- Bound value
+        """
+        stack = self.bindings.get(key)
+        if stack:
+            depth, value = stack[-1]
+            if depth == self.depth:
+                if depth == 0 and self.tracker is not None:
+                    self.tracker.read(key, value)
+                return value
+        
+        if self.depth == 0:
+            self._read(key, MISSING)
+        raise KeyError(key)
+    
+    def containsLocal(self, key: str) -> bool:
+        stack = self.bindings.get(key)
+        depth = self.depth
+        local = bool(stack) and stack[-1][0] == depth
+        if depth == 0:
+            self._read(key, stack[-1][1] if local else MISSING)
+        return local
+    
+    def set(self, key: str, value: Any, depth: Optional[int] = None) -> None:
+        """Bind a key in the current (or an enclosing) scope
+
+        Arguments:
+            key   {str}           -- Key to bind
+            value {Any}           -- Value to bind
+            depth {Optional[int]} -- Scope to bind in, defaults to the current scope (default: None)
+        """
+        if depth is None:
+            depth = self.depth
+        
+        stack = self.bindings.setdefault(key, [])
+        #? Bindings of enclosing scopes are only set by propagation, they are at most one step below the top
+        i = len(stack)
+        while i > 0 and stack[i-1][0] > depth:
+            i -= 1
+        
+        if i > 0 and stack[i-1][0] == depth:
+            stack[i-1] = (depth, value)
+        else:
+            stack.insert(i, (depth, value))
+            self.scopes[depth][key] = None
+        
+        if depth == 0 and self.tracker is not None:
+            self.tracker.write(key, value)
+    
+    def remove(self, key: str) -> None:
+        """Remove the binding of a key in the current scope
+
+        Raises:
+            KeyError: Key not bound in current scope
+        """
+        stack = self.bindings.get(key)
+        depth = self.depth
+        if not stack or stack[-1][0] != depth:
+            raise KeyError(key)
+        
+        stack.pop()
+        if not stack:
+            del self.bindings[key]
+        del self.scopes[-1][key]
+        
+        if depth == 0 and self.tracker is not None:
+            self.tracker.write(key, MISSING)
+    
+    def scope(self, depth: int = -1) -> Dict[str, Any]:
+        """Get all bindings of a scope
+
+        Arguments:
+            depth {int} -- Scope to get, defaults to the current scope (default: -1)
+
+        Returns:
+            Dict[str, Any] -- Bindings of scope
+        """
+        if depth < 0:
+            depth += len(self.scopes)
+        
+        ret = {}
+        for key in self.scopes[depth]:
+            for bound, value in reversed(self.bindings[key]):
+                if bound == depth:
+                    ret[key] = value
+                    break
+        
+        return ret
+    
+    def rootValue(self, key: str) -> Any:
+        """Get the root binding of a key without notifying the tracker
+
+        Returns:
+            Any -- Bound value or MISSING
+        """
+        stack = self.bindings.get(key)
+        if stack and stack[0][0] == 0:
+            return stack[0][1]
+        return MISSING
+    
+    def setRoot(self, key: str, value: Any) -> None:
+        """Bind (or unbind with MISSING) a key in the root scope without notifying the tracker
+        """
+        tracker, self.tracker = self.tracker, None
+        try:
+            if value is not MISSING:
+                self.set(key, value, 0)
+            elif (stack := self.bindings.get(key)) and stack[0][0] == 0:
+                stack.pop(0)
+                if not stack:
+                    del self.bindings[key]
+                del self.scopes[0][key]
+        finally:
+            self.tracker = tracker
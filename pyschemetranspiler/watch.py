@@ -0,0 +1,232 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+from typing import Dict, List, Any, Optional, NamedTuple, Tuple
+import hashlib
+import io
+import os
+import time
+
+from .converter import Converter
+from .batch import BatchJob, SOURCE_SUFFIX, TARGET_SUFFIX
+from .session import TranspilerSession
+from .incremental import IncrementalState
+from .runtime import SharedRuntime
+from .coloring import Colors, colorT
+
+#? Seconds between two scans of the watched files
+POLL_INTERVAL = 0.03
+#? Seconds a changed file has to stay unchanged before it is rebuilt, coalesces rapid saves
+SETTLE_TIME = 0.01
+
+class WatchedFile():
+    def __init__(self, job: BatchJob) -> None:
+        """A watched source file and the results of its previous build
+
+        Arguments:
+            job {BatchJob} -- Source and target of the file
+        """
+        self.job = job
+        self.stat: Optional[Tuple[int, int]] = None
+        self.digest: Optional[str] = None
+        #? Kept in memory, only the changed statements of a file are parsed and built again
+        self.incremental = IncrementalState()
+
+class Rebuild(NamedTuple):
+    source: str
+    success: bool
+    seconds: float
+    rebuilt: int
+    reused: int
+
+class Watcher():
+    def __init__(self, inputPath: str, outputPath: str, useMain: bool = True, config: Optional[Dict[str, Any]] = None) -> None:
+        """Transpile a file or directory tree again whenever a source file changes
+
+        Arguments:
+            inputPath  {str}                      -- Source file or root of the source tree
+            outputPath {str}                      -- Output file or root of the output tree
+            useMain    {bool}                     -- Wrap all usercode in a main function (default: True)
+            config     {Optional[Dict[str, Any]]} -- Session config overrides (default: None)
+        """
+        self.inputPath = inputPath
+        self.outputPath = outputPath
+        self.useMain = useMain
+        self.config = config
+        self.files: Dict[str, WatchedFile] = {}
+
+    def _walk(self, directory: str, found: Dict[str, Tuple[int, int]]) -> None:
+        #? Cheaper than `BatchTranspiler.collect`, every file is only stat'ed once
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+
+        for entry in entries:
+            if entry.is_dir():
+                self._walk(entry.path, found)
+            elif entry.name.endswith(SOURCE_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                found[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _target(self, source: str) -> str:
+        if not os.path.isdir(self.inputPath):
+            return self.outputPath
+
+        relative = os.path.relpath(source, self.inputPath)
+        return os.path.join(self.outputPath, relative[:-len(SOURCE_SUFFIX)] + TARGET_SUFFIX)
+
+    def scan(self) -> List[WatchedFile]:
+        """Find new, changed and removed source files by their modification time and size
+
+        Returns:
+            List[WatchedFile] -- New and changed files
+        """
+        found: Dict[str, Tuple[int, int]] = {}
+        if os.path.isdir(self.inputPath):
+            self._walk(self.inputPath, found)
+        elif (stat := Watcher._stat(self.inputPath)) is not None:
+            found[self.inputPath] = stat
+
+        for source in [source for source in self.files if source not in found]:
+            print(colorT(f"Removed {source}", Colors.ORANGE))
+            del self.files[source]
+
+        changed = []
+        for source, stat in found.items():
+            if (watched := self.files.get(source)) is None:
+                watched = self.files[source] = WatchedFile(BatchJob(source, self._target(source), stat[1]))
+            if stat != watched.stat:
+                watched.stat = stat
+                changed.append(watched)
+
+        return changed
+
+    def settle(self, changed: List[WatchedFile]) -> None:
+        """Wait until none of the changed files is written to anymore
+
+        Arguments:
+            changed {List[WatchedFile]} -- Files that changed since the last scan
+        """
+        while True:
+            time.sleep(SETTLE_TIME)
+            stable = True
+            for watched in changed:
+                if (stat := Watcher._stat(watched.job.source)) != watched.stat:
+                    watched.stat = stat
+                    stable = False
+            if stable:
+                return
+
+    def rebuild(self, watched: WatchedFile) -> Optional[Rebuild]:
+        """Transpile a file again if its content changed
+
+        Arguments:
+            watched {WatchedFile} -- Changed file
+
+        Returns:
+            Optional[Rebuild] -- Outcome or None if the content is unchanged (e.g. only touched)
+        """
+        start = time.perf_counter()
+        try:
+            with open(watched.job.source, 'r') as file:
+                source = file.read()
+        except OSError:
+            #? Removed while waiting for it to settle, picked up by the next scan
+            return None
+
+        digest = hashlib.sha1(source.encode()).hexdigest()
+        if digest == watched.digest:
+            return None
+        watched.digest = digest
+
+        success = False
+        try:
+            #? `Converter.emit` reads the source from a file object
+            stream = io.StringIO(source)
+            stream.name = watched.job.source
+            transpiled = Converter.emit(stream, self.useMain, TranspilerSession(watched.job.source, SharedRuntime.bind(self.config, watched.job.target)), None, watched.incremental)
+
+            os.makedirs(os.path.dirname(watched.job.target) or ".", exist_ok=True)
+            with open(watched.job.target, 'w') as file:
+                transpiled.writeTo(file)
+                transpiled.close()
+            success = True
+        except OSError as e:
+            print(colorT(f"Error accessing '{e.filename}'", Colors.RED))
+        except SystemExit:
+            #? Error was already reported by 'exceptions.throw', rebuild it once it changes again
+            watched.digest = None
+
+        return Rebuild(watched.job.source, success, time.perf_counter() - start, watched.incremental.rebuilt, watched.incremental.reused)
+
+    def step(self, quiet: bool = False) -> List[Rebuild]:
+        """Scan once and rebuild all changed files
+
+        Arguments:
+            quiet {bool} -- Only report failed rebuilds (default: False)
+
+        Returns:
+            List[Rebuild] -- Outcome of every rebuilt file
+        """
+        if not (changed := self.scan()):
+            return []
+
+        self.settle(changed)
+        rebuilds = []
+        for watched in changed:
+            if (rebuild := self.rebuild(watched)) is not None:
+                if not quiet or not rebuild.success:
+                    Watcher.report(rebuild)
+                rebuilds.append(rebuild)
+
+        return rebuilds
+
+    @staticmethod
+    def report(rebuild: Rebuild) -> None:
+        color = Colors.BLUE if rebuild.success else Colors.RED
+        state = "Rebuilt" if rebuild.success else "Failed"
+        print(colorT(
+            f"{state} {rebuild.source} in {rebuild.seconds * 1000:.1f}ms ({rebuild.rebuilt} statements rebuilt, {rebuild.reused} reused)",
+            color
+            ))
+
+    def run(self) -> None:
+        """Build all files and keep rebuilding changed ones until interrupted
+        """
+        start = time.perf_counter()
+        rebuilds = self.step(quiet=True)
+        failures = sum(not rebuild.success for rebuild in rebuilds)
+        print(colorT(f"Built {len(rebuilds)} files in {time.perf_counter() - start:.2f}s ({failures} failures)", Colors.BLUE))
+        print(colorT(f"Watching {self.inputPath} for changes (Ctrl+C to stop)", Colors.GREEN))
+
+        try:
+            while True:
+                time.sleep(POLL_INTERVAL)
+                self.step()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,50 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from typing import Any, Optional, Tuple
+import io
+import tempfile
+import unittest
+
+from pyschemetranspiler.cache import TranspileCache
+from pyschemetranspiler.converter import Converter
+from pyschemetranspiler.session import TranspilerSession
+
+#? Activates helpers and reports a warning
+SOURCE = "def p(x: float) -> float:\n    return x\nv = None\nprint(p(v), input() == \"a\")\n"
+
+def _transpile(cache: Optional[TranspileCache]) -> Tuple[Any, ...]:
+    file = io.StringIO(SOURCE)
+    file.name = "cached.py"
+    session = TranspilerSession(file.name, quiet=True)
+    code = Converter.emit(file, True, session, cache).getvalue()
+    return code, dict(session.buildFlags), session.warnings, session.diagnostics
+
+class CacheTest(unittest.TestCase):
+    def test_hit_replays_session(self) -> None:
+        uncached = _transpile(None)
+        self.assertTrue(uncached[3])
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = TranspileCache(directory)
+            cold = _transpile(cache)
+            warm = _transpile(cache)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        self.assertEqual(cold, uncached)
+        self.assertEqual(warm, uncached)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import asyncio
+import os
+import socket
+import tempfile
+import unittest
+
+from pyschemetranspiler import __version__
+from pyschemetranspiler.client import DaemonClient, PROTOCOL_VERSION, trusted
+from pyschemetranspiler.daemon import DaemonServer
+
+@unittest.skipUnless(DaemonClient.available(), "unix sockets are not available")
+class DaemonTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "test.sock")
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(self.path)
+        self.listener.listen(1)
+        self.listener.setblocking(False)
+
+    def tearDown(self) -> None:
+        self.listener.close()
+        self.directory.cleanup()
+
+    def test_trusted_socket(self) -> None:
+        os.chmod(self.path, 0o600)
+        self.assertTrue(trusted(self.path))
+        os.chmod(self.path, 0o660)
+        self.assertFalse(trusted(self.path))
+        self.assertFalse(trusted(self.directory.name))
+        self.assertFalse(trusted(os.path.join(self.directory.name, "missing.sock")))
+
+    def test_trusted_directory(self) -> None:
+        os.chmod(self.directory.name, 0o700)
+        self.assertTrue(trusted(self.directory.name, isSocket=False))
+        os.chmod(self.directory.name, 0o755)
+        self.assertFalse(trusted(self.directory.name, isSocket=False))
+
+    def test_untrusted_socket_not_connected(self) -> None:
+        os.chmod(self.path, 0o666)
+        self.assertIsNone(DaemonClient.request({'op': 'stats'}, self.path))
+        with self.assertRaises(BlockingIOError):
+            self.listener.accept()
+
+    def test_other_versions_rejected(self) -> None:
+        server = DaemonServer(self.path + ".unused")
+        current = {'op': 'stats', 'protocol': PROTOCOL_VERSION, 'version': __version__}
+        self.assertNotIn('error', asyncio.run(server.dispatch(current)))
+        for other in ({'protocol': PROTOCOL_VERSION + 1}, {'version': __version__ + ".dev"}, {'protocol': None, 'version': None}):
+            self.assertIn('error', asyncio.run(server.dispatch({**current, **other})))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from typing import List
+import unittest
+
+from pyschemetranspiler.api import transpile_source, TranspileResult
+
+#? Far beyond the python recursion limit, nested builders would need a frame per operand
+OPERANDS = 100000
+BRANCHES = 10000
+
+def _chain(operator: str, operands: List[str]) -> str:
+    return f" {operator} ".join(operands)
+
+class DeepNestingTest(unittest.TestCase):
+    def assertTranspiles(self, source: str) -> str:
+        result = transpile_source(source)
+        self.assertNoRecursion(result)
+        self.assertEqual(result.diagnostics, [])
+        self.assertTrue(result.success)
+        return result.code
+
+    def assertNoRecursion(self, result: TranspileResult) -> None:
+        for diagnostic in result.diagnostics:
+            self.assertNotEqual(diagnostic.kind, 'RecursionError', diagnostic)
+            self.assertNotIn("nested too deeply", diagnostic.message)
+
+    def test_int_chain(self) -> None:
+        code = self.assertTranspiles(f"a: int = 1\nb = {_chain('+', ['a'] * OPERANDS)}\nprint(b)\n")
+        self.assertIn(f"(define b (+ {' '.join(['a'] * OPERANDS)}))", code)
+
+    def test_int_literal_chain(self) -> None:
+        code = self.assertTranspiles(f"b = {_chain('+', [str(i) for i in range(OPERANDS)])}\nprint(b)\n")
+        self.assertIn(f"(define b (+ {' '.join(str(i) for i in range(OPERANDS))}))", code)
+
+    def test_str_chain(self) -> None:
+        code = self.assertTranspiles(f"s: str = \"x\"\nt = {_chain('+', ['s'] * OPERANDS)}\nprint(t)\n")
+        self.assertIn(f"(define t (string-append {' '.join(['s'] * OPERANDS)}))", code)
+
+    def test_mixed_number_chain(self) -> None:
+        code = self.assertTranspiles(f"a: int = 1\nf: float = 2.5\nb = {_chain('+', ['a', 'f'] * (OPERANDS // 2))}\nprint(b)\n")
+        self.assertIn(f"(define b (+ {' '.join(['a', 'f'] * (OPERANDS // 2))}))", code)
+
+    def test_mixed_str_int_chain(self) -> None:
+        #? The type error of the last operand is reported for the statement, not a RecursionError
+        result = transpile_source(f"s: str = \"x\"\nt = {_chain('+', ['s'] * (OPERANDS - 1) + ['1'])}\n")
+        self.assertNoRecursion(result)
+        self.assertFalse(result.success)
+        self.assertEqual([(error.kind, error.line) for error in result.errors], [('TypeError', 2)])
+
+    def test_and_chain(self) -> None:
+        code = self.assertTranspiles(f"x: bool = True\ny = {_chain('and', ['x'] * OPERANDS)}\nprint(y)\n")
+        self.assertIn(f"(define y (and {' '.join(['x'] * OPERANDS)}))", code)
+
+    def test_or_chain(self) -> None:
+        code = self.assertTranspiles(f"x: bool = True\ny = {_chain('or', ['x'] * OPERANDS)}\nprint(y)\n")
+        self.assertIn(f"(define y (or {' '.join(['x'] * OPERANDS)}))", code)
+
+    def test_mixed_bool_chain(self) -> None:
+        code = self.assertTranspiles(f"a: int = 1\ny = {_chain('or', ['a < 2 and a > 0'] * (OPERANDS // 2))}\nprint(y)\n")
+        self.assertIn(f"(define y (or {' '.join(['(and (< a 2) (> a 0))'] * (OPERANDS // 2))}))", code)
+
+    def test_elif_ladder(self) -> None:
+        branches = "".join(f"elif b == {branch}:\n    b = {branch + 1}\n" for branch in range(1, BRANCHES))
+        code = self.assertTranspiles(f"b: int = 1\nif b == 0:\n    b = 1\n{branches}else:\n    b = 0\nprint(b)\n")
+        self.assertEqual(code.count("((== b "), BRANCHES)
+
+    def test_elif_ladder_in_function(self) -> None:
+        branches = "".join(f"    elif v == {branch}:\n        return {branch + 1}\n" for branch in range(1, BRANCHES))
+        code = self.assertTranspiles(f"def f(v: int) -> int:\n    if v == 0:\n        return 1\n{branches}    else:\n        return 0\nprint(f(3))\n")
+        self.assertEqual(code.count("((== v "), BRANCHES)
+
+if __name__ == '__main__':
+    unittest.main()
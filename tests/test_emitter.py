@@ -0,0 +1,61 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from contextlib import redirect_stdout
+import io
+import unittest
+import warnings
+
+from pyschemetranspiler.converter import Converter
+from pyschemetranspiler.emitter import SPOOL_BUFFER
+from pyschemetranspiler.exceptions import ConversionAbort
+from pyschemetranspiler.session import TranspilerSession
+
+#? Two string literals larger than the memory buffer of `SpooledEmitter`, the first one is moved to its file
+LARGE = "".join(f"s{index} = \"{'x' * SPOOL_BUFFER}\"\n" for index in range(2)) + "print(s0, s1)\n"
+
+def _file(source: str) -> io.StringIO:
+    file = io.StringIO(source)
+    file.name = "large.py"
+    return file
+
+class EmitterTest(unittest.TestCase):
+    def assertNoUnclosedFiles(self, transpile) -> None:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always', ResourceWarning)
+            transpile()
+        self.assertEqual([str(warning.message) for warning in caught if warning.category is ResourceWarning], [])
+
+    def test_transpile_closes_spool(self) -> None:
+        def transpile() -> None:
+            code = Converter.transpile(_file(LARGE), True, TranspilerSession("large.py", quiet=True))
+            self.assertEqual(code.count('x' * SPOOL_BUFFER), 2)
+        self.assertNoUnclosedFiles(transpile)
+
+    def test_stream_closes_spool(self) -> None:
+        def transpile() -> None:
+            sink = io.StringIO()
+            Converter.stream(_file(LARGE), sink, False, TranspilerSession("large.py", quiet=True))
+            self.assertEqual(sink.getvalue().count('x' * SPOOL_BUFFER), 2)
+        self.assertNoUnclosedFiles(transpile)
+
+    def test_failure_closes_spool(self) -> None:
+        def transpile() -> None:
+            with redirect_stdout(io.StringIO()), self.assertRaises(ConversionAbort):
+                Converter.transpile(_file(LARGE + "print(undefined)\n"), True, TranspilerSession("large.py", quiet=True))
+        self.assertNoUnclosedFiles(transpile)
+
+if __name__ == '__main__':
+    unittest.main()
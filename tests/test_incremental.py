@@ -0,0 +1,51 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from typing import List
+import io
+import unittest
+
+from pyschemetranspiler.converter import Converter
+from pyschemetranspiler.incremental import IncrementalState
+from pyschemetranspiler.session import TranspilerSession
+
+def _transpile(source: str, incremental: IncrementalState = None) -> str:
+    file = io.StringIO(source)
+    file.name = "edited.py"
+    return Converter.emit(file, True, TranspilerSession(file.name, quiet=True), None, incremental).getvalue()
+
+class IncrementalTest(unittest.TestCase):
+    def assertEdits(self, versions: List[str]) -> IncrementalState:
+        #? Every version is built incrementally on the previous ones and must match a fresh build
+        state = IncrementalState()
+        for source in versions:
+            self.assertEqual(_transpile(source, state), _transpile(source), source)
+        return state
+
+    def test_edit_first_statement_keeps_helpers(self) -> None:
+        state = self.assertEdits(["print(1)\nprint(2)\n", "x = 1\nprint(2)\n"])
+        self.assertEqual((state.rebuilt, state.reused), (1, 1))
+        self.assertIn("(define (PRINT", _transpile("x = 1\nprint(2)\n", state))
+
+    def test_edit_statement_sharing_helpers(self) -> None:
+        self.assertEdits([
+            "s = input()\nt = input()\nprint(s == t)\nprint(s != t, s == t)\n",
+            "s = \"a\"\nt = input()\nprint(s)\nprint(s != t, s == t)\n",
+            "s = \"a\"\nt = \"b\"\nprint(s)\nprint(s != t, s == t)\n",
+            "s = input()\nt = \"b\"\nprint(s == t)\nprint(s != t, s == t)\n",
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import io
+import random
+import unittest
+
+from pyschemetranspiler.converter import Converter
+from pyschemetranspiler.session import TranspilerSession
+
+from benchmarks.generator import generate
+
+#? Every source uses other build flags, so state leaking between threads changes the output
+_HANDWRITTEN = [
+    "from typing import List\n"
+    "def fib(n: int) -> int:\n    if n < 2:\n        return n\n    else:\n        return fib(n - 1) + fib(n - 2)\n"
+    "nums: List[int] = [1, 2, 3]\nnums.append(4)\nprint(fib(10), len(nums))\n",
+    "from typing import Tuple\n"
+    "def classify(v: int) -> str:\n    if v < 0:\n        return \"neg\"\n    elif v == 0:\n        return \"zero\"\n    else:\n        return \"big\"\n"
+    "t: Tuple[int, str] = (1, \"a\")\nprint(classify(t[0]), t[-1])\n",
+    "s = \"a\" + \"b\"\nf = 1 + 2 * 3 - 4 / 2\nh = 1 < 2 < 3\nk = input(\"q\")\nprint(s, f, h, k)\n",
+    "def p(x: float) -> float:\n    return x\nv = None\nprint(p(v))\n",
+    "i = 0\nwhile i < 3:\n    i += 1\nfor e in range(3):\n    print(str(e) + \"x\", float(i))\n",
+]
+
+THREADS = 8
+ROUNDS = 10
+
+def _sources() -> List[Tuple[str, str]]:
+    sources = [(f"handwritten{index}.py", source) for index, source in enumerate(_HANDWRITTEN)]
+    for seed in range(6):
+        source = generate(functions=10 + seed * 5, ifDepth=seed % 4 + 1, loopDepth=seed % 3, callDensity=0.3 + seed / 10, seed=seed)
+        sources.append((f"generated{seed}.py", source))
+    return sources
+
+def _transpile(job: Tuple[str, str, bool]) -> str:
+    name, source, useMain = job
+    file = io.StringIO(source)
+    file.name = name
+    return Converter.emit(file, useMain, TranspilerSession(name, quiet=True)).getvalue()
+
+class SessionStressTest(unittest.TestCase):
+    def test_threaded_output_matches_serial(self) -> None:
+        jobs = [(name, source, useMain) for name, source in _sources() for useMain in (True, False)]
+        serial = [_transpile(job) for job in jobs]
+        self.assertTrue(all(serial))
+
+        order = random.Random(0)
+        with ThreadPoolExecutor(THREADS) as pool:
+            for _ in range(ROUNDS):
+                indices = list(range(len(jobs))) * 3
+                order.shuffle(indices)
+                for index, output in zip(indices, pool.map(_transpile, (jobs[index] for index in indices))):
+                    self.assertEqual(output, serial[index], f"{jobs[index][0]} (useMain={jobs[index][2]})")
+
+if __name__ == '__main__':
+    unittest.main()
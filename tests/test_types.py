@@ -0,0 +1,85 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from typing import Any, Callable, Dict, List, Tuple as TupleType
+import unittest
+
+from pyschemetranspiler.api import transpile_source
+from pyschemetranspiler.builder import Typer
+
+_TYPES = {
+    'any'    : Typer.TAny(),
+    'pending': Typer.TPending(),
+    'null'   : Typer.Null(),
+    'int'    : int,
+    'str'    : str,
+    'list'   : Typer.TList(int)
+}
+
+def _checks(names: List[str] = list(_TYPES)) -> Dict[TupleType[str, str], Any]:
+    #? Every pair of the types in both argument orders, checked in the order of `names`
+    def merged(type1: type, type2: type) -> Any:
+        try:
+            return Typer._merge(type1, type2, False)
+        except TypeError:
+            return TypeError
+
+    return {
+        (name1, name2): (Typer._compatible(_TYPES[name1], _TYPES[name2]), merged(_TYPES[name1], _TYPES[name2]))
+        for name1 in names for name2 in names
+        }
+
+def _clear() -> None:
+    Typer._compatible.cache_clear()
+    Typer._merge.cache_clear()
+
+SOURCES = [
+    "from typing import List\nl: List[int] = []\n",
+    "t = (1, 2)\nfor x in t:\n    y: int = x\n",
+    "from typing import List\nl = []\nl.append(1)\nm: List[int] = l\n",
+    "v = None\nv = 5\nw: int = v\n",
+]
+
+class TypeCacheTest(unittest.TestCase):
+    def assertOrderIndependent(self, check: Callable[[], List[Any]], primers: List[Callable[[], Any]]) -> None:
+        _clear()
+        fresh = check()
+        for primer in primers:
+            _clear()
+            primer()
+            self.assertEqual(check(), fresh, primer)
+
+    def test_field_less_types_differ(self) -> None:
+        fieldLess = [Typer.TAny(), Typer.TPending(), Typer.Null()]
+        for index, type1 in enumerate(fieldLess):
+            for type2 in fieldLess[index + 1:]:
+                self.assertNotEqual(type1, type2)
+                self.assertNotEqual(hash(type1), hash(type2))
+
+    def test_checks_in_both_orders(self) -> None:
+        _clear()
+        forward = _checks()
+        _clear()
+        self.assertEqual(_checks(list(reversed(_TYPES))), forward)
+
+    def test_diagnostics_independent_of_earlier_sources(self) -> None:
+        for source in SOURCES:
+            def diagnostics(source: str = source) -> List[Any]:
+                return transpile_source(source).diagnostics
+            others = [lambda other=other: transpile_source(other) for other in SOURCES if other != source]
+            self.assertOrderIndependent(diagnostics, others + [_checks])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# PySchemeTranspiler, Transpile simple Python to Scheme(Racket)
+# Copyright (C) 2021  Rubin Raithel
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from contextlib import redirect_stdout
+import io
+import os
+import tempfile
+import unittest
+
+from pyschemetranspiler.converter import Converter
+from pyschemetranspiler.session import TranspilerSession
+from pyschemetranspiler.watch import Watcher
+
+class WatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, "src", "main.py")
+        self.target = os.path.join(self.directory.name, "out", "main.rkt")
+        os.makedirs(os.path.dirname(self.source))
+        self.watcher = Watcher(os.path.dirname(self.source), os.path.dirname(self.target))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def save(self, source: str) -> str:
+        with open(self.source, 'w') as file:
+            file.write(source)
+
+        with redirect_stdout(io.StringIO()):
+            changed = self.watcher.scan()
+            self.assertEqual([watched.job.source for watched in changed], [self.source])
+            rebuild = self.watcher.rebuild(changed[0])
+        self.assertTrue(rebuild.success)
+
+        with open(self.target, 'r') as file:
+            code = file.read()
+        fresh = io.StringIO(source)
+        fresh.name = self.source
+        self.assertEqual(code, Converter.transpile(fresh, True, TranspilerSession(self.source, quiet=True)))
+        return code
+
+    def test_edit_first_statement_keeps_helpers(self) -> None:
+        self.assertIn("(define (PRINT", self.save("print(1)\nprint(2)\n"))
+        #? The second statement is reused, its helper was activated by the removed first one before
+        self.assertIn("(define (PRINT", self.save("x = 1\nprint(2)\n"))
+        self.assertEqual(self.watcher.files[self.source].incremental.reused, 1)
+
+    def test_edit_back_and_forth(self) -> None:
+        versions = ["s = input()\nprint(s == \"a\")\n", "s = \"b\"\nprint(s == \"a\")\n", "s = input()\nprint(s)\n"]
+        for source in versions + versions[-2::-1]:
+            self.save(source)
+
+if __name__ == '__main__':
+    unittest.main()